@@ -1,18 +1,53 @@
-"""workflow_core: shared UI automation primitives and CLI."""
-
-from . import messaging
-from .core import (
-    Workflow,
-    WorkflowConfig,
-    WorkflowFactory,
-    WorkflowInterface,
-    WorkflowActionHandler,
-    WorkflowActionName,
-    WorkflowActionResult,
-    WorkflowName,
-    WorkflowCLIParser,
-)
-from .workflows import HelloWorldWorkflow
+"""workflow_core: shared UI automation primitives and CLI.
+
+Public names are resolved lazily (PEP 562) so importing the package, or
+lightweight pieces such as ``WorkflowActionName`` and ``messaging``, does not
+pull in uiautomator2/adbutils until ``Workflow`` itself is needed.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import messaging
+    from .core import (
+        Workflow,
+        WorkflowConfig,
+        WorkflowFactory,
+        WorkflowFleet,
+        WorkflowInterface,
+        WorkflowRegistry,
+        WorkflowScheduler,
+        WorkflowStep,
+        AsyncWorkflowActionHandler,
+        WorkflowActionHandler,
+        WorkflowActionName,
+        WorkflowActionResult,
+        WorkflowName,
+        WorkflowCLIParser,
+    )
+    from .workflows import HelloWorldWorkflow
+
+# Public attribute -> module (relative to this package) that defines it.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "HelloWorldWorkflow": ".workflows",
+    "Workflow": ".core",
+    "WorkflowConfig": ".core",
+    "WorkflowFactory": ".core",
+    "WorkflowFleet": ".core",
+    "WorkflowRegistry": ".core",
+    "WorkflowScheduler": ".core",
+    "WorkflowStep": ".core",
+    "WorkflowInterface": ".core",
+    "AsyncWorkflowActionHandler": ".core",
+    "WorkflowActionHandler": ".core",
+    "WorkflowActionName": ".core",
+    "WorkflowActionResult": ".core",
+    "WorkflowName": ".core",
+    "WorkflowCLIParser": ".core",
+}
 
 __all__ = [
     "messaging",
@@ -20,10 +55,30 @@ __all__ = [
     "Workflow",
     "WorkflowConfig",
     "WorkflowFactory",
+    "WorkflowFleet",
+    "WorkflowRegistry",
+    "WorkflowScheduler",
+    "WorkflowStep",
     "WorkflowInterface",
+    "AsyncWorkflowActionHandler",
     "WorkflowActionHandler",
     "WorkflowActionName",
     "WorkflowActionResult",
     "WorkflowName",
     "WorkflowCLIParser",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "messaging":
+        return importlib.import_module(".messaging", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for orchestrator overhead, compared against stored baselines.
+
+``benchmarks/`` is intentionally not a package so workflow discovery never
+imports it. Run with ``workflow_core`` importable, e.g.::
+
+    python benchmarks/bench_orchestrator.py               # compare to baselines
+    python benchmarks/bench_orchestrator.py --update      # rewrite baselines
+    python benchmarks/bench_orchestrator.py --workflows 200 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+SYNTHETIC_WORKFLOW = textwrap.dedent(
+    """
+    import argparse
+
+
+    class SyntheticWorkflow{index}:
+        def __init__(self, config) -> None:
+            self.config = config
+
+        def workflow_name(self) -> str:
+            return "bench.synthetic.{index}"
+
+        def package_name(self) -> str:
+            return "com.bench.synthetic{index}"
+
+        def action_handler(self, action):
+            return lambda: True
+
+        def actions(self):
+            return {{}}
+
+        def run(self, action) -> bool:
+            return True
+
+        @staticmethod
+        def register_cli_arguments(parser: argparse.ArgumentParser) -> None:
+            parser.add_argument("--synthetic-{index}-flag", type=int, default={index})
+    """
+)
+
+
+class LatencyDevice:
+    """u2.Device stand-in whose RPCs each cost ``latency`` seconds."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    @property
+    def info(self) -> dict:
+        time.sleep(self.latency)
+        return {"screenOn": True, "currentPackageName": "com.example"}
+
+    def _rpc(self, *args, **kwargs) -> None:
+        time.sleep(self.latency)
+
+    screen_on = swipe = press = app_stop = _rpc
+
+
+def _median_ms(func: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _python_env() -> dict[str, str]:
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+
+
+def _subprocess_ms(statement: str, repeat: int, env: dict[str, str] | None = None) -> float:
+    """Median time of ``statement`` in fresh interpreters, excluding interpreter startup."""
+    code = (
+        f"import time\n_started = time.perf_counter()\n{statement}\n"
+        "print((time.perf_counter() - _started) * 1000)\n"
+    )
+    samples = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            env=env or _python_env(),
+            capture_output=True,
+            text=True,
+        )
+        samples.append(float(completed.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+@contextmanager
+def _synthetic_package(count: int) -> Iterator[tuple[str, Path]]:
+    with tempfile.TemporaryDirectory(prefix="workflow_bench_") as root:
+        package = f"bench_workflows_{count}"
+        package_dir = Path(root) / package
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text("", encoding="utf-8")
+        for index in range(count):
+            (package_dir / f"synthetic_{index}.py").write_text(
+                SYNTHETIC_WORKFLOW.format(index=index), encoding="utf-8"
+            )
+        sys.path.insert(0, root)
+        try:
+            yield package, package_dir
+        finally:
+            sys.path.remove(root)
+            for name in [m for m in sys.modules if m == package or m.startswith(f"{package}.")]:
+                del sys.modules[name]
+
+
+def bench_import(repeat: int) -> dict[str, float]:
+    return {
+        "import_workflow_core_ms": _subprocess_ms("import workflow_core", repeat),
+        "import_workflow_module_ms": _subprocess_ms("import workflow_core.core.workflow", repeat),
+    }
+
+
+def bench_cli(repeat: int) -> dict[str, float]:
+    from workflow_core.core.workflow_cli_parser import WorkflowCLIParser
+
+    argv = ["--workflow", "workflow.hello.world"]
+    statement = (
+        "from workflow_core.core.workflow_cli_parser import WorkflowCLIParser\n"
+        f"WorkflowCLIParser.parse({argv!r})"
+    )
+    results = {
+        "cli_parse_cold_ms": _subprocess_ms(statement, repeat),
+        "cli_parse_warm_ms": _median_ms(lambda: WorkflowCLIParser.parse(argv), repeat),
+    }
+    with tempfile.TemporaryDirectory(prefix="workflow_bench_manifest_") as root:
+        env = dict(_python_env(), WORKFLOW_CLI_MANIFEST=str(Path(root) / "manifest.json"))
+        # First run builds the manifest; the measured runs reuse it.
+        _subprocess_ms(statement, 1, env=env)
+        results["cli_parse_cold_manifest_ms"] = _subprocess_ms(statement, repeat, env=env)
+    return results
+
+
+def bench_factory(workflow_count: int, repeat: int) -> dict[str, float]:
+    from workflow_core.core.workflow_config import WorkflowConfig
+    from workflow_core.core.workflow_factory import WorkflowFactory
+    from workflow_core.core.workflow_registry import WorkflowRegistry
+
+    previous = os.environ.get("WORKFLOW_EXTRA_PACKAGES")
+    with _synthetic_package(workflow_count) as (package, _):
+        os.environ["WORKFLOW_EXTRA_PACKAGES"] = package
+        try:
+            config = WorkflowConfig(workflow=f"bench.synthetic.{workflow_count - 1}", action="start")
+
+            def discover() -> None:
+                WorkflowRegistry.invalidate()
+                WorkflowFactory.get_workflow(config)
+
+            return {
+                # First discovery imports every module; later ones only re-walk.
+                f"factory_discovery_cold_{workflow_count}_ms": _median_ms(discover, 1),
+                f"factory_discovery_warm_{workflow_count}_ms": _median_ms(discover, repeat),
+                f"factory_lookup_{workflow_count}_ms": _median_ms(
+                    lambda: WorkflowFactory.get_workflow(config), repeat * 100
+                ),
+            }
+        finally:
+            WorkflowRegistry.invalidate()
+            if previous is None:
+                os.environ.pop("WORKFLOW_EXTRA_PACKAGES", None)
+            else:
+                os.environ["WORKFLOW_EXTRA_PACKAGES"] = previous
+
+
+def bench_run(latency: float, repeat: int) -> dict[str, float]:
+    import workflow_core.core.workflow as workflow_module
+    from workflow_core.core.workflow import Workflow
+    from workflow_core.core.workflow_config import WorkflowConfig
+
+    original_connect, original_send = workflow_module.u2.connect, workflow_module.send
+    workflow_module.u2.connect = lambda serial=None: LatencyDevice(latency)
+    # Fake transport: pay one round trip instead of a real Twilio request.
+    workflow_module.send = lambda *args: time.sleep(latency)
+    try:
+        def run() -> None:
+            config = WorkflowConfig(
+                workflow="workflow.hello.world", action="login", device_id="bench-device"
+            )
+            Workflow(config).run()
+
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                elapsed = _median_ms(run, repeat)
+            finally:
+                sys.stdout = stdout
+        # Subtract the injected device/transport latency to isolate orchestrator cost.
+        return {"workflow_run_overhead_ms": elapsed - 2 * latency * 1000}
+    finally:
+        workflow_module.u2.connect, workflow_module.send = original_connect, original_send
+
+
+def run_benchmarks(
+    workflow_count: int = 100, repeat: int = 5, latency: float = 0.005
+) -> dict[str, float]:
+    results: dict[str, float] = {}
+    results.update(bench_import(repeat))
+    results.update(bench_cli(repeat))
+    results.update(bench_factory(workflow_count, repeat))
+    results.update(bench_run(latency, repeat))
+    return {name: round(value, 3) for name, value in results.items()}
+
+
+def compare(
+    results: dict[str, float],
+    baselines: dict[str, float],
+    tolerance: float = 1.5,
+    slack_ms: float = 2.0,
+) -> list[str]:
+    """Return a message for every metric slower than ``baseline * tolerance + slack_ms``."""
+    regressions = []
+    for name, value in sorted(results.items()):
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        limit = baseline * tolerance + slack_ms
+        if value > limit:
+            regressions.append(
+                f"{name}: {value:.3f}ms > {limit:.3f}ms (baseline {baseline:.3f}ms)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=100, help="Synthetic workflow modules.")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per metric (median).")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake RPC latency (s).")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="Store results as the baseline.")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON here.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.workflows, args.repeat, args.latency)
+    for name, value in sorted(results.items()):
+        print(f"{name:40s} {value:10.3f}")
+    serialized = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        args.output.write_text(serialized, encoding="utf-8")
+    if args.update:
+        args.baseline.write_text(serialized, encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        baselines = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --update to create one.")
+        return 0
+    regressions = compare(results, baselines, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
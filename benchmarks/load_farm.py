@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Load-test the fleet runner, scheduler or asyncio path against a simulated device farm.
+
+Every run connects through ``device_farm.SimulatedFarm`` instead of adb, so a
+thousand devices fit on a laptop. Compare throughput and latency percentiles
+across worker counts to find contention before it shows up on real hardware::
+
+    python benchmarks/load_farm.py --devices 1000 --workers 64
+    python benchmarks/load_farm.py --mode async --devices 1000 --workers 256 --latency 0.02
+    python benchmarks/load_farm.py --mode scheduler --failure-rate 0.01 --output load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+MODES = ("fleet", "async", "scheduler")
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+
+def run_load(
+    mode: str = "fleet",
+    devices: int = 100,
+    workers: int = 16,
+    latency: float = 0.005,
+    failure_rate: float = 0.0,
+    locked_ratio: float = 0.2,
+    screen_off_ratio: float = 0.2,
+    workflow: str = "workflow.hello.world",
+    action: str = "daily",
+    fixtures: Path | None = None,
+    seed: int | None = 0,
+) -> dict[str, float]:
+    import workflow_core.core.workflow as workflow_module
+    from workflow_core.core.device_farm import SimulatedFarm, constant, lognormal
+    from workflow_core.core.events import OFF, EventLog, set_event_log
+    from workflow_core.core.workflow_config import WorkflowConfig
+    from workflow_core.core.workflow_fleet import WorkflowFleet
+    from workflow_core.core.workflow_scheduler import WorkflowScheduler
+
+    farm = SimulatedFarm(
+        size=devices,
+        latency=lognormal(latency) if latency > 0 else constant(0.0),
+        failure_rate=failure_rate,
+        locked_ratio=locked_ratio,
+        screen_off_ratio=screen_off_ratio,
+        fixtures=SimulatedFarm.load_fixtures(fixtures) if fixtures else None,
+        seed=seed,
+    )
+    config = WorkflowConfig(workflow=workflow, action=action, device_backend=farm)
+
+    original_send = workflow_module.send
+    # Fake transport: pay one round trip instead of a real Twilio request.
+    workflow_module.send = lambda *args: time.sleep(latency)
+    # Keep the console and failure dumps quiet; thousands of runs would flood stderr.
+    previous_log = set_event_log(EventLog(level=OFF, console_level=OFF))
+    started = time.perf_counter()
+    try:
+        if mode == "fleet":
+            results = WorkflowFleet(config, max_workers=workers).run()
+        elif mode == "async":
+            results = asyncio.run(WorkflowFleet(config, max_workers=workers).run_async())
+        elif mode == "scheduler":
+            with WorkflowScheduler(max_workers=workers, seed=seed) as scheduler:
+                futures = [
+                    scheduler.submit(config.for_device(device.serial), jitter_seconds=(0.0, 0.0))
+                    for device in farm.device_list()
+                ]
+                results = [future.result() for future in futures]
+        else:
+            raise ValueError(f"Unknown mode '{mode}'; expected one of {', '.join(MODES)}.")
+        elapsed = time.perf_counter() - started
+    finally:
+        workflow_module.send = original_send
+        set_event_log(previous_log)
+
+    totals = [result.timings["total"] for result in results if "total" in result.timings]
+    stats = farm.stats()
+    return {
+        "devices": devices,
+        "workers": workers,
+        "runs": len(results),
+        "failures": sum(not result.success for result in results),
+        "elapsed_s": round(elapsed, 3),
+        "runs_per_s": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "run_p50_ms": round(_percentile(totals, 0.5) * 1000, 1),
+        "run_p95_ms": round(_percentile(totals, 0.95) * 1000, 1),
+        "run_max_ms": round(max(totals, default=0.0) * 1000, 1),
+        "rpcs": sum(count for name, count in stats.items() if name != "failures"),
+        "rpc_failures": stats.get("failures", 0),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES, default="fleet")
+    parser.add_argument("--devices", type=int, default=1000, help="Simulated devices.")
+    parser.add_argument("--workers", type=int, default=64, help="Runs in flight at once.")
+    parser.add_argument("--latency", type=float, default=0.005, help="Median RPC latency (s).")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Chance an RPC fails.")
+    parser.add_argument("--locked", type=float, default=0.2, help="Share of devices locked.")
+    parser.add_argument("--screen-off", type=float, default=0.2, help="Share of dark devices.")
+    parser.add_argument("--workflow", default="workflow.hello.world")
+    parser.add_argument("--action", default="daily")
+    parser.add_argument("--fixtures", type=Path, help="Snapshot directory to serve hierarchies from.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write results as JSON here.")
+    args = parser.parse_args(argv)
+
+    results = run_load(
+        mode=args.mode,
+        devices=args.devices,
+        workers=args.workers,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        locked_ratio=args.locked,
+        screen_off_ratio=args.screen_off,
+        workflow=args.workflow,
+        action=args.action,
+        fixtures=args.fixtures,
+        seed=args.seed,
+    )
+    for name, value in results.items():
+        print(f"{name:20s} {value:>12}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,89 @@
-"""Core workflow primitives (interfaces, factories, and orchestrator)."""
-
-from .workflow import Workflow
-from .workflow_config import WorkflowConfig
-from .workflow_factory import WorkflowFactory
-from .workflow_interface import WorkflowInterface
-from .workflow_types import (
-    WorkflowActionHandler,
-    WorkflowActionName,
-    WorkflowActionResult,
-    WorkflowName,
-)
-from .workflow_cli_parser import WorkflowCLIParser
+"""Core workflow primitives (interfaces, factories, and orchestrator).
+
+Attributes are loaded on first access so that, for example, importing
+``WorkflowConfig`` does not import ``Workflow`` and its uiautomator2/adbutils
+dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .device_pool import DevicePool
+    from .device_farm import SimulatedFarm
+    from .ui_hierarchy import UIHierarchy
+    from .visual_locator import VisualLocator
+    from .workflow import Workflow
+    from .workflow_config import WorkflowConfig
+    from .workflow_factory import WorkflowFactory
+    from .workflow_fleet import WorkflowFleet
+    from .workflow_registry import WorkflowRegistry
+    from .workflow_scheduler import WorkflowScheduler
+    from .workflow_steps import WorkflowStep
+    from .workflow_interface import WorkflowInterface
+    from .workflow_types import (
+        AsyncWorkflowActionHandler,
+        WorkflowActionHandler,
+        WorkflowActionName,
+        WorkflowActionResult,
+        WorkflowName,
+    )
+    from .workflow_cli_parser import WorkflowCLIParser
+
+# Public attribute -> submodule that defines it.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "DevicePool": ".device_pool",
+    "SimulatedFarm": ".device_farm",
+    "UIHierarchy": ".ui_hierarchy",
+    "VisualLocator": ".visual_locator",
+    "Workflow": ".workflow",
+    "WorkflowConfig": ".workflow_config",
+    "WorkflowFactory": ".workflow_factory",
+    "WorkflowFleet": ".workflow_fleet",
+    "WorkflowRegistry": ".workflow_registry",
+    "WorkflowScheduler": ".workflow_scheduler",
+    "WorkflowStep": ".workflow_steps",
+    "WorkflowInterface": ".workflow_interface",
+    "AsyncWorkflowActionHandler": ".workflow_types",
+    "WorkflowActionHandler": ".workflow_types",
+    "WorkflowActionName": ".workflow_types",
+    "WorkflowActionResult": ".workflow_types",
+    "WorkflowName": ".workflow_types",
+    "WorkflowCLIParser": ".workflow_cli_parser",
+}
 
 __all__ = [
+    "DevicePool",
+    "SimulatedFarm",
+    "UIHierarchy",
+    "VisualLocator",
     "Workflow",
     "WorkflowConfig",
     "WorkflowFactory",
+    "WorkflowFleet",
+    "WorkflowRegistry",
+    "WorkflowScheduler",
+    "WorkflowStep",
     "WorkflowInterface",
+    "AsyncWorkflowActionHandler",
     "WorkflowActionHandler",
     "WorkflowActionName",
     "WorkflowActionResult",
     "WorkflowName",
     "WorkflowCLIParser",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,439 @@
+"""
+Simulated device farm: virtual devices behind the same seam as real hardware.
+
+A :class:`DeviceBackend` replaces ``u2.connect`` and ``adbutils.adb`` for a
+:class:`~workflow_core.core.workflow.Workflow` (``WorkflowConfig(device_backend=...)``)
+and for the fleet, job and selection code that lists devices. The
+:class:`SimulatedFarm` backend emulates N devices. Each RPC sleeps for a
+sampled latency and fails with the configured probability. Devices keep
+screen and lock state, and ``dump_hierarchy`` serves snapshot XML fixtures
+for the foreground package. This lets the fleet runner, scheduler and
+orchestrator be load-tested at a thousand devices without hardware.
+
+Environment:
+    ``WORKFLOW_DEVICE_BACKEND``  ``adb`` (default) or ``sim[:N][?latency=S&failure_rate=P&locked=R&screen_off=R]``.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional, Protocol, Sequence
+from urllib.parse import parse_qsl
+
+import adbutils
+
+DEVICE_BACKEND_ENV = "WORKFLOW_DEVICE_BACKEND"
+
+LAUNCHER_PACKAGE = "com.android.launcher3"
+LOCK_SCREEN_PACKAGE = "com.android.systemui"
+
+_PACKAGE_ATTRIBUTE = re.compile(rb'package="([^"]+)"')
+_DEFAULT_HIERARCHY = (
+    "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>"
+    '<hierarchy rotation="0">'
+    '<node index="0" text="" resource-id="" class="android.widget.FrameLayout" '
+    'package="{package}" content-desc="" clickable="false" enabled="true" '
+    'bounds="[0,0][{width},{height}]" />'
+    "</hierarchy>"
+)
+# Smallest valid PNG (1x1 transparent pixel) returned by ``screencap -p``.
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082"
+)
+
+Latency = Callable[[random.Random], float]
+
+
+class DeviceBackend(Protocol):
+    """Where devices come from: real adb/uiautomator2 or a simulation."""
+
+    def connect(self, serial: str) -> Any:
+        """Return a ``u2.Device``-like session for ``serial``."""
+        ...
+
+    def device_list(self) -> list[Any]:
+        """Return ``adbutils.AdbDevice``-like handles for every online device."""
+        ...
+
+    def adb_device(self, serial: str) -> Any:
+        """Return the ``adbutils.AdbDevice``-like handle for ``serial``."""
+        ...
+
+
+def constant(seconds: float) -> Latency:
+    """Every RPC takes ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    """RPC latency drawn uniformly from ``[low, high]``."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Latency:
+    """Long-tailed RPC latency around ``median``, the usual shape of adb round trips."""
+    mu = math.log(median) if median > 0 else float("-inf")
+    return lambda rng: rng.lognormvariate(mu, sigma) if median > 0 else 0.0
+
+
+class SimulatedDeviceError(ConnectionError):
+    """An injected RPC or connection failure."""
+
+
+class SimulatedDevice:
+    """
+    One virtual device that answers both the ``u2.Device`` and the
+    ``adbutils.AdbDevice`` calls the orchestrator makes.
+
+    State changes the way a real device's would: ``screen_off`` locks it,
+    an upward swipe on the lock screen unlocks it, ``press("home")`` shows
+    the launcher and ``app_start`` brings a package to the foreground.
+    """
+
+    def __init__(
+        self,
+        serial: str,
+        farm: "SimulatedFarm",
+        seed: Optional[int] = None,
+        screen_on: bool = True,
+        locked: bool = False,
+        battery: int = 100,
+        temperature: float = 30.0,
+    ) -> None:
+        self.serial = serial
+        self.farm = farm
+        self.battery = battery
+        self.temperature = temperature
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._screen_on = screen_on
+        self._locked = locked
+        self._package = LAUNCHER_PACKAGE
+
+    # -- state ---------------------------------------------------------------
+
+    @property
+    def locked(self) -> bool:
+        return self._locked
+
+    @property
+    def is_screen_on(self) -> bool:
+        return self._screen_on
+
+    @property
+    def foreground(self) -> str:
+        """Package on screen; the lock screen hides everything else."""
+        with self._lock:
+            return LOCK_SCREEN_PACKAGE if self._locked else self._package
+
+    def _rpc(self, name: str) -> None:
+        """Pay one round trip of latency, then fail with the farm's failure rate."""
+        with self._lock:
+            delay = self.farm.latency(self._rng) * self.farm.time_scale
+            failed = self.farm.failure_rate > 0 and self._rng.random() < self.farm.failure_rate
+        self.farm._count(name, failed)
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise SimulatedDeviceError(f"Simulated '{name}' failure on '{self.serial}'.")
+
+    # -- uiautomator2 --------------------------------------------------------
+
+    @property
+    def info(self) -> dict[str, Any]:
+        self._rpc("info")
+        width, height = self.farm.display
+        return {
+            "screenOn": self._screen_on,
+            "currentPackageName": self.foreground,
+            "displayWidth": width,
+            "displayHeight": height,
+            "sdkInt": 33,
+        }
+
+    def window_size(self) -> tuple[int, int]:
+        self._rpc("window_size")
+        return self.farm.display
+
+    def screen_on(self) -> None:
+        self._rpc("screen_on")
+        with self._lock:
+            self._screen_on = True
+
+    def screen_off(self) -> None:
+        self._rpc("screen_off")
+        with self._lock:
+            self._screen_on = False
+            self._locked = True
+
+    def unlock(self) -> None:
+        self._rpc("unlock")
+        with self._lock:
+            self._screen_on = True
+            self._locked = False
+
+    def swipe(self, fx: float, fy: float, tx: float, ty: float, *args: Any, **kwargs: Any) -> None:
+        self._rpc("swipe")
+        with self._lock:
+            if self._screen_on and self._locked and ty < fy:
+                self._locked = False
+
+    def click(self, x: float, y: float) -> None:
+        self._rpc("click")
+
+    def double_click(self, x: float, y: float, *args: Any) -> None:
+        self._rpc("double_click")
+
+    def long_click(self, x: float, y: float, *args: Any) -> None:
+        self._rpc("long_click")
+
+    def send_keys(self, text: str, clear: bool = False) -> None:
+        self._rpc("send_keys")
+
+    def press(self, key: str) -> None:
+        self._rpc("press")
+        with self._lock:
+            if key == "home" and self._screen_on and not self._locked:
+                self._package = LAUNCHER_PACKAGE
+            elif key == "power":
+                self._screen_on = not self._screen_on
+                self._locked = self._locked or not self._screen_on
+
+    def app_start(self, package_name: str, *args: Any, **kwargs: Any) -> None:
+        self._rpc("app_start")
+        with self._lock:
+            self._package = package_name
+
+    def app_stop(self, package_name: str) -> None:
+        self._rpc("app_stop")
+        with self._lock:
+            if self._package == package_name:
+                self._package = LAUNCHER_PACKAGE
+
+    def app_current(self) -> dict[str, Any]:
+        self._rpc("app_current")
+        return {"package": self.foreground, "activity": ".MainActivity"}
+
+    def dump_hierarchy(self, *args: Any, **kwargs: Any) -> str:
+        self._rpc("dump_hierarchy")
+        return self.farm.hierarchy(self.foreground)
+
+    # -- adbutils ------------------------------------------------------------
+
+    def shell(self, command: str | Sequence[str], encoding: Optional[str] = "utf-8", **kwargs: Any) -> Any:
+        """Answer the ``adb shell`` commands probes, snapshots and macros use."""
+        self._rpc("shell")
+        if not isinstance(command, str):
+            command = " ".join(command)
+        output: str | bytes
+        if command.startswith("dumpsys battery"):
+            output = f"  level: {self.battery}\n  temperature: {round(self.temperature * 10)}\n"
+        elif command.startswith("dumpsys power"):
+            output = f"mWakefulness={'Awake' if self._screen_on else 'Asleep'}\n"
+        elif command.startswith("uiautomator dump"):
+            output = self.farm.hierarchy(self.foreground) + "\nUI hierchary dumped to: /dev/tty\n"
+        elif command.startswith("screencap"):
+            output = _PNG
+        else:
+            output = ""
+        if encoding is None:
+            return output if isinstance(output, bytes) else output.encode("utf-8")
+        return output if isinstance(output, str) else output.decode(encoding, errors="replace")
+
+    def __repr__(self) -> str:
+        return f"SimulatedDevice({self.serial!r})"
+
+
+class SimulatedFarm:
+    """
+    ``size`` virtual devices named ``<prefix>-0000`` and up.
+
+    ``latency`` and ``connect_latency`` are samplers such as :func:`lognormal`,
+    scaled by ``time_scale``. ``failure_rate`` is the chance that any one
+    RPC raises :class:`SimulatedDeviceError`, and ``connect_failure_rate``
+    applies to :meth:`connect`. Serials in ``offline`` are missing from
+    :meth:`device_list` and refuse connections. ``locked_ratio`` and
+    ``screen_off_ratio`` pick devices that start locked or dark. ``fixtures``
+    maps a package to the hierarchy XML served while it is in the foreground
+    (see :meth:`load_fixtures`). ``seed`` makes a run reproducible.
+    """
+
+    def __init__(
+        self,
+        size: int = 10,
+        latency: Latency = constant(0.0),
+        connect_latency: Optional[Latency] = None,
+        failure_rate: float = 0.0,
+        connect_failure_rate: float = 0.0,
+        offline: Iterable[str] = (),
+        locked_ratio: float = 0.0,
+        screen_off_ratio: float = 0.0,
+        fixtures: Optional[Mapping[str, str]] = None,
+        display: tuple[int, int] = (1080, 2400),
+        time_scale: float = 1.0,
+        seed: Optional[int] = None,
+        prefix: str = "sim",
+    ) -> None:
+        if size < 0:
+            raise ValueError("size must be >= 0")
+        for name, rate in (
+            ("failure_rate", failure_rate),
+            ("connect_failure_rate", connect_failure_rate),
+            ("locked_ratio", locked_ratio),
+            ("screen_off_ratio", screen_off_ratio),
+        ):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} must be in [0, 1]")
+        self.latency = latency
+        self.connect_latency = connect_latency or latency
+        self.failure_rate = failure_rate
+        self.connect_failure_rate = connect_failure_rate
+        self.offline = set(offline)
+        self.fixtures = dict(fixtures or {})
+        self.display = display
+        self.time_scale = time_scale
+        self._rng = random.Random(seed)
+        self._stats: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+        self.devices: dict[str, SimulatedDevice] = {}
+        for index in range(size):
+            serial = f"{prefix}-{index:04d}"
+            screen_on = self._rng.random() >= screen_off_ratio
+            self.devices[serial] = SimulatedDevice(
+                serial,
+                self,
+                seed=self._rng.randrange(2**32),
+                screen_on=screen_on,
+                locked=not screen_on or self._rng.random() < locked_ratio,
+                battery=self._rng.randint(20, 100),
+                temperature=round(self._rng.uniform(25.0, 40.0), 1),
+            )
+
+    # -- DeviceBackend ---------------------------------------------------------
+
+    def connect(self, serial: str) -> SimulatedDevice:
+        device = self.devices.get(serial)
+        with self._stats_lock:
+            delay = self.connect_latency(self._rng) * self.time_scale
+            failed = self.connect_failure_rate > 0 and self._rng.random() < self.connect_failure_rate
+        self._count("connect", failed)
+        if delay > 0:
+            time.sleep(delay)
+        if device is None or serial in self.offline:
+            raise SimulatedDeviceError(f"Simulated device '{serial}' is not connected.")
+        if failed:
+            raise SimulatedDeviceError(f"Simulated 'connect' failure on '{serial}'.")
+        return device
+
+    def device_list(self) -> list[SimulatedDevice]:
+        return [device for serial, device in self.devices.items() if serial not in self.offline]
+
+    def adb_device(self, serial: str) -> SimulatedDevice:
+        device = self.devices.get(serial)
+        if device is None or serial in self.offline:
+            raise SimulatedDeviceError(f"Simulated device '{serial}' is not connected.")
+        return device
+
+    # -- fixtures and accounting -------------------------------------------------
+
+    def hierarchy(self, package: str) -> str:
+        """Fixture XML for ``package``, or a one-node screen owned by it."""
+        fixture = self.fixtures.get(package)
+        if fixture is not None:
+            return fixture
+        width, height = self.display
+        return _DEFAULT_HIERARCHY.format(package=package, width=width, height=height)
+
+    @staticmethod
+    def load_fixtures(root: str | os.PathLike[str]) -> dict[str, str]:
+        """
+        Hierarchy XML under ``root`` keyed by the package of its first node.
+
+        Reads a ``ui_snapshots`` tree (or any directory of ``*.xml`` dumps);
+        when several dumps share a package, the newest file wins.
+        """
+        fixtures: dict[str, tuple[float, str]] = {}
+        for path in Path(root).rglob("*.xml"):
+            data = path.read_bytes()
+            match = _PACKAGE_ATTRIBUTE.search(data)
+            if match is None:
+                continue
+            package = match.group(1).decode("utf-8")
+            mtime = path.stat().st_mtime
+            if package not in fixtures or mtime >= fixtures[package][0]:
+                fixtures[package] = (mtime, data.decode("utf-8"))
+        return {package: xml for package, (_, xml) in fixtures.items()}
+
+    def _count(self, name: str, failed: bool) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+            if failed:
+                self._stats["failures"] += 1
+
+    def stats(self) -> dict[str, int]:
+        """RPC counts by name since the farm was created, plus ``failures``."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "SimulatedFarm":
+        """
+        Build a farm from ``sim[:N][?option=value&...]``.
+
+        Options: ``latency`` (median seconds, lognormal), ``failure_rate``,
+        ``connect_failure_rate``, ``locked``, ``screen_off``, ``seed`` and
+        ``fixtures`` (a snapshot directory).
+        """
+        head, _, query = spec.partition("?")
+        kind, _, size = head.partition(":")
+        if kind != "sim":
+            raise ValueError(f"Unknown device backend '{spec}'; expected 'adb' or 'sim[:N]'.")
+        options = dict(parse_qsl(query, strict_parsing=bool(query)))
+        unknown = set(options) - {
+            "latency", "failure_rate", "connect_failure_rate", "locked", "screen_off", "seed", "fixtures"
+        }
+        if unknown:
+            raise ValueError(f"Unknown device backend option(s): {', '.join(sorted(unknown))}.")
+        latency = float(options.get("latency", 0.0))
+        return cls(
+            size=int(size or 10),
+            latency=lognormal(latency) if latency > 0 else constant(0.0),
+            failure_rate=float(options.get("failure_rate", 0.0)),
+            connect_failure_rate=float(options.get("connect_failure_rate", 0.0)),
+            locked_ratio=float(options.get("locked", 0.0)),
+            screen_off_ratio=float(options.get("screen_off", 0.0)),
+            fixtures=cls.load_fixtures(options["fixtures"]) if "fixtures" in options else None,
+            seed=int(options["seed"]) if "seed" in options else None,
+        )
+
+
+_backends: dict[str, SimulatedFarm] = {}
+_backends_lock = threading.Lock()
+
+
+def default_device_backend() -> Optional[DeviceBackend]:
+    """Shared backend named by ``WORKFLOW_DEVICE_BACKEND``; ``None`` means real adb."""
+    spec = os.getenv(DEVICE_BACKEND_ENV) or ""
+    if spec in ("", "adb"):
+        return None
+    with _backends_lock:
+        backend = _backends.get(spec)
+        if backend is None:
+            backend = _backends[spec] = SimulatedFarm.from_spec(spec)
+        return backend
+
+
+def connected_devices(backend: Optional[DeviceBackend] = None) -> list[Any]:
+    """Online devices from ``backend``, the environment's backend, or adb itself."""
+    backend = backend or default_device_backend()
+    if backend is not None:
+        return backend.device_list()
+    return adbutils.adb.device_list()
@@ -0,0 +1,234 @@
+"""Cross-process device leases backed by ``flock`` lock files."""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .events import emit
+
+LEASE_DIR_ENV = "WORKFLOW_LEASE_DIR"
+
+
+def default_lease_dir() -> Optional[str]:
+    """Lease directory from ``WORKFLOW_LEASE_DIR``; leasing is off when unset."""
+    return os.getenv(LEASE_DIR_ENV) or None
+
+
+def _file_name(serial: str) -> str:
+    # Serials look like "emulator-5554" or "10.0.0.2:5555"; only "/" is unsafe.
+    return serial.replace(os.sep, "_")
+
+
+def _try_flock(fd: int) -> bool:
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+class DeviceLease:
+    """Exclusive hold on one serial; released explicitly or when the process dies."""
+
+    def __init__(self, serial: str, path: Path, fd: int) -> None:
+        self.serial = serial
+        self.path = path
+        self._fd: Optional[int] = fd
+
+    @property
+    def active(self) -> bool:
+        return self._fd is not None
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        # Touch before unlocking so "least recently used" ordering sees this release.
+        os.utime(self.path)
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        emit(
+            "lease.released",
+            lambda: f"Released lease on device '{self.serial}'.",
+            device_id=self.serial,
+        )
+
+    def __enter__(self) -> "DeviceLease":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
+class DeviceLeaseManager:
+    """
+    Hand out per-serial leases shared by every process using ``lease_dir``.
+
+    Each serial has a lock file; holding an exclusive ``flock`` on it is the
+    lease, so the kernel drops it if the holder crashes. Waiters queue FIFO
+    through ticket files in ``<serial>.queue/`` (``acquire_any`` waiters hold
+    one in each candidate's queue): each waiter keeps its own ticket flocked,
+    and a ticket whose lock can be taken belongs to a dead process and is
+    removed.
+    """
+
+    def __init__(
+        self,
+        lease_dir: str | os.PathLike[str],
+        poll_interval: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.lease_dir = Path(lease_dir)
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._sleep = sleep
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+
+    def acquire(self, serial: str, timeout: Optional[float] = None) -> DeviceLease:
+        """Wait in line for ``serial``; raises ``TimeoutError`` after ``timeout`` seconds."""
+        deadline = None if timeout is None else self._clock() + timeout
+        ticket, ticket_fd = self._enqueue(serial)
+        try:
+            while True:
+                if self._first_in_line(serial, ticket):
+                    lease = self._try_lock(serial)
+                    if lease is not None:
+                        return lease
+                if deadline is not None and self._clock() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for a lease on device '{serial}'.")
+                self._sleep(self.poll_interval)
+        finally:
+            ticket.unlink(missing_ok=True)
+            os.close(ticket_fd)
+
+    def try_acquire(self, serial: str) -> Optional[DeviceLease]:
+        """Lease ``serial`` if it is free and nobody is queued for it."""
+        if self._live_tickets(serial):
+            return None
+        return self._try_lock(serial)
+
+    def acquire_any(
+        self,
+        serials: Iterable[str],
+        timeout: Optional[float] = None,
+        preserve_order: bool = False,
+    ) -> DeviceLease:
+        """
+        Lease whichever of ``serials`` frees up first.
+
+        Free devices are tried least recently released first, so work spreads
+        across the fleet, unless ``preserve_order`` says ``serials`` is
+        already ranked by preference. If none is free, the caller queues a
+        ticket for every candidate and takes the first device where it
+        reaches the front of the line, so it keeps its place relative to
+        :meth:`acquire` callers and other ``acquire_any`` callers.
+        """
+        candidates = list(dict.fromkeys(serials))
+        if not candidates:
+            raise RuntimeError("No devices to lease.")
+
+        def ordered() -> list[str]:
+            return candidates if preserve_order else sorted(candidates, key=self.last_released)
+
+        for serial in ordered():
+            lease = self.try_acquire(serial)
+            if lease is not None:
+                return lease
+        deadline = None if timeout is None else self._clock() + timeout
+        tickets: dict[str, tuple[Path, int]] = {}
+        try:
+            for serial in candidates:
+                tickets[serial] = self._enqueue(serial)
+            while True:
+                for serial in ordered():
+                    if self._first_in_line(serial, tickets[serial][0]):
+                        lease = self._try_lock(serial)
+                        if lease is not None:
+                            return lease
+                if deadline is not None and self._clock() >= deadline:
+                    raise TimeoutError(
+                        f"Timed out waiting for a lease on any of {', '.join(candidates)}."
+                    )
+                self._sleep(self.poll_interval)
+        finally:
+            for ticket, ticket_fd in tickets.values():
+                ticket.unlink(missing_ok=True)
+                os.close(ticket_fd)
+
+    def is_leased(self, serial: str) -> bool:
+        fd = os.open(self._lock_path(serial), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            return not _try_flock(fd)
+        finally:
+            os.close(fd)
+
+    def _lock_path(self, serial: str) -> Path:
+        return self.lease_dir / f"{_file_name(serial)}.lock"
+
+    def _queue_dir(self, serial: str) -> Path:
+        return self.lease_dir / f"{_file_name(serial)}.queue"
+
+    def last_released(self, serial: str) -> float:
+        """Wall-clock time the lease on ``serial`` was last released (0 if never)."""
+        try:
+            return self._lock_path(serial).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _try_lock(self, serial: str) -> Optional[DeviceLease]:
+        path = self._lock_path(serial)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if not _try_flock(fd):
+            os.close(fd)
+            return None
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        emit("lease.acquired", lambda: f"Acquired lease on device '{serial}'.", device_id=serial)
+        return DeviceLease(serial, path, fd)
+
+    def _enqueue(self, serial: str) -> tuple[Path, int]:
+        queue = self._queue_dir(serial)
+        queue.mkdir(exist_ok=True)
+        name = f"{time.time_ns():020d}-{os.getpid()}-{threading.get_ident()}"
+        # Lock under a temporary name first so no other process can see the
+        # ticket unlocked and mistake it for a dead waiter.
+        pending = queue / f".{name}"
+        fd = os.open(pending, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        ticket = queue / name
+        os.replace(pending, ticket)
+        return ticket, fd
+
+    def _live_tickets(self, serial: str) -> list[Path]:
+        queue = self._queue_dir(serial)
+        try:
+            names = sorted(name for name in os.listdir(queue) if not name.startswith("."))
+        except FileNotFoundError:
+            return []
+        live = []
+        for name in names:
+            ticket = queue / name
+            try:
+                fd = os.open(ticket, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                if _try_flock(fd):
+                    # Nobody holds it: the waiter died without cleaning up.
+                    ticket.unlink(missing_ok=True)
+                else:
+                    live.append(ticket)
+            finally:
+                os.close(fd)
+        return live
+
+    def _first_in_line(self, serial: str, ticket: Path) -> bool:
+        for live in self._live_tickets(serial):
+            return live == ticket
+        return False
@@ -0,0 +1,175 @@
+"""Warm uiautomator2 sessions shared across runs, plus a keep-alive daemon."""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import Any, Callable
+
+import uiautomator2 as u2
+
+from .events import DEBUG, WARNING, emit
+from .workflow_config import WorkflowConfig
+from .workflow_ipc import WorkflowRunServer, default_address
+from .workflow_types import WorkflowActionResult
+
+
+def _connect(serial: str) -> Any:
+    return u2.connect(serial)
+
+
+class DevicePool:
+    """
+    Cache one connected ``u2.Device`` per serial and keep it healthy.
+
+    ``get`` returns the cached session or connects once (concurrent callers
+    for the same serial wait for a single connect). A background thread
+    probes idle sessions (not handed out by ``get`` for ``health_interval``
+    seconds) every ``health_interval`` seconds with a cheap ``info`` call and
+    drops the ones that fail, so the next ``get`` reconnects instead of
+    handing out a dead session. Recently handed-out sessions are skipped so
+    probes do not compete with the runs using them; the pool does not see
+    when a run ends, so a run longer than ``health_interval`` may be probed.
+
+    The pool shares sessions; it does not arbitrate exclusive use of a device.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[str], Any] = _connect,
+        health_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self._clock = clock
+        self.health_interval = health_interval
+        self._sessions: dict[str, Any] = {}
+        self._last_used: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._serial_locks: dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get(self, serial: str) -> Any:
+        """Return a warm session for ``serial``, connecting on first use."""
+        with self._lock:
+            device = self._sessions.get(serial)
+            serial_lock = self._serial_locks.setdefault(serial, threading.Lock())
+        if device is None:
+            with serial_lock:
+                with self._lock:
+                    device = self._sessions.get(serial)
+                if device is None:
+                    emit(
+                        "pool.connecting",
+                        lambda: f"Device pool connecting to '{serial}'.",
+                        DEBUG,
+                        device_id=serial,
+                    )
+                    device = self._connect(serial)
+                    with self._lock:
+                        self._sessions[serial] = device
+        with self._lock:
+            self._last_used[serial] = self._clock()
+        return device
+
+    def discard(self, serial: str) -> None:
+        """Forget the session for ``serial`` (e.g. after a transport error)."""
+        with self._lock:
+            self._sessions.pop(serial, None)
+            self._last_used.pop(serial, None)
+
+    def serials(self) -> list[str]:
+        with self._lock:
+            return sorted(self._sessions)
+
+    def check_health(self, idle_for: float = 0.0) -> list[str]:
+        """
+        Probe each session unused for at least ``idle_for`` seconds; returns
+        the serials that were dropped.
+        """
+        with self._lock:
+            cutoff = self._clock() - idle_for
+            sessions = [
+                (serial, device)
+                for serial, device in self._sessions.items()
+                if self._last_used.get(serial, cutoff) <= cutoff
+            ]
+        dropped: list[str] = []
+        for serial, device in sessions:
+            try:
+                device.info
+            except Exception as exc:
+                emit(
+                    "pool.unhealthy",
+                    lambda: f"Device pool dropping unhealthy session '{serial}': {exc!r}",
+                    WARNING,
+                    device_id=serial,
+                    error_class=type(exc).__name__,
+                )
+                with self._lock:
+                    if self._sessions.get(serial) is device:
+                        del self._sessions[serial]
+                dropped.append(serial)
+        return dropped
+
+    def start(self) -> None:
+        """Start background health checks."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._health_loop, name="device-pool", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._sessions.clear()
+            self._last_used.clear()
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            self.check_health(idle_for=self.health_interval)
+
+
+def run_pooled(pool: DevicePool) -> Callable[[WorkflowConfig], WorkflowActionResult]:
+    """Runner that executes each submitted config on a pooled session."""
+    from .workflow import Workflow
+
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        config.device_pool = pool
+        with Workflow(config) as workflow:
+            return workflow.run()
+
+    return runner
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the keep-alive daemon: warm sessions plus a local socket for submissions."""
+    parser = argparse.ArgumentParser(description="Keep device sessions warm and run workflows.")
+    parser.add_argument("--address", default=default_address(), help="Unix socket path.")
+    parser.add_argument("--health-interval", type=float, default=30.0)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--serial", action="append", default=[], help="Serial to pre-connect.")
+    args = parser.parse_args(argv)
+
+    pool = DevicePool(health_interval=args.health_interval)
+    for serial in args.serial:
+        pool.get(serial)
+    pool.start()
+    server = WorkflowRunServer(run_pooled(pool), address=args.address, max_workers=args.max_workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
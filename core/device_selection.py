@@ -0,0 +1,309 @@
+"""Pick the device a workflow should run on from live probes of the fleet."""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional, Protocol, Sequence
+
+import adbutils
+
+from .device_lease import DeviceLeaseManager
+from .events import WARNING, emit
+from .run_history import RunHistory, default_history_path, run_history
+
+SELECTION_POLICY_ENV = "WORKFLOW_SELECTION_POLICY"
+
+_BATTERY_LEVEL = re.compile(r"^\s*level:\s*(\d+)", re.MULTILINE)
+_BATTERY_TEMPERATURE = re.compile(r"^\s*temperature:\s*(-?\d+)", re.MULTILINE)
+_WAKEFULNESS = re.compile(r"mWakefulness=(\w+)")
+
+
+def default_selection_policy() -> Optional[str]:
+    """Policy name from ``WORKFLOW_SELECTION_POLICY``; selection is off when unset."""
+    return os.getenv(SELECTION_POLICY_ENV) or None
+
+
+@dataclass(frozen=True)
+class DeviceProbe:
+    """
+    What selection knows about one device; ``None`` means the probe could not
+    tell, and ``reachable`` is false when the device did not answer at all.
+    """
+
+    serial: str
+    battery_level: Optional[int] = None
+    temperature: Optional[float] = None
+    screen_on: Optional[bool] = None
+    leased: bool = False
+    last_used: float = 0.0
+    probed_at: float = 0.0
+    reachable: bool = True
+
+
+def probe_device(device: Any) -> DeviceProbe:
+    """Read battery and power state over ``adb shell``; failures leave fields unknown."""
+    battery_level = temperature = screen_on = None
+    reachable = True
+    try:
+        battery = device.shell("dumpsys battery")
+        level = _BATTERY_LEVEL.search(battery)
+        if level:
+            battery_level = int(level.group(1))
+        tenths = _BATTERY_TEMPERATURE.search(battery)
+        if tenths:
+            temperature = int(tenths.group(1)) / 10
+        wakefulness = _WAKEFULNESS.search(device.shell("dumpsys power"))
+        if wakefulness:
+            screen_on = wakefulness.group(1) == "Awake"
+    except Exception as exc:
+        reachable = False
+        emit(
+            "device.probe",
+            lambda: f"Probe of device '{device.serial}' failed: {exc!r}",
+            WARNING,
+            device_id=device.serial,
+        )
+    return DeviceProbe(
+        serial=device.serial,
+        battery_level=battery_level,
+        temperature=temperature,
+        screen_on=screen_on,
+        reachable=reachable,
+    )
+
+
+class SelectionPolicy(Protocol):
+    def rank(self, probes: Sequence[DeviceProbe], workflow_name: Optional[str]) -> list[DeviceProbe]:
+        """Return ``probes`` best candidate first."""
+        ...
+
+
+class LeastRecentlyUsedPolicy:
+    """Prefer the device that has been idle longest."""
+
+    def rank(self, probes: Sequence[DeviceProbe], workflow_name: Optional[str]) -> list[DeviceProbe]:
+        return sorted(probes, key=lambda probe: probe.last_used)
+
+
+class LeastLoadedPolicy:
+    """Prefer cool devices with charge to spare, then the longest idle; unknowns go last."""
+
+    def rank(self, probes: Sequence[DeviceProbe], workflow_name: Optional[str]) -> list[DeviceProbe]:
+        return sorted(
+            probes,
+            key=lambda probe: (
+                round(probe.temperature) if probe.temperature is not None else math.inf,
+                -(probe.battery_level or 0),
+                probe.last_used,
+            ),
+        )
+
+
+class StickyPolicy:
+    """
+    Keep each workflow on the device it last ran on; otherwise defer to ``fallback``.
+
+    Within a process the device picked last wins. A fresh process (each cron
+    run) starts from the device the workflow last succeeded on in the run
+    history (``WORKFLOW_HISTORY_PATH`` unless ``history`` is given); without
+    a history, stickiness only lasts as long as the process.
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[SelectionPolicy] = None,
+        history: Optional[RunHistory] = None,
+    ) -> None:
+        self.fallback = fallback or LeastRecentlyUsedPolicy()
+        self.history = history
+        self._assigned: dict[str, str] = {}
+
+    def rank(self, probes: Sequence[DeviceProbe], workflow_name: Optional[str]) -> list[DeviceProbe]:
+        ranked = self.fallback.rank(probes, workflow_name)
+        preferred = self._preferred(workflow_name) if workflow_name else None
+        ranked.sort(key=lambda probe: probe.serial != preferred)
+        return ranked
+
+    def _preferred(self, workflow_name: str) -> Optional[str]:
+        if workflow_name in self._assigned:
+            return self._assigned[workflow_name]
+        history = self.history
+        if history is None:
+            path = default_history_path()
+            if path is None:
+                return None
+            history = run_history(path)
+        successes = history.last_successes(workflow_name)
+        if not successes:
+            return None
+        (_, serial), _ = max(successes.items(), key=lambda item: item[1])
+        return serial
+
+    def remember(self, workflow_name: Optional[str], serial: str) -> None:
+        if workflow_name:
+            self._assigned[workflow_name] = serial
+
+
+class ReliabilityPolicy:
+    """
+    Prefer devices where the workflow failed least over the last ``hours``,
+    from the run history (``WORKFLOW_HISTORY_PATH`` unless ``history`` is
+    given); ties and devices without history follow ``fallback``.
+    """
+
+    def __init__(
+        self,
+        history: Optional[RunHistory] = None,
+        hours: float = 24.0,
+        fallback: Optional[SelectionPolicy] = None,
+    ) -> None:
+        self.history = history
+        self.hours = hours
+        self.fallback = fallback or LeastRecentlyUsedPolicy()
+
+    def rank(self, probes: Sequence[DeviceProbe], workflow_name: Optional[str]) -> list[DeviceProbe]:
+        ranked = self.fallback.rank(probes, workflow_name)
+        history = self.history
+        if history is None:
+            path = default_history_path()
+            if path is None:
+                return ranked
+            history = run_history(path)
+        rates = history.failure_rates_by_device(self.hours, workflow=workflow_name)
+        ranked.sort(key=lambda probe: rates.get(probe.serial, 0.0))
+        return ranked
+
+
+POLICIES: dict[str, Callable[[], SelectionPolicy]] = {
+    "lru": LeastRecentlyUsedPolicy,
+    "least-loaded": LeastLoadedPolicy,
+    "sticky": StickyPolicy,
+    "reliable": ReliabilityPolicy,
+}
+
+
+class DeviceSelector:
+    """
+    Probe every attached device concurrently and rank them under a policy.
+
+    Probes are cached for ``probe_ttl`` seconds so repeated selections in one
+    process cost no adb round trips. Devices below ``min_battery`` or above
+    ``max_temperature`` are only picked when nothing else is available, and
+    devices leased in ``lease_dir`` are skipped unless every device is busy.
+    """
+
+    def __init__(
+        self,
+        policy: SelectionPolicy | str = "lru",
+        probe_ttl: float = 5.0,
+        lease_dir: Optional[str] = None,
+        min_battery: int = 15,
+        max_temperature: float = 45.0,
+        max_workers: int = 8,
+        probe: Callable[[Any], DeviceProbe] = probe_device,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if isinstance(policy, str):
+            factory = POLICIES.get(policy)
+            if factory is None:
+                raise ValueError(
+                    f"Unknown selection policy '{policy}'; expected one of {', '.join(POLICIES)}."
+                )
+            policy = factory()
+        self.policy = policy
+        self.probe_ttl = probe_ttl
+        self.leases = DeviceLeaseManager(lease_dir) if lease_dir else None
+        self.min_battery = min_battery
+        self.max_temperature = max_temperature
+        self.max_workers = max_workers
+        self._probe = probe
+        self._clock = clock
+        self._cache: dict[str, DeviceProbe] = {}
+        self._last_used: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def probes(self, devices: Optional[Sequence[Any]] = None) -> list[DeviceProbe]:
+        """Fresh-enough probes for ``devices`` (default: every adb device)."""
+        if devices is None:
+            devices = adbutils.adb.device_list()
+        now = self._clock()
+        with self._lock:
+            stale = [
+                device
+                for device in devices
+                if device.serial not in self._cache
+                or now - self._cache[device.serial].probed_at > self.probe_ttl
+            ]
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as pool:
+                fresh = list(pool.map(self._probe, stale))
+            with self._lock:
+                for probe in fresh:
+                    self._cache[probe.serial] = replace(probe, probed_at=now)
+        with self._lock:
+            cached = [self._cache[device.serial] for device in devices]
+        return [self._with_usage(probe) for probe in cached]
+
+    def ranked(
+        self, workflow_name: Optional[str] = None, devices: Optional[Sequence[Any]] = None
+    ) -> list[str]:
+        """Serials best first; leased and unhealthy devices sink to the end."""
+        probes = self.probes(devices)
+        if not probes:
+            raise RuntimeError("No connected Android devices found.")
+        healthy = [probe for probe in probes if self._healthy(probe)]
+        unhealthy = [probe for probe in probes if not self._healthy(probe)]
+        ranked = self.policy.rank(healthy, workflow_name) + self.policy.rank(unhealthy, workflow_name)
+        ranked.sort(key=lambda probe: probe.leased)
+        return [probe.serial for probe in ranked]
+
+    def select(
+        self, workflow_name: Optional[str] = None, devices: Optional[Sequence[Any]] = None
+    ) -> str:
+        """Pick the best device and record it as used."""
+        serial = self.ranked(workflow_name, devices)[0]
+        self.record_use(serial, workflow_name)
+        return serial
+
+    def record_use(self, serial: str, workflow_name: Optional[str] = None) -> None:
+        with self._lock:
+            self._last_used[serial] = time.time()
+        remember = getattr(self.policy, "remember", None)
+        if callable(remember):
+            remember(workflow_name, serial)
+
+    def _healthy(self, probe: DeviceProbe) -> bool:
+        if not probe.reachable:
+            return False
+        if probe.battery_level is not None and probe.battery_level < self.min_battery:
+            return False
+        if probe.temperature is not None and probe.temperature > self.max_temperature:
+            return False
+        return True
+
+    def _with_usage(self, probe: DeviceProbe) -> DeviceProbe:
+        last_used = self._last_used.get(probe.serial, 0.0)
+        leased = False
+        if self.leases is not None:
+            leased = self.leases.is_leased(probe.serial)
+            last_used = max(last_used, self.leases.last_released(probe.serial))
+        return replace(probe, leased=leased, last_used=last_used)
+
+
+_selectors: dict[tuple[str, Optional[str]], DeviceSelector] = {}
+_selectors_lock = threading.Lock()
+
+
+def default_selector(policy: str, lease_dir: Optional[str] = None) -> DeviceSelector:
+    """Process-wide selector per policy, so probe caches and sticky state are shared."""
+    with _selectors_lock:
+        selector = _selectors.get((policy, lease_dir))
+        if selector is None:
+            selector = _selectors[(policy, lease_dir)] = DeviceSelector(policy, lease_dir=lease_dir)
+        return selector
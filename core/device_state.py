@@ -0,0 +1,122 @@
+"""TTL-cached snapshot of the device state reported by ``u2.Device.info``."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+# Device calls that change what ``info`` reports; calling any of them through
+# DeviceStateCache drops the cached snapshot.
+MUTATING_METHODS = frozenset(
+    {
+        "app_clear",
+        "app_start",
+        "app_stop",
+        "app_stop_all",
+        "click",
+        "double_click",
+        "drag",
+        "freeze_rotation",
+        "long_click",
+        "open_notification",
+        "open_quick_settings",
+        "open_url",
+        "press",
+        "screen_off",
+        "screen_on",
+        "set_orientation",
+        "shell",
+        "swipe",
+        "swipe_ext",
+        "swipe_points",
+        "unlock",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceState:
+    """Screen, foreground package and display size from a single ``info`` fetch."""
+
+    screen_on: bool
+    current_package: str | None
+    window_size: tuple[int, int] | None
+    fetched_at: float
+    info: Mapping[str, Any]
+
+    @classmethod
+    def from_info(cls, info: Mapping[str, Any], fetched_at: float) -> "DeviceState":
+        width = info.get("displayWidth")
+        height = info.get("displayHeight")
+        return cls(
+            screen_on=bool(info.get("screenOn", False)),
+            current_package=info.get("currentPackageName"),
+            window_size=(int(width), int(height)) if width and height else None,
+            fetched_at=fetched_at,
+            info=dict(info),
+        )
+
+
+class DeviceStateCache:
+    """
+    Share one ``device.info`` RPC between the orchestrator and workflows.
+
+    :meth:`snapshot` returns the cached :class:`DeviceState` while it is
+    younger than ``ttl_seconds``. Any other attribute is forwarded to the
+    wrapped device; calls listed in :data:`MUTATING_METHODS` invalidate the
+    snapshot first, so ``cache.swipe(...)`` followed by ``cache.snapshot()``
+    always observes the new state.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        ttl_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.device = device
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: DeviceState | None = None
+
+    def snapshot(self, max_age: float | None = None) -> DeviceState:
+        """Return device state no older than ``max_age`` (defaults to the TTL)."""
+        max_age = self.ttl_seconds if max_age is None else max_age
+        with self._lock:
+            state = self._state
+            if state is not None and self._clock() - state.fetched_at <= max_age:
+                return state
+        info = self.device.info
+        state = DeviceState.from_info(info, self._clock())
+        with self._lock:
+            self._state = state
+        return state
+
+    def refresh(self) -> DeviceState:
+        """Fetch and cache fresh state regardless of the TTL."""
+        self.invalidate()
+        return self.snapshot()
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next read fetches fresh state."""
+        with self._lock:
+            self._state = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or "device" not in self.__dict__:
+            raise AttributeError(name)
+        attribute = getattr(self.device, name)
+        if name not in MUTATING_METHODS or not callable(attribute):
+            return attribute
+
+        def mutating_call(*args: Any, **kwargs: Any) -> Any:
+            self.invalidate()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self.invalidate()
+
+        return mutating_call
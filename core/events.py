@@ -0,0 +1,274 @@
+"""
+Structured run events: an in-memory ring buffer, optional JSONL file, console echo.
+
+``emit`` is the replacement for ``print`` on the run path. Events below the
+recording level are dropped by a single integer comparison; pass the message
+as a zero-argument callable (``lambda: f"..."``) so that formatting it is
+skipped too, and only happens for events that are recorded. Recorded events
+go into a bounded ring buffer that failed runs can dump. When
+``WORKFLOW_EVENT_LOG`` is set they are also appended to that JSONL file by a
+background thread, so the run never waits on file I/O. Console echo keeps
+the old ``print`` output and defaults to ``info``, or to ``warning`` once a
+log file is configured.
+
+Environment:
+    ``WORKFLOW_EVENT_LOG``      JSONL file to append events to.
+    ``WORKFLOW_EVENT_LEVEL``    lowest level recorded (default ``info``).
+    ``WORKFLOW_EVENT_CONSOLE``  lowest level echoed to stdout, or ``off``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TextIO, Union
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+# Event text, or a callable building it once the event is known to be recorded.
+Message = Union[str, Callable[[], str]]
+
+EVENT_LOG_ENV = "WORKFLOW_EVENT_LOG"
+EVENT_LEVEL_ENV = "WORKFLOW_EVENT_LEVEL"
+EVENT_CONSOLE_ENV = "WORKFLOW_EVENT_CONSOLE"
+
+# (workflow, action, device_id) of the run the current thread or task is serving.
+_run_context: contextvars.ContextVar[tuple[Optional[str], Optional[str], Optional[str]]] = (
+    contextvars.ContextVar("workflow_run_context", default=(None, None, None))
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """One thing that happened during a run."""
+
+    timestamp: float
+    level: int
+    kind: str
+    message: str
+    workflow: Optional[str] = None
+    action: Optional[str] = None
+    device_id: Optional[str] = None
+    fields: dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "timestamp": self.timestamp,
+                "level": _LEVEL_NAMES.get(self.level, str(self.level)),
+                "kind": self.kind,
+                "message": self.message,
+                "workflow": self.workflow,
+                "action": self.action,
+                "device_id": self.device_id,
+                **self.fields,
+            },
+            ensure_ascii=False,
+            default=repr,
+        )
+
+
+def parse_level(value: Optional[str], default: int) -> int:
+    if not value:
+        return default
+    try:
+        return LEVELS[value.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown event level '{value}'; expected one of {', '.join(LEVELS)}."
+        ) from None
+
+
+@contextlib.contextmanager
+def bind(
+    workflow: Optional[str] = None, action: Optional[str] = None, device_id: Optional[str] = None
+) -> Iterator[None]:
+    """Attach run identity to every event emitted in this thread or task."""
+    token = _run_context.set((workflow, action, device_id))
+    try:
+        yield
+    finally:
+        _run_context.reset(token)
+
+
+class EventLog:
+    """
+    Ring buffer of the last ``capacity`` events plus optional sinks.
+
+    The JSONL sink at ``path`` is written by a daemon thread every
+    ``flush_interval`` seconds (and on :meth:`flush`/:meth:`close`). The
+    console sink prints the message text synchronously, like ``print`` did.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 2000,
+        level: int = INFO,
+        path: Optional[str | os.PathLike[str]] = None,
+        console_level: int = INFO,
+        flush_interval: float = 1.0,
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        self.level = level
+        self.console_level = console_level
+        self.path = Path(path) if path is not None else None
+        self.flush_interval = flush_interval
+        self._stream = stream
+        self._ring: deque[Event] = deque(maxlen=capacity)
+        self._pending: deque[Event] = deque()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if self.path is not None:
+            self._thread = threading.Thread(target=self._run, name="workflow-events", daemon=True)
+            self._thread.start()
+
+    def emit(
+        self,
+        kind: str,
+        message: Message,
+        level: int = INFO,
+        *,
+        workflow: Optional[str] = None,
+        action: Optional[str] = None,
+        device_id: Optional[str] = None,
+        **fields: Any,
+    ) -> None:
+        if level < self.level:
+            return
+        bound_workflow, bound_action, bound_device = _run_context.get()
+        event = Event(
+            timestamp=time.time(),
+            level=level,
+            kind=kind,
+            message=message() if callable(message) else message,
+            workflow=workflow if workflow is not None else bound_workflow,
+            action=str(action) if action is not None else bound_action,
+            device_id=device_id if device_id is not None else bound_device,
+            fields=fields,
+        )
+        # deque.append is atomic, so emitting threads never contend on a lock.
+        self._ring.append(event)
+        if self.path is not None:
+            self._pending.append(event)
+        if level >= self.console_level:
+            print(event.message, file=self._stream or sys.stdout)
+
+    def recent(
+        self,
+        since: float = 0.0,
+        workflow: Optional[str] = None,
+        device_id: Optional[str] = None,
+    ) -> list[Event]:
+        """Buffered events at or after ``since``, optionally for one workflow/device."""
+        return [
+            event
+            for event in list(self._ring)
+            if event.timestamp >= since
+            and (workflow is None or event.workflow == workflow)
+            and (device_id is None or event.device_id == device_id)
+        ]
+
+    def dump(
+        self,
+        target: Optional[str | os.PathLike[str]] = None,
+        since: float = 0.0,
+        workflow: Optional[str] = None,
+        device_id: Optional[str] = None,
+    ) -> int:
+        """Write matching buffered events as JSON lines to ``target`` (default stderr)."""
+        events = self.recent(since, workflow, device_id)
+        lines = "".join(event.to_json() + "\n" for event in events)
+        if target is None:
+            sys.stderr.write(lines)
+        else:
+            path = Path(target)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(lines, encoding="utf-8")
+        return len(events)
+
+    def flush(self) -> None:
+        """Append pending events to the JSONL file now."""
+        if self.path is None:
+            return
+        with self._write_lock:
+            batch = []
+            while self._pending:
+                batch.append(self._pending.popleft())
+            if not batch:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write("".join(event.to_json() + "\n" for event in batch))
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as exc:
+                print(f"Event log '{self.path}' could not be written: {exc!r}", file=sys.stderr)
+
+
+_event_log: Optional[EventLog] = None
+_event_log_lock = threading.Lock()
+
+
+def event_log() -> EventLog:
+    """Process-wide event log configured from the environment, flushed at exit."""
+    global _event_log
+    log = _event_log
+    if log is not None:
+        return log
+    with _event_log_lock:
+        if _event_log is None:
+            path = os.getenv(EVENT_LOG_ENV) or None
+            _event_log = EventLog(
+                level=parse_level(os.getenv(EVENT_LEVEL_ENV), INFO),
+                path=path,
+                console_level=parse_level(
+                    os.getenv(EVENT_CONSOLE_ENV), WARNING if path else INFO
+                ),
+            )
+            atexit.register(_event_log.close)
+        return _event_log
+
+
+def set_event_log(log: Optional[EventLog]) -> Optional[EventLog]:
+    """Replace the process-wide log (``None`` re-reads the environment); returns the old one."""
+    global _event_log
+    with _event_log_lock:
+        previous, _event_log = _event_log, log
+    return previous
+
+
+def emit(kind: str, message: Message, level: int = INFO, **fields: Any) -> None:
+    """Record an event on the process-wide log."""
+    log = _event_log or event_log()
+    if level < log.level:
+        return
+    log.emit(kind, message, level, **fields)
@@ -0,0 +1,265 @@
+"""Record gestures from a live run and replay them as batched ``input`` scripts."""
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .events import emit
+from .ui_hierarchy import UIHierarchy
+from .ui_wait import wait_until
+
+MACRO_VERSION = 1
+
+# u2 ``press`` names -> Android key codes understood by ``input keyevent``.
+_KEYCODES = {
+    "home": "KEYCODE_HOME",
+    "back": "KEYCODE_BACK",
+    "left": "KEYCODE_DPAD_LEFT",
+    "right": "KEYCODE_DPAD_RIGHT",
+    "up": "KEYCODE_DPAD_UP",
+    "down": "KEYCODE_DPAD_DOWN",
+    "center": "KEYCODE_DPAD_CENTER",
+    "menu": "KEYCODE_MENU",
+    "search": "KEYCODE_SEARCH",
+    "enter": "KEYCODE_ENTER",
+    "delete": "KEYCODE_DEL",
+    "del": "KEYCODE_DEL",
+    "recent": "KEYCODE_APP_SWITCH",
+    "volume_up": "KEYCODE_VOLUME_UP",
+    "volume_down": "KEYCODE_VOLUME_DOWN",
+    "volume_mute": "KEYCODE_VOLUME_MUTE",
+    "camera": "KEYCODE_CAMERA",
+    "power": "KEYCODE_POWER",
+}
+
+
+class MacroCheckpointError(RuntimeError):
+    """The device did not reach a recorded checkpoint during replay."""
+
+
+@dataclass
+class GestureMacro:
+    """
+    Ordered gesture steps, serialized as JSON.
+
+    Each step is a dict with an ``op`` of ``tap``, ``long_press``, ``swipe``,
+    ``key``, ``text``, ``wait`` or ``checkpoint``. Coordinates may be
+    absolute pixels or, as with u2, fractions of the screen.
+    """
+
+    steps: list[dict[str, Any]] = field(default_factory=list)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(
+            json.dumps({"version": MACRO_VERSION, "steps": self.steps}, indent=1) + "\n",
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "GestureMacro":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != MACRO_VERSION:
+            raise ValueError(f"Unsupported macro version {data.get('version')!r} in {path}.")
+        return cls(steps=list(data["steps"]))
+
+
+class GestureRecorder:
+    """
+    Device proxy that forwards every call and records gestures with the pauses
+    between them.
+
+    Pauses shorter than ``min_wait`` are dropped; call :meth:`checkpoint` at
+    points where replay should verify the screen before continuing.
+    """
+
+    def __init__(
+        self,
+        device: Any,
+        min_wait: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.device = device
+        self.min_wait = min_wait
+        self._clock = clock
+        self._last = clock()
+        self.macro = GestureMacro()
+
+    def click(self, x: float, y: float) -> Any:
+        self._record({"op": "tap", "x": x, "y": y})
+        return self.device.click(x, y)
+
+    def long_click(self, x: float, y: float, duration: float = 0.5) -> Any:
+        self._record({"op": "long_press", "x": x, "y": y, "duration": duration})
+        return self.device.long_click(x, y, duration)
+
+    def swipe(
+        self,
+        fx: float,
+        fy: float,
+        tx: float,
+        ty: float,
+        duration: Optional[float] = None,
+        steps: Optional[int] = None,
+    ) -> Any:
+        # u2 defaults a swipe to 55 steps of 5ms.
+        seconds = duration if duration is not None else (steps or 55) * 0.005
+        self._record({"op": "swipe", "x": fx, "y": fy, "x2": tx, "y2": ty, "duration": seconds})
+        return self.device.swipe(fx, fy, tx, ty, duration=duration, steps=steps)
+
+    def press(self, key: Union[int, str], meta: Any = None) -> Any:
+        self._record({"op": "key", "key": key})
+        return self.device.press(key, meta) if meta is not None else self.device.press(key)
+
+    def send_keys(self, text: str, clear: bool = False) -> Any:
+        self._record({"op": "text", "text": text})
+        return self.device.send_keys(text, clear)
+
+    def checkpoint(
+        self, name: str, package: Optional[str] = None, text: Optional[str] = None, timeout: float = 5.0
+    ) -> None:
+        """Mark a verification point: the foreground ``package`` and/or a visible ``text``."""
+        self._record(
+            {"op": "checkpoint", "name": name, "package": package, "text": text, "timeout": timeout},
+            pause=False,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or "device" not in self.__dict__:
+            raise AttributeError(name)
+        return getattr(self.device, name)
+
+    def _record(self, step: dict[str, Any], pause: bool = True) -> None:
+        now = self._clock()
+        waited = now - self._last
+        self._last = now
+        if pause and waited >= self.min_wait and self.macro.steps:
+            self.macro.steps.append({"op": "wait", "seconds": round(waited, 3)})
+        self.macro.steps.append(step)
+
+
+def mark_checkpoint(device: Any, name: str, **expected: Any) -> None:
+    """Record a checkpoint when ``device`` is being recorded; a no-op otherwise."""
+    if isinstance(device, GestureRecorder):
+        device.checkpoint(name, **expected)
+
+
+def _is_relative(x: Any, y: Any) -> bool:
+    return isinstance(x, float) and isinstance(y, float) and 0 <= x <= 1 and 0 <= y <= 1
+
+
+def _key_argument(key: Union[int, str]) -> str:
+    if isinstance(key, int) or str(key).isdigit():
+        return str(key)
+    return _KEYCODES.get(str(key).lower(), f"KEYCODE_{str(key).upper()}")
+
+
+def compile_segments(
+    macro: GestureMacro,
+    window_size: Optional[tuple[int, int]] = None,
+    speed: float = 1.0,
+) -> list[tuple[str, Optional[dict[str, Any]]]]:
+    """
+    Turn ``macro`` into ``(shell script, checkpoint)`` pairs.
+
+    Everything between two checkpoints becomes one ``;``-joined script of
+    ``input``/``sleep`` commands, so a segment costs one device round trip.
+    ``speed`` > 1 shortens recorded pauses (gesture durations are kept).
+    """
+
+    def point(x: float, y: float) -> str:
+        if _is_relative(x, y):
+            if window_size is None:
+                raise ValueError("Relative coordinates need the device window size.")
+            x, y = x * window_size[0], y * window_size[1]
+        return f"{int(round(x))} {int(round(y))}"
+
+    segments: list[tuple[str, Optional[dict[str, Any]]]] = []
+    commands: list[str] = []
+    for step in macro.steps:
+        op = step["op"]
+        if op == "tap":
+            commands.append(f"input tap {point(step['x'], step['y'])}")
+        elif op == "long_press":
+            start = point(step["x"], step["y"])
+            commands.append(f"input swipe {start} {start} {int(step['duration'] * 1000)}")
+        elif op == "swipe":
+            commands.append(
+                f"input swipe {point(step['x'], step['y'])} {point(step['x2'], step['y2'])} "
+                f"{max(1, int(step['duration'] * 1000))}"
+            )
+        elif op == "key":
+            commands.append(f"input keyevent {_key_argument(step['key'])}")
+        elif op == "text":
+            # ``input text`` treats %s as a space and needs shell quoting for the rest.
+            commands.append(f"input text {shlex.quote(step['text'].replace(' ', '%s'))}")
+        elif op == "wait":
+            seconds = step["seconds"] / speed
+            if seconds >= 0.01:
+                commands.append(f"sleep {seconds:.3f}")
+        elif op == "checkpoint":
+            segments.append(("; ".join(commands), step))
+            commands = []
+        else:
+            raise ValueError(f"Unknown macro op {op!r}.")
+    if commands:
+        segments.append(("; ".join(commands), None))
+    return segments
+
+
+class MacroPlayer:
+    """Replay a :class:`GestureMacro` one shell call per segment, verifying checkpoints."""
+
+    def __init__(self, device: Any, speed: float = 1.0, verify: bool = True) -> None:
+        self.device = device
+        self.speed = speed
+        self.verify = verify
+
+    def play(self, macro: GestureMacro) -> int:
+        """Replay ``macro``; returns the number of device shell calls made."""
+        window_size = None
+        if any(
+            _is_relative(step.get("x"), step.get("y")) or _is_relative(step.get("x2"), step.get("y2"))
+            for step in macro.steps
+        ):
+            window_size = tuple(self.device.window_size())
+        calls = 0
+        for script, checkpoint in compile_segments(macro, window_size, self.speed):
+            if script:
+                self.device.shell(script, timeout=max(60, self._duration(script) + 30))
+                calls += 1
+            if checkpoint is not None and self.verify:
+                self._verify(checkpoint)
+        return calls
+
+    def _verify(self, checkpoint: dict[str, Any]) -> None:
+        package = checkpoint.get("package")
+        text = checkpoint.get("text")
+
+        def reached() -> bool:
+            if package and self.device.app_current().get("package") != package:
+                return False
+            if text and not UIHierarchy.capture(self.device).exists(text=text):
+                return False
+            return True
+
+        if not wait_until(reached, timeout=checkpoint.get("timeout", 5.0)):
+            raise MacroCheckpointError(f"Macro checkpoint '{checkpoint['name']}' was not reached.")
+        emit(
+            "macro.checkpoint",
+            lambda: f"Macro checkpoint '{checkpoint['name']}' reached.",
+            checkpoint=checkpoint["name"],
+        )
+
+    @staticmethod
+    def _duration(script: str) -> float:
+        return sum(
+            float(command.split()[1]) for command in script.split("; ") if command.startswith("sleep ")
+        )
@@ -0,0 +1,293 @@
+"""Append-only SQLite history of workflow results with indexed summary queries."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .workflow_types import WorkflowActionResult
+
+HISTORY_PATH_ENV = "WORKFLOW_HISTORY_PATH"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    workflow TEXT NOT NULL,
+    action TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    attempt INTEGER NOT NULL,
+    duration REAL,
+    error_class TEXT,
+    error TEXT,
+    timings TEXT NOT NULL,
+    steps TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_device ON runs (workflow, device_id, finished_at, success);
+CREATE INDEX IF NOT EXISTS runs_by_action ON runs (workflow, action, finished_at, duration);
+CREATE INDEX IF NOT EXISTS runs_by_target ON runs (workflow, action, device_id, success, finished_at);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (finished_at, success);
+"""
+
+
+def default_history_path() -> Optional[str]:
+    """History database from ``WORKFLOW_HISTORY_PATH``; recording is off when unset."""
+    return os.getenv(HISTORY_PATH_ENV) or None
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    """One stored run."""
+
+    finished_at: float
+    workflow: str
+    action: str
+    device_id: str
+    success: bool
+    attempt: int
+    duration: Optional[float]
+    error_class: Optional[str]
+    error: Optional[str]
+    timings: dict[str, float]
+
+
+class RunHistory:
+    """
+    Every :class:`WorkflowActionResult` as one row in a SQLite database.
+
+    The database runs in WAL mode, so cron processes, the daemon and readers
+    can share one file. The queries below find their rows through an index
+    on the filtered columns and time; :meth:`duration_percentiles` still
+    sorts each group's durations. ``attempt`` counts consecutive failures of the same
+    workflow, action and device, and is 1 after a success. Rows older than
+    ``retention_days`` are removed every ``compact_every`` inserts, or by
+    calling :meth:`compact`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        retention_days: float = 30.0,
+        compact_every: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.compact_every = compact_every
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._inserts = 0
+        with self._lock, self._connection:
+            # auto_vacuum only takes effect before the first table exists.
+            self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.executescript(_SCHEMA)
+
+    def record(
+        self,
+        result: WorkflowActionResult,
+        attempt: Optional[int] = None,
+        finished_at: Optional[float] = None,
+    ) -> int:
+        """Store ``result``; returns the attempt number it was stored with."""
+        finished_at = time.time() if finished_at is None else finished_at
+        workflow = result.workflow or ""
+        action = str(result.action or "")
+        device_id = result.device_id or ""
+        error = result.error
+        with self._lock, self._connection:
+            if attempt is None:
+                attempt = self._attempt(workflow, action, device_id)
+            self._connection.execute(
+                "INSERT INTO runs (finished_at, workflow, action, device_id, success, attempt,"
+                " duration, error_class, error, timings, steps)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    finished_at,
+                    workflow,
+                    action,
+                    device_id,
+                    int(bool(result.success)),
+                    attempt,
+                    result.timings.get("total"),
+                    type(error).__name__ if error is not None else None,
+                    str(error)[:2000] if error is not None else None,
+                    json.dumps(result.timings),
+                    json.dumps([[str(step.action), step.success] for step in result.steps]),
+                ),
+            )
+            self._inserts += 1
+            due = self.compact_every and self._inserts % self.compact_every == 0
+        if due:
+            self.compact()
+        return attempt
+
+    def _attempt(self, workflow: str, action: str, device_id: str) -> int:
+        failures = self._connection.execute(
+            "SELECT COUNT(*) FROM runs WHERE workflow = ? AND action = ? AND device_id = ?"
+            " AND success = 0 AND finished_at > COALESCE((SELECT MAX(finished_at) FROM runs"
+            " WHERE workflow = ? AND action = ? AND device_id = ? AND success = 1), 0)",
+            (workflow, action, device_id) * 2,
+        ).fetchone()[0]
+        return failures + 1
+
+    def last_success(self, workflow: str, device_id: Optional[str] = None) -> Optional[float]:
+        """When ``workflow`` last succeeded (on ``device_id`` if given), as a Unix time."""
+        query = "SELECT MAX(finished_at) FROM runs WHERE workflow = ? AND success = 1"
+        params: list[Any] = [workflow]
+        if device_id is not None:
+            query += " AND device_id = ?"
+            params.append(device_id)
+        return self._scalar(query, params)
+
+    def last_successes(self, workflow: Optional[str] = None) -> dict[tuple[str, str], float]:
+        """Last success time per ``(workflow, device_id)``."""
+        query = "SELECT workflow, device_id, MAX(finished_at) FROM runs WHERE success = 1"
+        params: list[Any] = []
+        if workflow is not None:
+            query += " AND workflow = ?"
+            params.append(workflow)
+        rows = self._rows(query + " GROUP BY workflow, device_id", params)
+        return {(row[0], row[1]): row[2] for row in rows}
+
+    def failure_rate(
+        self,
+        hours: float,
+        workflow: Optional[str] = None,
+        action: Optional[str] = None,
+        device_id: Optional[str] = None,
+    ) -> Optional[float]:
+        """Share of failed runs over the last ``hours``; ``None`` when nothing ran."""
+        where, params = self._window(hours, workflow=workflow, action=action, device_id=device_id)
+        row = self._rows(f"SELECT COUNT(*), SUM(1 - success) FROM runs WHERE {where}", params)[0]
+        return row[1] / row[0] if row[0] else None
+
+    def failure_rates_by_device(
+        self, hours: float, workflow: Optional[str] = None
+    ) -> dict[str, float]:
+        """Failure rate per device over the last ``hours``."""
+        where, params = self._window(hours, workflow=workflow)
+        rows = self._rows(
+            f"SELECT device_id, AVG(1 - success) FROM runs WHERE {where} GROUP BY device_id", params
+        )
+        return {row[0]: row[1] for row in rows}
+
+    def duration_percentiles(
+        self,
+        hours: float,
+        percentile: float = 0.95,
+        workflow: Optional[str] = None,
+    ) -> dict[tuple[str, str], float]:
+        """Nearest-rank ``percentile`` of run duration per ``(workflow, action)``."""
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be in (0, 1]")
+        # Pin both ends of the window so every per-group query counts the same rows.
+        until = time.time()
+        since = until - hours * 3600
+        where, params = self._window(hours, workflow=workflow, since=since, until=until)
+        where += " AND duration IS NOT NULL"
+        groups = self._rows(
+            f"SELECT workflow, action, COUNT(*) FROM runs WHERE {where} GROUP BY workflow, action",
+            params,
+        )
+        percentiles: dict[tuple[str, str], float] = {}
+        for group_workflow, action, count in groups:
+            group_where, group_params = self._window(
+                hours, workflow=group_workflow, action=action, since=since, until=until
+            )
+            percentiles[(group_workflow, action)] = self._scalar(
+                f"SELECT duration FROM runs WHERE {group_where} AND duration IS NOT NULL"
+                " ORDER BY duration LIMIT 1 OFFSET ?",
+                [*group_params, max(0, math.ceil(percentile * count) - 1)],
+            )
+        return percentiles
+
+    def recent(self, limit: int = 50, workflow: Optional[str] = None) -> list[RunRecord]:
+        """The newest ``limit`` runs, newest first."""
+        query = "SELECT * FROM runs"
+        params: list[Any] = []
+        if workflow is not None:
+            query += " WHERE workflow = ?"
+            params.append(workflow)
+        rows = self._rows(query + " ORDER BY finished_at DESC LIMIT ?", [*params, limit])
+        return [
+            RunRecord(
+                finished_at=row["finished_at"],
+                workflow=row["workflow"],
+                action=row["action"],
+                device_id=row["device_id"],
+                success=bool(row["success"]),
+                attempt=row["attempt"],
+                duration=row["duration"],
+                error_class=row["error_class"],
+                error=row["error"],
+                timings=json.loads(row["timings"]),
+            )
+            for row in rows
+        ]
+
+    def compact(self, retention_days: Optional[float] = None) -> int:
+        """Delete runs older than the retention window; returns how many were removed."""
+        days = self.retention_days if retention_days is None else retention_days
+        cutoff = time.time() - days * 86400
+        with self._lock, self._connection:
+            deleted = self._connection.execute(
+                "DELETE FROM runs WHERE finished_at < ?", (cutoff,)
+            ).rowcount
+        if deleted:
+            with self._lock:
+                self._connection.execute("PRAGMA incremental_vacuum")
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _window(
+        hours: float,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        **filters: Optional[str],
+    ) -> tuple[str, list[Any]]:
+        clauses = ["finished_at >= ?"]
+        params: list[Any] = [time.time() - hours * 3600 if since is None else since]
+        if until is not None:
+            clauses.append("finished_at <= ?")
+            params.append(until)
+        for column, value in filters.items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return " AND ".join(clauses), params
+
+    def _rows(self, query: str, params: list[Any]) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    def _scalar(self, query: str, params: list[Any]) -> Any:
+        rows = self._rows(query, params)
+        return rows[0][0] if rows else None
+
+
+_histories: dict[str, RunHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def run_history(path: str) -> RunHistory:
+    """Process-wide :class:`RunHistory` for ``path``."""
+    with _histories_lock:
+        history = _histories.get(path)
+        if history is None:
+            history = _histories[path] = RunHistory(path)
+        return history
@@ -0,0 +1,343 @@
+"""Parse a single ``dump_hierarchy()`` and answer selector queries locally."""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Iterable, Iterator
+
+_BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# uiautomator2-style selector keyword -> UINode attribute.
+_SELECTOR_FIELDS = {
+    "resourceId": "resource_id",
+    "text": "text",
+    "description": "content_desc",
+    "className": "class_name",
+    "packageName": "package",
+    "clickable": "clickable",
+    "checkable": "checkable",
+    "checked": "checked",
+    "enabled": "enabled",
+    "focusable": "focusable",
+    "focused": "focused",
+    "scrollable": "scrollable",
+    "selected": "selected",
+    "index": "index",
+}
+
+# XPath attribute name (as in the dump XML) -> UINode attribute.
+_XML_ATTRIBUTES = {
+    "resource-id": "resource_id",
+    "text": "text",
+    "content-desc": "content_desc",
+    "class": "class_name",
+    "package": "package",
+    "clickable": "clickable",
+    "checkable": "checkable",
+    "checked": "checked",
+    "enabled": "enabled",
+    "focusable": "focusable",
+    "focused": "focused",
+    "scrollable": "scrollable",
+    "selected": "selected",
+    "index": "index",
+    "bounds": "bounds",
+}
+
+
+class UINode:
+    """One element of the UI hierarchy."""
+
+    __slots__ = (
+        "index",
+        "resource_id",
+        "text",
+        "content_desc",
+        "class_name",
+        "package",
+        "bounds",
+        "checkable",
+        "checked",
+        "clickable",
+        "enabled",
+        "focusable",
+        "focused",
+        "scrollable",
+        "selected",
+        "parent",
+        "children",
+    )
+
+    def __init__(self, attrib: dict[str, str], parent: "UINode | None") -> None:
+        self.index = int(attrib.get("index", "0") or 0)
+        self.resource_id = attrib.get("resource-id", "")
+        self.text = attrib.get("text", "")
+        self.content_desc = attrib.get("content-desc", "")
+        self.class_name = attrib.get("class", "")
+        self.package = attrib.get("package", "")
+        self.bounds = _parse_bounds(attrib.get("bounds", ""))
+        self.checkable = attrib.get("checkable") == "true"
+        self.checked = attrib.get("checked") == "true"
+        self.clickable = attrib.get("clickable") == "true"
+        self.enabled = attrib.get("enabled") == "true"
+        self.focusable = attrib.get("focusable") == "true"
+        self.focused = attrib.get("focused") == "true"
+        self.scrollable = attrib.get("scrollable") == "true"
+        self.selected = attrib.get("selected") == "true"
+        self.parent = parent
+        self.children: list[UINode] = []
+
+    @property
+    def center(self) -> tuple[int, int]:
+        """Screen coordinates of the element's centre, e.g. for ``device.click``."""
+        left, top, right, bottom = self.bounds
+        return (left + right) // 2, (top + bottom) // 2
+
+    def iter(self) -> Iterator["UINode"]:
+        """Yield this node and all of its descendants in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def __repr__(self) -> str:
+        label = self.resource_id or self.text or self.content_desc
+        return f"UINode({self.class_name!r}, {label!r}, bounds={self.bounds})"
+
+
+class UIHierarchy:
+    """
+    Indexed snapshot of the screen built from one ``dump_hierarchy()`` call.
+
+    Nodes are indexed by resource-id, text, content-desc and class, so
+    :meth:`find` starts from the index bucket of the first indexed field in
+    the selector and only scans that bucket for the remaining conditions.
+    :meth:`xpath` supports the common subset used in workflows: ``/`` and
+    ``//`` steps, ``*`` or a class name, ``[@attr='v']``,
+    ``[contains(@attr,'v')]``, ``[starts-with(@attr,'v')]``, ``and`` and
+    positional ``[n]`` predicates (applied to each step's matches per context
+    node).
+
+    The snapshot never refreshes itself; call :meth:`refresh` after the screen
+    changes.
+    """
+
+    def __init__(self, xml: str, device: Any | None = None) -> None:
+        self.device = device
+        self._load(xml)
+
+    @classmethod
+    def capture(cls, device: Any) -> "UIHierarchy":
+        """Dump the current screen of ``device`` once and index it."""
+        return cls(device.dump_hierarchy(), device=device)
+
+    def refresh(self) -> "UIHierarchy":
+        """Re-dump the hierarchy from the device this snapshot was captured from."""
+        if self.device is None:
+            raise RuntimeError("UIHierarchy was built from XML; no device to refresh from.")
+        self._load(self.device.dump_hierarchy())
+        return self
+
+    def _load(self, xml: str) -> None:
+        root_element = ElementTree.fromstring(xml)
+        self.root = UINode({}, None)
+        stack: list[tuple[ElementTree.Element, UINode]] = [(root_element, self.root)]
+        while stack:
+            element, parent = stack.pop()
+            owner = parent if parent is not self.root else None
+            child_elements = [child for child in element if child.tag == "node"]
+            parent.children = [UINode(child.attrib, owner) for child in child_elements]
+            stack.extend(zip(child_elements, parent.children))
+
+        self.nodes: list[UINode] = [
+            node for top in self.root.children for node in top.iter()
+        ]
+        self._by_resource_id: dict[str, list[UINode]] = {}
+        self._by_text: dict[str, list[UINode]] = {}
+        self._by_content_desc: dict[str, list[UINode]] = {}
+        self._by_class: dict[str, list[UINode]] = {}
+        for node in self.nodes:
+            if node.resource_id:
+                self._by_resource_id.setdefault(node.resource_id, []).append(node)
+            if node.text:
+                self._by_text.setdefault(node.text, []).append(node)
+            if node.content_desc:
+                self._by_content_desc.setdefault(node.content_desc, []).append(node)
+            self._by_class.setdefault(node.class_name, []).append(node)
+
+    def find(self, **selector: Any) -> list[UINode]:
+        """
+        Return nodes matching a uiautomator2-style selector, in document order.
+
+        Supports exact fields (``resourceId``, ``text``, ``description``,
+        ``className``, ``packageName``, boolean flags, ``index``) plus
+        ``textContains``, ``textStartsWith``, ``textMatches``,
+        ``descriptionContains`` and ``resourceIdMatches``.
+        """
+        candidates = self._candidates(selector)
+        return [node for node in candidates if _matches(node, selector)]
+
+    def first(self, **selector: Any) -> UINode | None:
+        """Return the first node matching ``selector`` or ``None``."""
+        candidates = self._candidates(selector)
+        return next((node for node in candidates if _matches(node, selector)), None)
+
+    def exists(self, **selector: Any) -> bool:
+        return self.first(**selector) is not None
+
+    def _candidates(self, selector: dict[str, Any]) -> Iterable[UINode]:
+        for key, index in (
+            ("resourceId", self._by_resource_id),
+            ("text", self._by_text),
+            ("description", self._by_content_desc),
+            ("className", self._by_class),
+        ):
+            # Empty strings are not indexed, so fall through to a full scan.
+            if selector.get(key):
+                return index.get(selector[key], ())
+        return self.nodes
+
+    def xpath(self, expression: str) -> list[UINode]:
+        """Evaluate a simple XPath expression against the snapshot."""
+        steps = _parse_xpath(expression)
+        if steps and steps[0][:2] == ("/", "hierarchy"):
+            # The dump's <hierarchy> element is the snapshot root itself.
+            steps = steps[1:]
+        current: list[UINode] = [self.root]
+        for axis, name, predicates in steps:
+            matched: list[UINode] = []
+            seen: set[int] = set()
+            for context in current:
+                if axis == "//":
+                    pool: Iterable[UINode] = (
+                        node for child in context.children for node in child.iter()
+                    )
+                else:
+                    pool = context.children
+                step_matches = [
+                    node for node in pool if name == "*" or node.class_name == name
+                ]
+                for predicate in predicates:
+                    step_matches = _apply_predicate(step_matches, predicate)
+                for node in step_matches:
+                    if id(node) not in seen:
+                        seen.add(id(node))
+                        matched.append(node)
+            current = matched
+        return current
+
+
+def _parse_bounds(value: str) -> tuple[int, int, int, int]:
+    match = _BOUNDS_PATTERN.fullmatch(value)
+    if match is None:
+        return (0, 0, 0, 0)
+    left, top, right, bottom = (int(group) for group in match.groups())
+    return left, top, right, bottom
+
+
+def _matches(node: UINode, selector: dict[str, Any]) -> bool:
+    for key, expected in selector.items():
+        field = _SELECTOR_FIELDS.get(key)
+        if field is not None:
+            if getattr(node, field) != expected:
+                return False
+        elif key == "textContains":
+            if expected not in node.text:
+                return False
+        elif key == "textStartsWith":
+            if not node.text.startswith(expected):
+                return False
+        elif key == "textMatches":
+            if re.fullmatch(expected, node.text) is None:
+                return False
+        elif key == "descriptionContains":
+            if expected not in node.content_desc:
+                return False
+        elif key == "resourceIdMatches":
+            if re.fullmatch(expected, node.resource_id) is None:
+                return False
+        else:
+            raise ValueError(f"Unsupported selector field '{key}'.")
+    return True
+
+
+# A predicate ends at the first "]" outside quotes, so values like bounds may contain brackets.
+_PREDICATE_BODY = r"""(?:'[^']*'|"[^"]*"|[^\]'"])*"""
+_STEP_PATTERN = re.compile(rf"(//|/)([\w.$*-]+)((?:\[{_PREDICATE_BODY}\])*)")
+_PREDICATE_PATTERN = re.compile(rf"\[({_PREDICATE_BODY})\]")
+_AND_TOKENS = re.compile(r"""'[^']*'|"[^"]*"|\s+and\s+|[^'"\s]+|\s+|['"]""")
+_CONDITION_PATTERN = re.compile(
+    r"""\s*(?:
+        @(?P<attr>[\w-]+)\s*=\s*(?P<quote>['"])(?P<value>.*?)(?P=quote)
+        |(?P<func>contains|starts-with)\(\s*@(?P<fattr>[\w-]+)\s*,\s*
+            (?P<fquote>['"])(?P<fvalue>.*?)(?P=fquote)\s*\)
+    )\s*""",
+    re.VERBOSE,
+)
+
+
+def _parse_xpath(expression: str) -> list[tuple[str, str, list[str]]]:
+    expression = expression.strip()
+    if not expression.startswith("/"):
+        expression = "//" + expression
+    steps: list[tuple[str, str, list[str]]] = []
+    position = 0
+    while position < len(expression):
+        match = _STEP_PATTERN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Unsupported XPath expression: {expression!r}")
+        axis, name, raw_predicates = match.groups()
+        if name == "node":
+            name = "*"
+        steps.append((axis, name, _PREDICATE_PATTERN.findall(raw_predicates)))
+        position = match.end()
+    return steps
+
+
+def _apply_predicate(nodes: list[UINode], predicate: str) -> list[UINode]:
+    predicate = predicate.strip()
+    if predicate.isdigit():
+        position = int(predicate)
+        return [nodes[position - 1]] if 0 < position <= len(nodes) else []
+    conditions = [_parse_condition(part) for part in _split_and(predicate)]
+    return [node for node in nodes if all(check(node) for check in conditions)]
+
+
+def _split_and(predicate: str) -> list[str]:
+    """Split ``predicate`` on ``and`` outside quoted values."""
+    parts = [""]
+    for token in _AND_TOKENS.findall(predicate):
+        if token[0] not in "'\"" and token.strip() == "and":
+            parts.append("")
+        else:
+            parts[-1] += token
+    return parts
+
+
+def _parse_condition(condition: str) -> Any:
+    match = _CONDITION_PATTERN.fullmatch(condition)
+    if match is None:
+        raise ValueError(f"Unsupported XPath predicate: {condition!r}")
+    attr = match.group("attr") or match.group("fattr")
+    field = _XML_ATTRIBUTES.get(attr)
+    if field is None:
+        raise ValueError(f"Unsupported XPath attribute: @{attr}")
+
+    def as_text(node: UINode) -> str:
+        value = getattr(node, field)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if field == "bounds":
+            return "[{},{}][{},{}]".format(*value)
+        return str(value)
+
+    func = match.group("func")
+    if func is None:
+        expected = match.group("value")
+        return lambda node: as_text(node) == expected
+    expected = match.group("fvalue")
+    if func == "contains":
+        return lambda node: expected in as_text(node)
+    return lambda node: as_text(node).startswith(expected)
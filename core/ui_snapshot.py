@@ -0,0 +1,181 @@
+"""Capture UI hierarchy + screenshot pairs straight into a content-addressed store.
+
+Replaces the ``adb shell uiautomator dump`` / ``adb pull`` round trips of
+``scripts/take_ui_snapshot.sh``: both artefacts are streamed over adb into
+memory, captured in parallel, and written once per distinct content.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import adbutils
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parents[2] / "ui_snapshots"
+
+_HIERARCHY_END = b"</hierarchy>"
+
+
+@dataclass(frozen=True)
+class UISnapshot:
+    serial: str
+    name: str
+    hierarchy_digest: str
+    screenshot_digest: str
+    hierarchy_path: str
+    screenshot_path: str
+    captured_at: float
+
+
+def capture_hierarchy(device: Any) -> bytes:
+    """
+    Dump the hierarchy to stdout instead of ``/sdcard`` and return the XML bytes.
+
+    This stays on ``shell:``: dumping to ``/dev/tty`` needs the terminal, and
+    XML survives a PTY's line-ending rewrite.
+    """
+    output = device.shell("uiautomator dump /dev/tty", encoding=None)
+    end = output.rfind(_HIERARCHY_END)
+    if end < 0:
+        raise RuntimeError(f"uiautomator dump on '{device.serial}' returned no hierarchy.")
+    # Drop the trailing "UI hierchary dumped to: /dev/tty" status line.
+    return output[: end + len(_HIERARCHY_END)]
+
+
+def exec_out(device: Any, command: str) -> bytes:
+    """
+    Raw stdout of ``command``, like ``adb exec-out``.
+
+    The ``shell:`` service may run the command on a PTY that rewrites ``\n`` as
+    ``\r\n`` (older devices and adb servers without shell v2), which corrupts
+    binary output. ``exec:`` never does. Devices without ``open_transport``
+    (simulated ones) fall back to ``shell``.
+    """
+    if not hasattr(device, "open_transport"):
+        return device.shell(command, encoding=None)
+    connection = device.open_transport()
+    try:
+        connection.send_command(f"exec:{command}")
+        connection.check_okay()
+        return connection.read_until_close(encoding=None)
+    finally:
+        connection.close()
+
+
+def capture_screenshot(device: Any) -> bytes:
+    """Return a PNG screenshot streamed from ``screencap -p`` over ``exec:``."""
+    return exec_out(device, "screencap -p")
+
+
+def capture(device: Any) -> tuple[bytes, bytes]:
+    """Capture hierarchy and screenshot of one ``adbutils`` device concurrently."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        hierarchy = pool.submit(capture_hierarchy, device)
+        screenshot = pool.submit(capture_screenshot, device)
+        return hierarchy.result(), screenshot.result()
+
+
+class SnapshotStore:
+    """
+    Files snapshots under ``root`` with identical content stored once.
+
+    Blobs live in ``objects/<aa>/<sha256>.<ext>``; each snapshot gets
+    ``<serial>/<name>.xml``/``.png`` hard links to its blobs plus a
+    ``<name>.json`` record with the digests.
+    """
+
+    def __init__(self, root: str | os.PathLike[str] = DEFAULT_OUTPUT_DIR) -> None:
+        self.root = Path(root)
+
+    def put(self, data: bytes, extension: str) -> tuple[str, Path]:
+        """Store ``data`` if new; returns its digest and blob path."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.root / "objects" / digest[:2] / f"{digest}.{extension}"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        return digest, path
+
+    def save(self, serial: str, name: str, hierarchy: bytes, screenshot: bytes) -> UISnapshot:
+        hierarchy_digest, hierarchy_blob = self.put(hierarchy, "xml")
+        screenshot_digest, screenshot_blob = self.put(screenshot, "png")
+        directory = self.root / serial.replace(os.sep, "_")
+        directory.mkdir(parents=True, exist_ok=True)
+        hierarchy_path = self._link(hierarchy_blob, directory / f"{name}.xml")
+        screenshot_path = self._link(screenshot_blob, directory / f"{name}.png")
+        snapshot = UISnapshot(
+            serial=serial,
+            name=name,
+            hierarchy_digest=hierarchy_digest,
+            screenshot_digest=screenshot_digest,
+            hierarchy_path=str(hierarchy_path),
+            screenshot_path=str(screenshot_path),
+            captured_at=time.time(),
+        )
+        (directory / f"{name}.json").write_text(
+            json.dumps(asdict(snapshot), indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        return snapshot
+
+    @staticmethod
+    def _link(blob: Path, target: Path) -> Path:
+        target.unlink(missing_ok=True)
+        try:
+            os.link(blob, target)
+        except OSError:
+            target.write_bytes(blob.read_bytes())
+        return target
+
+
+def take_snapshot(device: Any, store: SnapshotStore, name: str) -> UISnapshot:
+    """Capture ``device`` and save it as ``name``."""
+    hierarchy, screenshot = capture(device)
+    return store.save(device.serial, name, hierarchy, screenshot)
+
+
+def take_snapshots(
+    store: SnapshotStore,
+    name: str,
+    devices: Optional[Sequence[Any]] = None,
+    max_workers: int = 8,
+) -> list[UISnapshot]:
+    """Snapshot ``devices`` (default: every adb device) in parallel."""
+    if devices is None:
+        devices = adbutils.adb.device_list()
+    if not devices:
+        raise RuntimeError("No connected Android devices found.")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(devices))) as pool:
+        return list(pool.map(lambda device: take_snapshot(device, store, name), devices))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Capture UI hierarchy and screenshot snapshots.")
+    parser.add_argument("name", help="Snapshot name, e.g. home_screen.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_DIR, help="Store directory.")
+    parser.add_argument("--serial", action="append", default=[], help="Device serial (repeatable).")
+    parser.add_argument("--all", action="store_true", help="Snapshot every connected device.")
+    args = parser.parse_args(argv)
+
+    if args.serial:
+        devices = [adbutils.adb.device(serial=serial) for serial in args.serial]
+    else:
+        devices = adbutils.adb.device_list()
+        if not args.all:
+            devices = devices[:1]
+    for snapshot in take_snapshots(SnapshotStore(args.output), args.name, devices):
+        print(f"Saved {snapshot.hierarchy_path} and {snapshot.screenshot_path}")
+
+
+if __name__ == "__main__":
+    main()
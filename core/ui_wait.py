@@ -0,0 +1,110 @@
+"""Adaptive waits that return as soon as the UI is ready instead of fixed sleeps."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class WaitResult:
+    """Outcome of a wait: whether the condition held and how long it took."""
+
+    satisfied: bool
+    elapsed: float
+    polls: int
+
+    def __bool__(self) -> bool:
+        return self.satisfied
+
+
+def wait_until(
+    predicate: Callable[[], bool],
+    timeout: float = 5.0,
+    interval: float = 0.1,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> WaitResult:
+    """Poll ``predicate`` until it returns true or ``timeout`` seconds pass."""
+    started = clock()
+    deadline = started + timeout
+    polls = 0
+    while True:
+        polls += 1
+        if predicate():
+            return WaitResult(True, clock() - started, polls)
+        now = clock()
+        if now >= deadline:
+            return WaitResult(False, now - started, polls)
+        sleep(min(interval, deadline - now))
+
+
+def hierarchy_signal(device: Any) -> str:
+    """Fingerprint of the full UI hierarchy dump."""
+    return hashlib.sha1(device.dump_hierarchy().encode("utf-8")).hexdigest()
+
+
+def package_signal(device: Any) -> str | None:
+    """Foreground package name."""
+    return device.info.get("currentPackageName")
+
+
+class ScreenshotSignal:
+    """Downscaled grayscale screenshot; frames within ``tolerance`` count as equal."""
+
+    def __init__(self, size: tuple[int, int] = (32, 32), tolerance: float = 2.0) -> None:
+        self.size = size
+        self.tolerance = tolerance
+
+    def __call__(self, device: Any) -> bytes:
+        return device.screenshot().convert("L").resize(self.size).tobytes()
+
+    def same(self, previous: bytes, current: bytes) -> bool:
+        """Mean absolute pixel difference is within ``tolerance`` (0-255 scale)."""
+        if len(previous) != len(current):
+            return False
+        diff = sum(abs(a - b) for a, b in zip(previous, current))
+        return diff / max(len(current), 1) <= self.tolerance
+
+
+def wait_for_settle(
+    device: Any,
+    signals: Sequence[Callable[[Any], Hashable]] = (package_signal, hierarchy_signal),
+    timeout: float = 5.0,
+    interval: float = 0.2,
+    stable_polls: int = 2,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> WaitResult:
+    """
+    Wait until every signal reports the same value for ``stable_polls`` polls in a row.
+
+    Signals are cheap device probes (:func:`package_signal`,
+    :func:`hierarchy_signal`, :class:`ScreenshotSignal`, or any callable
+    taking the device); a signal may define ``same(previous, current)`` to
+    compare fuzzily. ``stable_polls`` counts consecutive polls that matched
+    the sample before them.
+    """
+    previous: list[Hashable] | None = None
+    unchanged = 0
+
+    def settled() -> bool:
+        nonlocal previous, unchanged
+        current = [signal(device) for signal in signals]
+        if previous is not None and all(
+            getattr(signal, "same", _equal)(before, after)
+            for signal, before, after in zip(signals, previous, current)
+        ):
+            unchanged += 1
+        else:
+            unchanged = 0
+        previous = current
+        return unchanged >= stable_polls
+
+    return wait_until(settled, timeout=timeout, interval=interval, clock=clock, sleep=sleep)
+
+
+def _equal(previous: Hashable, current: Hashable) -> bool:
+    return previous == current
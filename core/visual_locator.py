@@ -0,0 +1,447 @@
+"""Locate UI elements the hierarchy cannot see by matching image templates.
+
+Matching is normalized cross-correlation computed with NumPy FFTs on a coarse
+pyramid level and refined at full resolution around the best candidates. On a
+1080x2400 screenshot three templates cost roughly 40-100 ms of CPU at one
+scale and up to about 200 ms at three, depending on the machine; converting the
+screenshot to grayscale is the largest single share. Pass a ``region`` to
+convert and search only that part of the screen; the cost shrinks with its area.
+
+NumPy is an optional dependency (``pip install workflow_core[vision]``) and is
+only imported when a locator is used.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Region = tuple[int, int, int, int]  # left, top, right, bottom in screenshot pixels
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "numpy is required for visual matching. "
+            "Install it with `pip install workflow_core[vision]`."
+        ) from exc
+    return numpy
+
+
+@dataclass(frozen=True)
+class VisualMatch:
+    name: str
+    left: int
+    top: int
+    width: int
+    height: int
+    scale: float
+    score: float
+
+    @property
+    def center(self) -> tuple[int, int]:
+        return self.left + self.width // 2, self.top + self.height // 2
+
+
+@dataclass(frozen=True)
+class _Template:
+    """One scaled template at one pyramid level, ready for correlation."""
+
+    zero_mean: np.ndarray
+    norm: float
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.zero_mean.shape
+
+
+class ScreenFrame:
+    """
+    A grayscale screenshot with its pyramid, FFTs and integral images cached.
+
+    Build one per screenshot with :meth:`VisualLocator.frame` and pass it to
+    every ``locate`` call for that screen. Level 0 may live in a buffer the
+    locator reuses, so a frame is only valid until the locator converts the
+    next screenshot.
+    """
+
+    def __init__(self, gray: np.ndarray, offset: tuple[int, int] = (0, 0)) -> None:
+        self._np = _numpy()
+        self.offset = offset
+        self._levels = [gray]
+        self._spectra: dict[int, Any] = {}
+        self._integrals: dict[int, tuple[Any, Any]] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._levels[0].shape
+
+    def level(self, index: int) -> np.ndarray:
+        while len(self._levels) <= index:
+            self._levels.append(_downsample(self._np, self._levels[-1]))
+        return self._levels[index]
+
+    def spectrum(self, index: int) -> np.ndarray:
+        if index not in self._spectra:
+            self._spectra[index] = self._np.fft.rfft2(self.level(index))
+        return self._spectra[index]
+
+    def integrals(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        if index not in self._integrals:
+            self._integrals[index] = _integral_images(self._np, self.level(index))
+        return self._integrals[index]
+
+    def crop(self, region: Region) -> "ScreenFrame":
+        left, top, right, bottom = _clip_region(region, self.shape)
+        return ScreenFrame(
+            self._levels[0][top:bottom, left:right],
+            offset=(self.offset[0] + left, self.offset[1] + top),
+        )
+
+
+class VisualLocator:
+    """
+    Cache of named templates matched against screenshots.
+
+    Each template is stored per scale as a pyramid of zero-mean arrays; their
+    FFTs are cached per screenshot size, so steady-state matching only pays
+    for one screenshot FFT per pyramid level plus a small refinement window.
+    A locator is not thread-safe; use one per worker.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        scales: Sequence[float] = (1.0,),
+        min_template_side: int = 12,
+        max_level: int = 3,
+        candidates: int = 3,
+    ) -> None:
+        self._np = _numpy()
+        self.threshold = threshold
+        self.scales = tuple(scales)
+        self.min_template_side = min_template_side
+        self.max_level = max_level
+        self.candidates = candidates
+        self._sources: dict[str, np.ndarray] = {}
+        # (name, scale) -> pyramid of prepared templates, level 0 first.
+        self._pyramids: dict[tuple[str, float], list[_Template]] = {}
+        # (name, scale, level, frame level shape) -> conjugate template spectrum.
+        self._spectra: dict[tuple[str, float, int, tuple[int, int]], np.ndarray] = {}
+        self._gray_buffer: Optional[np.ndarray] = None
+        self._scratch_buffer: Optional[np.ndarray] = None
+
+    def add_template(self, name: str, image: Any) -> None:
+        """Register ``image`` (path, PIL image or array) under ``name``."""
+        self._sources[name] = self._to_gray(image)[0].copy()
+        for key in [key for key in self._pyramids if key[0] == name]:
+            del self._pyramids[key]
+        for key in [key for key in self._spectra if key[0] == name]:
+            del self._spectra[key]
+
+    def load_templates(self, directory: str | os.PathLike[str]) -> list[str]:
+        """Register every ``*.png`` in ``directory`` under its file stem."""
+        names = []
+        for path in sorted(Path(directory).glob("*.png")):
+            self.add_template(path.stem, path)
+            names.append(path.stem)
+        return names
+
+    def templates(self) -> list[str]:
+        return sorted(self._sources)
+
+    def frame(self, screenshot: Any, region: Optional[Region] = None) -> ScreenFrame:
+        """
+        Convert ``screenshot`` once for any number of ``locate`` calls.
+
+        With ``region``, only that part of a raw screenshot is converted.
+        """
+        if isinstance(screenshot, ScreenFrame):
+            return screenshot if region is None else screenshot.crop(region)
+        gray, offset = self._to_gray(screenshot, reuse_buffer=True, region=region)
+        return ScreenFrame(gray, offset=offset)
+
+    def locate(
+        self,
+        screenshot: Any,
+        name: str,
+        region: Optional[Region] = None,
+        threshold: Optional[float] = None,
+    ) -> Optional[VisualMatch]:
+        """Best match of template ``name`` scoring at least ``threshold``, else ``None``."""
+        if name not in self._sources:
+            raise ValueError(f"No template registered under '{name}'.")
+        frame = self.frame(screenshot, region)
+        # Pool coarse hits over all scales and refine only the strongest few.
+        hits: list[tuple[float, float, int, int, int]] = []
+        for scale in self.scales:
+            hits.extend(self._coarse_hits(frame, name, scale))
+        hits.sort(reverse=True)
+        # Coarse scores are blurred but ordered; hits far below the best are not worth refining.
+        shortlist = [hit for hit in hits[: self.candidates] if hit[0] >= hits[0][0] - 0.1]
+        best: Optional[VisualMatch] = None
+        for score, scale, level, y, x in shortlist:
+            full = self._pyramid(name, scale)[0]
+            if level == 0:
+                match = self._match(frame, name, scale, full, y, x, score)
+            else:
+                match = self._refine(frame, name, scale, full, y, x, radius=2**level)
+            if best is None or match.score > best.score:
+                best = match
+        limit = self.threshold if threshold is None else threshold
+        if best is None or best.score < limit:
+            return None
+        return best
+
+    def locate_all(
+        self,
+        screenshot: Any,
+        names: Optional[Iterable[str]] = None,
+        region: Optional[Region] = None,
+    ) -> dict[str, Optional[VisualMatch]]:
+        """Locate several templates against one screenshot conversion."""
+        frame = self.frame(screenshot, region)
+        return {
+            name: self.locate(frame, name)
+            for name in (self.templates() if names is None else names)
+        }
+
+    def _coarse_hits(
+        self, frame: ScreenFrame, name: str, scale: float
+    ) -> list[tuple[float, float, int, int, int]]:
+        """Top ``(score, scale, level, y, x)`` placements on the coarsest usable level."""
+        np = self._np
+        pyramid = self._pyramid(name, scale)
+        full = pyramid[0]
+        frame_height, frame_width = frame.shape
+        if full.shape[0] > frame_height or full.shape[1] > frame_width:
+            return []
+
+        level = self._level_for(full.shape)
+        template = pyramid[level]
+        image = frame.level(level)
+        if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+            level, template, image = 0, full, frame.level(0)
+        spectrum_key = (name, scale, level, image.shape)
+        template_spectrum = self._spectra.get(spectrum_key)
+        if template_spectrum is None:
+            template_spectrum = self._spectra[spectrum_key] = np.conj(
+                np.fft.rfft2(template.zero_mean, s=image.shape)
+            )
+        scores = _ncc_map(
+            np, frame.spectrum(level) * template_spectrum, image.shape, frame.integrals(level), template
+        )
+        count = 1 if level == 0 else min(self.candidates, scores.size)
+        flat = np.argpartition(scores.ravel(), -count)[-count:]
+        factor = 2**level
+        return [
+            (float(scores[y, x]), scale, level, int(y) * factor, int(x) * factor)
+            for y, x in zip(*np.unravel_index(flat, scores.shape))
+        ]
+
+    def _refine(
+        self,
+        frame: ScreenFrame,
+        name: str,
+        scale: float,
+        template: _Template,
+        y: int,
+        x: int,
+        radius: int,
+    ) -> VisualMatch:
+        """Exact NCC in a small full-resolution window around a coarse hit."""
+        np = self._np
+        image = frame.level(0)
+        height, width = template.shape
+        top = max(0, y - radius)
+        left = max(0, x - radius)
+        bottom = min(image.shape[0] - height, y + radius)
+        right = min(image.shape[1] - width, x + radius)
+        patch = image[top : bottom + height, left : right + width]
+        product = np.fft.rfft2(patch) * np.conj(np.fft.rfft2(template.zero_mean, s=patch.shape))
+        scores = _ncc_map(np, product, patch.shape, _integral_images(np, patch), template)
+        dy, dx = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return self._match(
+            frame, name, scale, template, top + int(dy), left + int(dx), float(scores[dy, dx])
+        )
+
+    @staticmethod
+    def _match(
+        frame: ScreenFrame, name: str, scale: float, template: _Template, y: int, x: int, score: float
+    ) -> VisualMatch:
+        height, width = template.shape
+        return VisualMatch(
+            name=name,
+            left=frame.offset[0] + x,
+            top=frame.offset[1] + y,
+            width=width,
+            height=height,
+            scale=scale,
+            score=score,
+        )
+
+    def _level_for(self, shape: tuple[int, int]) -> int:
+        level = 0
+        while level < self.max_level and min(shape) // 2 ** (level + 1) >= self.min_template_side:
+            level += 1
+        return level
+
+    def _pyramid(self, name: str, scale: float) -> list[_Template]:
+        pyramid = self._pyramids.get((name, scale))
+        if pyramid is None:
+            np = self._np
+            source = self._sources[name]
+            if scale != 1.0:
+                source = _resize(
+                    np,
+                    source,
+                    max(1, round(source.shape[0] * scale)),
+                    max(1, round(source.shape[1] * scale)),
+                )
+            levels = [source]
+            for _ in range(self.max_level):
+                if min(levels[-1].shape) < 2:
+                    break
+                levels.append(_downsample(np, levels[-1]))
+            pyramid = [_prepare(np, level) for level in levels]
+            self._pyramids[(name, scale)] = pyramid
+        return pyramid
+
+    def _scratch(self, shape: tuple[int, int]) -> np.ndarray:
+        if self._scratch_buffer is None or self._scratch_buffer.shape != shape:
+            self._scratch_buffer = self._np.empty(shape, dtype=self._np.float32)
+        return self._scratch_buffer
+
+    def _to_gray(
+        self, image: Any, reuse_buffer: bool = False, region: Optional[Region] = None
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """Grayscale float32 copy of ``image`` (or of ``region`` of it) and its offset."""
+        np = self._np
+        if isinstance(image, (str, os.PathLike)):
+            from PIL import Image
+
+            with Image.open(image) as opened:
+                image = opened.convert("L")
+        offset = (0, 0)
+        if hasattr(image, "convert"):
+            if region is not None:
+                # Crop before converting so only the searched pixels are touched.
+                left, top, right, bottom = _clip_region(region, (image.height, image.width))
+                image, offset = image.crop((left, top, right, bottom)), (left, top)
+                region = None
+            image = np.asarray(image.convert("L"))
+        array = np.asarray(image)
+        if array.ndim not in (2, 3):
+            raise ValueError(f"Expected a 2D or 3D image array, got shape {array.shape}.")
+        if region is not None:
+            left, top, right, bottom = _clip_region(region, array.shape[:2])
+            array, offset = array[top:bottom, left:right], (left, top)
+        shape = array.shape[:2]
+        if reuse_buffer:
+            if self._gray_buffer is None or self._gray_buffer.shape != shape:
+                self._gray_buffer = np.empty(shape, dtype=np.float32)
+            gray = self._gray_buffer
+        else:
+            gray = np.empty(shape, dtype=np.float32)
+        if array.ndim == 2:
+            np.copyto(gray, array, casting="unsafe")
+        else:
+            # ITU-R BT.601 luma; channel-by-channel so only one scratch plane is needed.
+            scratch = np.empty_like(gray) if not reuse_buffer else self._scratch(shape)
+            np.multiply(array[..., 0], np.float32(0.299), out=gray)
+            np.multiply(array[..., 1], np.float32(0.587), out=scratch)
+            gray += scratch
+            np.multiply(array[..., 2], np.float32(0.114), out=scratch)
+            gray += scratch
+        return gray, offset
+
+
+def _clip_region(region: Region, shape: tuple[int, int]) -> Region:
+    left, top, right, bottom = region
+    height, width = shape
+    left, top = max(0, left), max(0, top)
+    right, bottom = min(width, right), min(height, bottom)
+    if right <= left or bottom <= top:
+        raise ValueError(f"Region {region} does not overlap the {width}x{height} screenshot.")
+    return left, top, right, bottom
+
+
+def _prepare(np: Any, image: np.ndarray) -> _Template:
+    zero_mean = (image - image.mean()).astype(np.float32)
+    return _Template(zero_mean=zero_mean, norm=float(np.sqrt(np.square(zero_mean, dtype=np.float64).sum())))
+
+
+def _downsample(np: Any, image: np.ndarray) -> np.ndarray:
+    """Halve both dimensions by averaging 2x2 blocks."""
+    height, width = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    result = np.add(image[0:height:2, 0:width:2], image[1:height:2, 0:width:2], dtype=np.float32)
+    result += image[0:height:2, 1:width:2]
+    result += image[1:height:2, 1:width:2]
+    result *= 0.25
+    return result
+
+
+def _resize(np: Any, image: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Bilinear resize with pixel-centre alignment."""
+
+    def axis(size: int, target: int) -> tuple[Any, Any, Any]:
+        coords = np.clip((np.arange(target) + 0.5) * size / target - 0.5, 0, size - 1)
+        low = np.floor(coords).astype(np.intp)
+        high = np.minimum(low + 1, size - 1)
+        return low, high, (coords - low).astype(np.float32)
+
+    y0, y1, wy = axis(image.shape[0], height)
+    x0, x1, wx = axis(image.shape[1], width)
+    top = image[y0][:, x0] * (1 - wx) + image[y0][:, x1] * wx
+    bottom = image[y1][:, x0] * (1 - wx) + image[y1][:, x1] * wx
+    return (top * (1 - wy)[:, None] + bottom * wy[:, None]).astype(np.float32)
+
+
+def _integral_images(np: Any, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Zero-padded summed-area tables of the image and its square (float64)."""
+    padded = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=np.float64)
+    squared = np.zeros_like(padded)
+    np.cumsum(np.cumsum(image, axis=0, dtype=np.float64), axis=1, out=padded[1:, 1:])
+    np.cumsum(np.cumsum(np.square(image, dtype=np.float64), axis=0), axis=1, out=squared[1:, 1:])
+    return padded, squared
+
+
+def _ncc_map(
+    np: Any,
+    product: np.ndarray,
+    image_shape: tuple[int, int],
+    integrals: tuple[np.ndarray, np.ndarray],
+    template: _Template,
+) -> np.ndarray:
+    """Normalized cross-correlation for every placement of ``template`` in the image."""
+    height, width = template.shape
+    rows, cols = image_shape[0] - height + 1, image_shape[1] - width + 1
+    # The template is zero-mean, so the raw correlation is already the NCC numerator.
+    numerator = np.fft.irfft2(product, s=image_shape)[:rows, :cols]
+    sums, squares = integrals
+
+    def window(table: np.ndarray) -> np.ndarray:
+        return (
+            table[height : height + rows, width : width + cols]
+            - table[:rows, width : width + cols]
+            - table[height : height + rows, :cols]
+            + table[:rows, :cols]
+        )
+
+    area = height * width
+    window_sum = window(sums)
+    variance = window(squares) - window_sum * window_sum / area
+    denominator = np.sqrt(np.maximum(variance, 0.0)) * template.norm
+    # Flat windows (or a flat template) carry no signal; score them 0.
+    flat = denominator < 1e-6 * max(area, 1)
+    denominator[flat] = 1.0
+    scores = numerator / denominator
+    scores[flat] = 0.0
+    return scores
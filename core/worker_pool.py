@@ -0,0 +1,290 @@
+"""Pre-imported worker processes that each run one workflow at a time."""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import queue
+import resource
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Optional, Sequence
+
+from .workflow_config import WorkflowConfig
+from .workflow_fleet import WorkflowRunner, run_workflow
+from .workflow_ipc import WorkflowRunServer, default_address, portable_config, portable_result
+from .workflow_registry import WorkflowRegistry
+from .workflow_types import WorkflowActionResult
+
+# Heavy third-party imports every run pays for; missing ones are skipped by the forkserver.
+_THIRD_PARTY_PRELOAD = ("uiautomator2", "adbutils", "twilio", "tenacity", "lxml.etree")
+
+# How often a caller waiting for an idle worker rechecks whether the pool closed.
+_IDLE_POLL_SECONDS = 1.0
+# Put on the idle queue by close() to wake callers waiting for a worker.
+_CLOSED = None
+
+
+def default_preload() -> list[str]:
+    """This module (and so the orchestrator), common dependencies and every registered workflow."""
+    workflow_modules = {
+        workflow_cls.__module__
+        for name in WorkflowRegistry.names()
+        if (workflow_cls := WorkflowRegistry.get(name)) is not None
+    }
+    return [__name__, *_THIRD_PARTY_PRELOAD, *sorted(workflow_modules)]
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, in KiB on Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _worker_main(
+    connection: Connection,
+    runner: WorkflowRunner,
+    max_runs: int,
+    max_rss_bytes: Optional[int],
+) -> None:
+    """Serve runs from ``connection`` until told to stop or due for recycling."""
+    runs = 0
+    with connection:
+        while True:
+            try:
+                config = connection.recv()
+            except EOFError:
+                return
+            if config is None:
+                return
+            try:
+                response: tuple[str, Any] = ("ok", portable_result(runner(config)))
+            except Exception as exc:
+                response = ("error", RuntimeError(repr(exc)))
+            runs += 1
+            retire = runs >= max_runs or (
+                max_rss_bytes is not None and _rss_bytes() >= max_rss_bytes
+            )
+            connection.send((*response, retire))
+            if retire:
+                return
+
+
+class _Worker:
+    def __init__(self, process: Any, connection: Connection) -> None:
+        self.process = process
+        self.connection = connection
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.connection.send(None)
+        except (OSError, EOFError):
+            pass
+        self.connection.close()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+
+
+class WorkerPool:
+    """
+    ``size`` worker processes forked from a forkserver that has already
+    imported ``preload`` (by default the orchestrator, uiautomator2, adbutils,
+    twilio and every registered workflow), so a run costs a fork rather than
+    an interpreter start.
+
+    Each run executes in its own worker, so a crash or leak stays in that
+    process. Workers are replaced after ``max_runs`` runs or once their RSS
+    reaches ``max_rss_mb``, and a worker that dies mid-run yields a failed
+    result instead of taking the pool down. :meth:`run` is thread-safe and
+    usable as a :class:`WorkflowRunServer` runner.
+
+    There is one forkserver per process, so ``preload`` only takes effect for
+    the first pool that starts it.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_runs: int = 50,
+        max_rss_mb: Optional[float] = None,
+        preload: Optional[Sequence[str]] = None,
+        runner: WorkflowRunner = run_workflow,
+        start_method: str = "forkserver",
+    ) -> None:
+        if size < 1 or max_runs < 1:
+            raise ValueError("size and max_runs must be >= 1")
+        self.size = size
+        self.max_runs = max_runs
+        self.max_rss_bytes = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self._runner = runner
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            self._context.set_forkserver_preload(
+                list(preload) if preload is not None else default_preload()
+            )
+        self._idle: queue.Queue[Optional[_Worker]] = queue.Queue()
+        self._workers: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        # Total processes started, including replacements.
+        self.spawned = 0
+
+    def start(self) -> "WorkerPool":
+        with self._start_lock:
+            if self._closed:
+                raise RuntimeError("Worker pool is closed.")
+            with self._lock:
+                missing = self.size - len(self._workers)
+            for _ in range(missing):
+                self._idle.put(self._spawn())
+            self._started = True
+        return self
+
+    def run(self, config: WorkflowConfig) -> WorkflowActionResult:
+        """
+        Run ``config`` in the next idle worker and return its result.
+
+        Starts the pool on first use; raises ``RuntimeError`` once it is closed,
+        including in callers still waiting for a worker.
+        """
+        if not self._started:
+            self.start()
+        worker = self._next_idle()
+        try:
+            worker.connection.send(portable_config(config))
+            status, payload, retire = worker.connection.recv()
+        except (OSError, EOFError) as exc:
+            worker.process.join(5)
+            self._replace(worker)
+            return WorkflowActionResult(
+                workflow_name=config.workflow_name,
+                action_name=config.action_name,
+                success=False,
+                error=RuntimeError(
+                    f"Worker {worker.process.pid} exited during the run "
+                    f"(exit code {worker.process.exitcode}): {exc!r}"
+                ),
+                device_id=config.device_id,
+            )
+        if retire or self._closed:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        if status != "ok":
+            raise payload
+        return payload
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop idle workers now; runs in progress get ``timeout`` seconds to finish."""
+        with self._lock:
+            self._closed = True
+        self._retire_idle()
+        # Busy workers are retired by the run that holds them once it finishes.
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._workers:
+                    return
+            time.sleep(0.05)
+            # A run that finished just before close() may have requeued its worker.
+            self._retire_idle()
+        with self._lock:
+            stuck = list(self._workers)
+        for worker in stuck:
+            # Terminating the process fails the waiting run with EOFError, which
+            # then retires the worker; closing its pipe here would race that run.
+            worker.process.terminate()
+
+    def _retire_idle(self) -> None:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not _CLOSED:
+                self._retire(worker)
+        self._idle.put(_CLOSED)
+
+    def _next_idle(self) -> _Worker:
+        while True:
+            if self._closed:
+                raise RuntimeError("Worker pool is closed.")
+            try:
+                worker = self._idle.get(timeout=_IDLE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if worker is _CLOSED:
+                # Pass the wake-up on to the next waiter.
+                self._idle.put(_CLOSED)
+                raise RuntimeError("Worker pool is closed.")
+            if self._closed:
+                self._retire(worker)
+                raise RuntimeError("Worker pool is closed.")
+            return worker
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _spawn(self) -> _Worker:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child, self._runner, self.max_runs, self.max_rss_bytes),
+            name="workflow-worker",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        worker = _Worker(process, parent)
+        with self._lock:
+            self._workers.add(worker)
+            self.spawned += 1
+        return worker
+
+    def _retire(self, worker: _Worker) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+
+    def _replace(self, worker: _Worker) -> None:
+        self._retire(worker)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve submissions from a pool of pre-imported worker processes."""
+    parser = argparse.ArgumentParser(description="Run workflows in pre-imported worker processes.")
+    parser.add_argument("--address", default=default_address(), help="Unix socket path.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-runs", type=int, default=50, help="Recycle a worker after N runs.")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help="Recycle above this RSS.")
+    args = parser.parse_args(argv)
+
+    pool = WorkerPool(size=args.workers, max_runs=args.max_runs, max_rss_mb=args.max_rss_mb)
+    pool.start()
+    print(f"Started {args.workers} workflow worker(s).")
+    server = WorkflowRunServer(pool.run, address=args.address, max_workers=args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
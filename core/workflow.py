@@ -2,110 +2,660 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import os
 import time
 from functools import wraps
 import random
+from typing import Any, Callable, ContextManager
 
 import uiautomator2 as u2
 import adbutils
 
 from ..messaging.messaging import send
+from ..messaging.outbox import send_async
+from .device_farm import DeviceBackend, default_device_backend
+from .device_lease import DeviceLease, DeviceLeaseManager, default_lease_dir
+from .device_selection import DeviceSelector, default_selection_policy, default_selector
+from .device_state import DeviceStateCache
+from .events import DEBUG, ERROR, INFO, WARNING, Message, bind, emit, event_log
+from .gesture_macro import GestureRecorder
+from .run_history import default_history_path, run_history
+from .ui_snapshot import SnapshotStore, take_snapshot
+from .ui_wait import wait_until
+from .workflow_async import resolve_outcome, run_blocking
 from .workflow_config import WorkflowConfig
 from .workflow_factory import WorkflowFactory
-from .workflow_types import WorkflowActionName, WorkflowActionResult, WorkflowName
+from .workflow_interface import WorkflowInterface
+from .workflow_steps import (
+    StepRunner,
+    WorkflowStep,
+    checkpoint_store,
+    circuit_breaker,
+    default_checkpoint_dir,
+)
+from .workflow_timing import WorkflowTimer
+from .workflow_types import (
+    AsyncWorkflowActionHandler,
+    WorkflowActionName,
+    WorkflowActionResult,
+    WorkflowName,
+)
 class Workflow:
     """High-level orchestrator for automating an Android application."""
 
     def __init__(self, config: WorkflowConfig) -> None:
         self.config: WorkflowConfig = config
-        device_id = config.device_id or self._get_first_connected_device_id()
+        self.lease: DeviceLease | None = self._acquire_lease()
+        if self.lease is not None:
+            device_id = self.lease.serial
+        else:
+            device_id = config.device_id or self._select_device_id()
+        self.device_id: str = device_id
         if config.device_id:
-            print(f"Connecting to explicitly provided device '{device_id}'.")
-        self.device = u2.connect(device_id)
+            self._event(
+                "device.connecting",
+                lambda: f"Connecting to explicitly provided device '{device_id}'.",
+            )
+        try:
+            backend = self._device_backend()
+            if config.device_pool is not None:
+                self.device = config.device_pool.get(device_id)
+            elif backend is not None:
+                self.device = backend.connect(device_id)
+            else:
+                self.device = u2.connect(device_id)
+        except Exception:
+            self.close()
+            raise
         self.config.device = self.device
-        print(f"Device connection established for '{device_id}'.")
+        self.device_state = DeviceStateCache(self.device, ttl_seconds=config.device_state_ttl)
+        self.config.device_state = self.device_state
+        self._event("device.connected", lambda: f"Device connection established for '{device_id}'.")
 
     @staticmethod 
     def _random_delay():
         """
         Decorator that delays the execution of a function by a random number
         of minutes between 1 minute and max_minutes (inclusive).
+
+        This blocks the calling thread; use ``WorkflowScheduler`` to stagger
+        many runs from one process instead.
         """
         def decorator(func):
             @wraps(func)
             def wrapper(self, *args, **kwargs):
-                delay_minutes_max = getattr(self.config, "delay_minutes", 0)
-                if delay_minutes_max <= 0:
-                    print(f"Delay bypassed for '{func.__name__}'")
-                else:
-                    delay_minutes = random.randint(1, delay_minutes_max)
-                    print(f"Delaying '{func.__name__}' for {delay_minutes} minute(s)...")
-                    delay_seconds = delay_minutes * 60
+                delay_seconds = self._delay_seconds(func.__name__)
+                if delay_seconds:
                     time.sleep(delay_seconds)
                 
                 return func(self, *args, **kwargs)
             return wrapper
         return decorator
 
+    def _delay_seconds(self, name: str) -> int:
+        """Pick the random start delay for ``name`` from ``config.delay_minutes``."""
+        delay_minutes_max = getattr(self.config, "delay_minutes", 0)
+        if delay_minutes_max <= 0:
+            self._event("run.delay", lambda: f"Delay bypassed for '{name}'", DEBUG, seconds=0)
+            return 0
+        delay_minutes = random.randint(1, delay_minutes_max)
+        self._event(
+            "run.delay",
+            lambda: f"Delaying '{name}' for {delay_minutes} minute(s)...",
+            seconds=delay_minutes * 60,
+        )
+        return delay_minutes * 60
+
+    @classmethod
+    async def connect_async(cls, config: WorkflowConfig) -> "Workflow":
+        """Lease and connect without blocking the event loop."""
+        return await run_blocking(cls, config)
+
     @_random_delay()
     def run(self) -> WorkflowActionResult:
         """Entry point for the workflow."""
-        workflow_name = self.config.workflow_name
-        action_name = self.config.action_name
+        with self._bind_events():
+            return self._execute()
+
+    def _execute(self) -> WorkflowActionResult:
+        timer, started = self._start_timer()
+        since = time.time()
         success = False
         error = None
+        steps: list[WorkflowActionResult] = []
+        summary = ""
+        recorder = None
 
         try:
-            self._wake_device()
-            print(f"Executing '{workflow_name}:{action_name}'.")
-            workflow = WorkflowFactory.get_workflow(self.config)
-            success = workflow.run(self.config.action_name)
+            with timer.span("wake_device"):
+                self._wake_device()
+            self._event(
+                "run.started",
+                lambda: f"Executing '{self.config.workflow_name}:{self.config.action_name}'.",
+            )
+            recorder = self._start_recording()
+            with timer.span("get_workflow"):
+                workflow = WorkflowFactory.get_workflow(self.config)
+            with timer.span("handler"):
+                success, error, steps, summary = self._dispatch(workflow, timer)
+        except Exception as exc:
+            error = exc
+            self._report_failure(exc)
+        finally:
+            self._stop_recording(recorder, success)
+
+        if not success:
+            self._save_failure_diagnostics(timer, since)
+
+        with timer.span("notify"):
+            self._notifier()(success, self._message(summary), error)
+        return self._result(success, error, steps, timer, started)
+
+    async def run_async(self) -> WorkflowActionResult:
+        """
+        Asyncio twin of :meth:`run` for supervising many devices from one loop.
+
+        Async action handlers are awaited on the loop; sync handlers, device
+        wake-up, snapshots and notification delivery run on the bounded
+        :func:`device_executor`, so a sync-only workflow behaves as in ``run``.
+        """
+        delay_seconds = self._delay_seconds("run_async")
+        if delay_seconds:
+            await asyncio.sleep(delay_seconds)
+        with self._bind_events():
+            return await self._execute_async()
+
+    async def _execute_async(self) -> WorkflowActionResult:
+        timer, started = self._start_timer()
+        since = time.time()
+        success = False
+        error = None
+        steps: list[WorkflowActionResult] = []
+        summary = ""
+        recorder = None
+
+        try:
+            with timer.span("wake_device"):
+                await run_blocking(self._wake_device)
+            self._event(
+                "run.started",
+                lambda: f"Executing '{self.config.workflow_name}:{self.config.action_name}'.",
+            )
+            recorder = self._start_recording()
+            with timer.span("get_workflow"):
+                workflow = await run_blocking(WorkflowFactory.get_workflow, self.config)
+            with timer.span("handler"):
+                success, error, steps, summary = await self._dispatch_async(workflow, timer)
         except Exception as exc:
             error = exc
-            print (f"Workflow '{workflow_name}:{action_name}' failed with exception: {exc!r}")
-            
-        send(success, f"{workflow_name}:{action_name}", error)
+            self._report_failure(exc)
+        finally:
+            self._stop_recording(recorder, success)
+
+        if not success:
+            await run_blocking(self._save_failure_diagnostics, timer, since)
+
+        with timer.span("notify"):
+            await run_blocking(self._notifier(), success, self._message(summary), error)
+        return self._result(success, error, steps, timer, started)
+
+    def _start_timer(self) -> tuple[WorkflowTimer, float]:
+        timer = WorkflowTimer(enabled=self.config.collect_timings)
+        self.config.timer = timer
+        return timer, time.perf_counter()
+
+    def _start_recording(self) -> GestureRecorder | None:
+        if not self.config.record_macro:
+            return None
+        recorder = GestureRecorder(self.device)
+        self.config.device = recorder
+        return recorder
+
+    def _stop_recording(self, recorder: GestureRecorder | None, success: bool) -> None:
+        if recorder is None:
+            return
+        self.config.device = self.device
+        if success:
+            recorder.macro.save(self.config.record_macro)
+            self._event(
+                "macro.recorded",
+                lambda: f"Recorded {len(recorder.macro.steps)} macro step(s) to '{self.config.record_macro}'.",
+                steps=len(recorder.macro.steps),
+            )
+
+    def _report_failure(self, exc: Exception) -> None:
+        self._event(
+            "run.failed",
+            lambda: f"Workflow '{self.config.workflow_name}:{self.config.action_name}' failed with exception: {exc!r}",
+            ERROR,
+            error_class=type(exc).__name__,
+        )
+
+    def _event(self, kind: str, message: Message, level: int = INFO, **fields: Any) -> None:
+        """Emit a run event tagged with this workflow, action and device."""
+        fields.setdefault("device_id", getattr(self, "device_id", None))
+        emit(
+            kind,
+            message,
+            level,
+            workflow=self.config.workflow_name,
+            action=self.config.action_name,
+            **fields,
+        )
+
+    def _bind_events(self) -> ContextManager[None]:
+        """Tag events from code this run calls (steps, messaging) with the run's identity."""
+        return bind(self.config.workflow_name, self.config.action_name, self.device_id)
+
+    def _message(self, summary: str) -> str:
+        return f"{self.config.workflow_name}:{self.config.action_name}{summary}"
+
+    def _notifier(self) -> Callable[[bool, str, Exception | None], None]:
+        return send_async if self.config.async_notifications else send
+
+    def _result(
+        self,
+        success: bool,
+        error: Exception | None,
+        steps: list[WorkflowActionResult],
+        timer: WorkflowTimer,
+        started: float,
+    ) -> WorkflowActionResult:
+        timer.record("total", time.perf_counter() - started)
         
-        return WorkflowActionResult(
-            workflow_name=workflow_name,
-            action_name=action_name,
+        result = WorkflowActionResult(
+            workflow_name=self.config.workflow_name,
+            action_name=self.config.action_name,
             success=success,
             error=error,
-        ) 
+            device_id=self.device_id,
+            timings=timer.timings,
+            steps=steps,
+        )
+        self._record_history(result)
+        return result
+
+    def _record_history(self, result: WorkflowActionResult) -> None:
+        """Append ``result`` to the run history, if one is configured; never fails the run."""
+        path = self.config.history_path or default_history_path()
+        if path is None:
+            return
+        try:
+            run_history(path).record(result)
+        except Exception as exc:
+            self._event(
+                "history.error",
+                lambda: f"Run history could not be updated: {exc!r}",
+                WARNING,
+            )
+
+    def _dispatch(
+        self, workflow: WorkflowInterface, timer: WorkflowTimer
+    ) -> tuple[bool, Exception | None, list[WorkflowActionResult], str]:
+        """Run the configured action, pipeline or steps; returns (success, error, steps, summary)."""
+        action_name = self.config.action_name
+        pipeline = self._resolve_pipeline(workflow)
+        if pipeline is not None:
+            return self._outcome(pipeline, self._run_pipeline(workflow, pipeline, timer))
+        step_plan = self._resolve_steps(workflow, action_name)
+        if step_plan is None:
+            return bool(resolve_outcome(workflow.run(action_name))), None, [], ""
+        runner = self._step_runner(action_name)
+        steps = runner.run(step_plan)
+        names = [WorkflowActionName(step.name) for step in step_plan]
+        return self._outcome(names, steps, resumed=runner.resumed)
+
+    async def _dispatch_async(
+        self, workflow: WorkflowInterface, timer: WorkflowTimer
+    ) -> tuple[bool, Exception | None, list[WorkflowActionResult], str]:
+        pipeline = self._resolve_pipeline(workflow)
+        if pipeline is not None:
+            return self._outcome(pipeline, await self._run_pipeline_async(workflow, pipeline, timer))
+        handler = self._async_handler(workflow, self.config.action_name)
+        if handler is not None:
+            return bool(await handler()), None, [], ""
+        return await run_blocking(self._dispatch, workflow, timer)
+
+    def _outcome(
+        self,
+        pipeline: list[WorkflowActionName],
+        steps: list[WorkflowActionResult],
+        resumed: int = 0,
+    ) -> tuple[bool, Exception | None, list[WorkflowActionResult], str]:
+        success = resumed + len(steps) == len(pipeline) and all(step.success for step in steps)
+        error = next((step.error for step in steps if step.error is not None), None)
+        return success, error, steps, self._pipeline_summary(pipeline, steps, resumed)
+
+    def _resolve_pipeline(self, workflow: WorkflowInterface) -> list[WorkflowActionName] | None:
+        """
+        Return the ordered actions to run, or ``None`` for a single action.
+
+        Explicit ``config.action_names`` win; otherwise ``config.action_name``
+        may name a pipeline declared by the workflow's optional
+        ``pipelines()`` method.
+        """
+        if self.config.action_names is not None:
+            return list(self.config.action_names)
+        pipelines = getattr(workflow, "pipelines", None)
+        if callable(pipelines):
+            declared = pipelines().get(self.config.action_name)
+            if declared is not None:
+                return [WorkflowActionName(action) for action in declared]
+        return None
+
+    def _run_pipeline(
+        self,
+        workflow: WorkflowInterface,
+        pipeline: list[WorkflowActionName],
+        timer: WorkflowTimer,
+    ) -> list[WorkflowActionResult]:
+        """Run ``pipeline`` on one workflow instance, stopping early if configured."""
+        steps: list[WorkflowActionResult] = []
+        for action in pipeline:
+            step_success = False
+            step_error = None
+            try:
+                with timer.span("handler", action):
+                    step_success = self._run_action(workflow, action)
+            except Exception as exc:
+                step_error = exc
+            if not self._record_step(steps, action, step_success, step_error):
+                break
+        return steps
+
+    async def _run_pipeline_async(
+        self,
+        workflow: WorkflowInterface,
+        pipeline: list[WorkflowActionName],
+        timer: WorkflowTimer,
+    ) -> list[WorkflowActionResult]:
+        steps: list[WorkflowActionResult] = []
+        for action in pipeline:
+            step_success = False
+            step_error = None
+            try:
+                with timer.span("handler", action):
+                    handler = self._async_handler(workflow, action)
+                    if handler is not None:
+                        step_success = bool(await handler())
+                    else:
+                        step_success = await run_blocking(self._run_action, workflow, action)
+            except Exception as exc:
+                step_error = exc
+            if not self._record_step(steps, action, step_success, step_error):
+                break
+        return steps
+
+    def _record_step(
+        self,
+        steps: list[WorkflowActionResult],
+        action: WorkflowActionName,
+        success: bool,
+        error: Exception | None,
+    ) -> bool:
+        """Append a pipeline step result; returns ``False`` when the pipeline should stop."""
+        if error is not None:
+            self._event(
+                "step.failed",
+                lambda: f"Step '{self.config.workflow_name}:{action}' failed with exception: {error!r}",
+                ERROR,
+                step=str(action),
+            )
+        steps.append(
+            WorkflowActionResult(
+                workflow_name=self.config.workflow_name,
+                action_name=action,
+                success=success,
+                error=error,
+                device_id=self.device_id,
+            )
+        )
+        if not success and self.config.stop_on_failure:
+            self._event(
+                "pipeline.stopped",
+                lambda: f"Stopping pipeline after failed step '{action}'.",
+                WARNING,
+            )
+            return False
+        return True
+
+    def _async_handler(
+        self, workflow: WorkflowInterface, action: WorkflowActionName
+    ) -> AsyncWorkflowActionHandler | None:
+        """
+        The coroutine handler of ``action`` when it has one and no declared steps.
+
+        It is awaited directly rather than through ``workflow.run``, whose
+        declared return type is a plain ``bool``.
+        """
+        action_handler = getattr(workflow, "action_handler", None)
+        if not callable(action_handler) or self._resolve_steps(workflow, action) is not None:
+            return None
+        try:
+            handler = action_handler(action)
+        except (KeyError, ValueError):
+            return None
+        return handler if inspect.iscoroutinefunction(handler) else None
+
+    def _resolve_steps(
+        self, workflow: WorkflowInterface, action: WorkflowActionName
+    ) -> list[WorkflowStep] | None:
+        """Steps declared by the workflow's optional ``steps(action)`` method, if any."""
+        declared = getattr(workflow, "steps", None)
+        if not callable(declared):
+            return None
+        steps = declared(action)
+        return list(steps) if steps is not None else None
+
+    def _step_runner(self, action: WorkflowActionName) -> StepRunner:
+        directory = self.config.checkpoint_dir or default_checkpoint_dir()
+        return StepRunner(
+            self.config.workflow_name,
+            action,
+            self.device_id,
+            checkpoint_store(directory),
+            circuit_breaker(directory),
+        )
+
+    def _run_action(self, workflow: WorkflowInterface, action: WorkflowActionName) -> bool:
+        """Run one action, through its declared steps when it has any."""
+        step_plan = self._resolve_steps(workflow, action)
+        if step_plan is None:
+            return bool(resolve_outcome(workflow.run(action)))
+        steps = self._step_runner(action).run(step_plan)
+        failed = next((step for step in steps if not step.success), None)
+        if failed is not None and failed.error is not None:
+            raise failed.error
+        return True
+
+    @staticmethod
+    def _pipeline_summary(
+        pipeline: list[WorkflowActionName],
+        steps: list[WorkflowActionResult],
+        resumed: int = 0,
+    ) -> str:
+        outcomes = [f"{action} resumed" for action in pipeline[:resumed]]
+        outcomes += [f"{step.action} {'✓' if step.success else '✗'}" for step in steps]
+        outcomes += [f"{action} skipped" for action in pipeline[resumed + len(steps):]]
+        return " [" + ", ".join(outcomes) + "]"
+
+    def close(self) -> None:
+        """Release the device lease, if one was taken."""
+        if self.lease is not None:
+            self.lease.release()
+
+    def __enter__(self) -> "Workflow":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _acquire_lease(self) -> DeviceLease | None:
+        """
+        Lease the configured device, or any free connected one, when leasing is on.
+
+        Leasing is enabled by ``config.lease_dir`` or ``WORKFLOW_LEASE_DIR``.
+        """
+        lease_dir = self.config.lease_dir or default_lease_dir()
+        if lease_dir is None:
+            return None
+        manager = DeviceLeaseManager(lease_dir)
+        timeout = self.config.lease_timeout
+        if self.config.device_id:
+            return manager.acquire(self.config.device_id, timeout=timeout)
+        selector = self._device_selector(lease_dir)
+        if selector is not None:
+            serials = selector.ranked(self.config.workflow_name, self._backend_devices())
+            lease = manager.acquire_any(serials, timeout=timeout, preserve_order=True)
+            selector.record_use(lease.serial, self.config.workflow_name)
+            return lease
+        serials = [device.serial for device in self._device_list()]
+        if not serials:
+            raise RuntimeError("No connected Android devices found.")
+        return manager.acquire_any(serials, timeout=timeout)
+
+    def _device_backend(self) -> DeviceBackend | None:
+        """``config.device_backend`` or ``WORKFLOW_DEVICE_BACKEND``; ``None`` means real adb."""
+        return self.config.device_backend or default_device_backend()
+
+    def _backend_devices(self) -> list[Any] | None:
+        """The backend's devices, or ``None`` to let callers list adb devices themselves."""
+        backend = self._device_backend()
+        return backend.device_list() if backend is not None else None
+
+    def _device_list(self) -> list[Any]:
+        devices = self._backend_devices()
+        return devices if devices is not None else adbutils.adb.device_list()
+
+    def _device_selector(self, lease_dir: str | None = None) -> DeviceSelector | None:
+        """Shared selector for ``config.selection_policy`` or ``WORKFLOW_SELECTION_POLICY``."""
+        policy = self.config.selection_policy or default_selection_policy()
+        if policy is None:
+            return None
+        return default_selector(policy, lease_dir)
+
+    def _select_device_id(self) -> str:
+        """Pick a device under the selection policy, or the first one when none is set."""
+        selector = self._device_selector()
+        if selector is None:
+            return self._get_first_connected_device_id()
+        device_id = selector.select(self.config.workflow_name, self._backend_devices())
+        self._event(
+            "device.selected",
+            lambda: f"Selected device '{device_id}' for '{self.config.workflow_name}'.",
+            device_id=device_id,
+        )
+        return device_id
+
+    def _save_failure_diagnostics(self, timer: WorkflowTimer, since: float) -> None:
+        """
+        Keep what a failed run leaves behind: a screen snapshot when
+        ``snapshot_dir`` is set, and the run's buffered events, saved next to
+        the snapshot or written to stderr.
+        """
+        name = (
+            f"{self.config.workflow_name}-{self.config.action_name}-failed-"
+            f"{time.strftime('%Y%m%dT%H%M%S')}"
+        )
+        target = None
+        if self.config.snapshot_dir:
+            with timer.span("snapshot"):
+                self._capture_failure_snapshot(name)
+            target = os.path.join(self.config.snapshot_dir, self.device_id, f"{name}.events.jsonl")
+        try:
+            event_log().dump(
+                target, since=since, workflow=self.config.workflow_name, device_id=self.device_id
+            )
+        except OSError as exc:
+            self._event("events.error", lambda: f"Run events could not be dumped: {exc!r}", WARNING)
+
+    def _capture_failure_snapshot(self, name: str) -> None:
+        """Save the screen the run failed on; never masks the original failure."""
+        try:
+            backend = self._device_backend()
+            if backend is not None:
+                device = backend.adb_device(self.device_id)
+            else:
+                device = adbutils.adb.device(serial=self.device_id)
+            snapshot = take_snapshot(device, SnapshotStore(self.config.snapshot_dir), name)
+        except Exception as exc:
+            self._event(
+                "snapshot.error",
+                lambda: f"Failure snapshot could not be captured: {exc!r}",
+                WARNING,
+            )
+            return
+        self._event(
+            "snapshot.saved",
+            lambda: f"Failure snapshot saved to '{snapshot.hierarchy_path}'.",
+            path=str(snapshot.hierarchy_path),
+        )
 
     def _get_first_connected_device_id(self) -> str:
         """Return the first connected adb device serial or raise if none."""
-        devices = adbutils.adb.device_list()
+        devices = self._device_list()
         if not devices:
             raise RuntimeError("No connected Android devices found.")
         if len(devices) > 1:
-            print(
-                f"Multiple devices detected; defaulting to first device '{devices[0].serial}'."
+            self._event(
+                "device.selected",
+                lambda: f"Multiple devices detected; defaulting to first device '{devices[0].serial}'.",
+                WARNING,
             )
         return devices[0].serial
         
     def _wake_device(self) -> None:
         """Turn on the screen and unlock the device if needed."""
-        device_info = self.device.info
-        print(f"Device screen status: {'on' if device_info.get('screenOn', False) else 'off'}.")
-        if not device_info.get("screenOn", False):
-            print("Screen is off. Turning screen on.")
-            self.device.screen_on()
-            time.sleep(0.5)
-
-        if self.device.info.get("currentPackageName") == "com.android.systemui":
+        state = self.device_state.snapshot()
+        self._event(
+            "device.screen",
+            lambda: f"Device screen status: {'on' if state.screen_on else 'off'}.",
+            DEBUG,
+            screen_on=state.screen_on,
+        )
+        if not state.screen_on:
+            self._event("device.wake", "Screen is off. Turning screen on.")
+            self.device_state.screen_on()
+            waited = wait_until(
+                lambda: self.device_state.refresh().screen_on,
+                timeout=self.config.settle_timeout,
+            )
+            self._event(
+                "device.wake",
+                lambda: f"Screen on check {'passed' if waited else 'timed out'} "
+                f"after {waited.elapsed:.2f}s.",
+                INFO if waited else WARNING,
+                waited=waited.elapsed,
+            )
+
+        if self.device_state.snapshot().current_package == "com.android.systemui":
             # Basic swipe to unlock gesture; adjust coordinates to match the device.
-            print("Unlocking device with swipe gesture.")
-            self.device.swipe(500, 1600, 500, 400, 0.2)
-            time.sleep(0.5)
+            self._event("device.unlock", "Unlocking device with swipe gesture.")
+            self.device_state.swipe(500, 1600, 500, 400, 0.2)
+            waited = wait_until(
+                lambda: self.device_state.refresh().current_package != "com.android.systemui",
+                timeout=self.config.settle_timeout,
+            )
+            self._event(
+                "device.unlock",
+                lambda: f"Unlock check {'passed' if waited else 'timed out'} "
+                f"after {waited.elapsed:.2f}s.",
+                INFO if waited else WARNING,
+                waited=waited.elapsed,
+            )
         else:
-            print("Device already unlocked.")
+            self._event("device.unlock", "Device already unlocked.", DEBUG)
 
     def _return_to_home(self) -> None:
         """Bring the device back to a neutral state."""
         workflow = WorkflowFactory.get_workflow(self.config)
         package_name = workflow.package_name()
-        print(f"Stopping package '{package_name}' and returning to home screen.")
-        self.device.app_stop(package_name)
-        self.device.press("home")
+        self._event(
+            "device.home",
+            lambda: f"Stopping package '{package_name}' and returning to home screen.",
+        )
+        self.device_state.app_stop(package_name)
+        self.device_state.press("home")
     
@@ -0,0 +1,89 @@
+"""Asyncio helpers: blocking device and network calls on one bounded executor."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEVICE_THREADS_ENV = "WORKFLOW_DEVICE_THREADS"
+DEFAULT_DEVICE_THREADS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def device_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide executor for blocking uiautomator2/adb calls made from asyncio.
+
+    Sized by ``WORKFLOW_DEVICE_THREADS`` (default 16), so one event loop can
+    drive many devices while at most that many calls block at once.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv(DEVICE_THREADS_ENV) or DEFAULT_DEVICE_THREADS)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow-device")
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await ``func(*args, **kwargs)`` run on :func:`device_executor`, in this task's context."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(device_executor(), call)
+
+
+def resolve_outcome(outcome: Any) -> Any:
+    """Finish an async handler's coroutine when it is called from synchronous code."""
+    if not inspect.isawaitable(outcome):
+        return outcome
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await(outcome))
+    if inspect.iscoroutine(outcome):
+        outcome.close()
+    raise RuntimeError(
+        "An async workflow action cannot be run by the synchronous Workflow.run() "
+        "from inside a running event loop; await Workflow.run_async() instead."
+    )
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+class AsyncDevice:
+    """
+    Awaitable view of a u2 device (or :class:`DeviceStateCache`).
+
+    Every method call runs on :func:`device_executor`, e.g.
+    ``await AsyncDevice(config.device).click(0.5, 0.5)``. Read blocking
+    properties such as ``info`` with ``await device.attribute("info")``.
+    """
+
+    def __init__(self, device: Any) -> None:
+        self.device = device
+
+    async def attribute(self, name: str) -> Any:
+        return await run_blocking(getattr, self.device, name)
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if name.startswith("__") or "device" not in self.__dict__:
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            # Resolve the attribute on the worker too: u2 properties do I/O.
+            return await run_blocking(lambda: getattr(self.device, name)(*args, **kwargs))
+
+        return call
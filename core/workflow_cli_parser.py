@@ -7,12 +7,16 @@ import importlib
 import inspect
 import os
 import pkgutil
+import sys
+from pathlib import Path
 from types import ModuleType
 from typing import Sequence, Type
 
 import workflow_core as core_pkg
 
 from .workflow_interface import WorkflowInterface
+from .workflow_manifest import WorkflowManifest
+from .workflow_registry import WorkflowRegistry
 
 
 class WorkflowCLIParser:
@@ -30,16 +34,62 @@ class WorkflowCLIParser:
         cls,
         argv: list[str] | None = None,
         package_paths: list[tuple[Sequence[str], str]] | None = None,
+        manifest_path: str | os.PathLike[str] | None = None,
     ) -> argparse.Namespace:
-        parser = argparse.ArgumentParser(
+        """
+        Build the CLI from discovered workflows and parse ``argv``.
+
+        When ``manifest_path`` (or ``WORKFLOW_CLI_MANIFEST``) is set, workflow
+        arguments are replayed from a cached :class:`WorkflowManifest` and only
+        the module of the selected ``--workflow`` is imported.
+        """
+        parser = cls._base_parser()
+        if manifest_path is None:
+            manifest_path = WorkflowManifest.default_path()
+        if manifest_path is not None:
+            args = cls._parse_with_manifest(parser, argv, package_paths, Path(manifest_path))
+        else:
+            cls._register_workflow_arguments(parser, package_paths)
+            args = parser.parse_args(argv)
+        if args.workflow is None and args.jobs is None:
+            parser.error("one of the arguments --workflow/--wf or --jobs is required")
+        if args.report is not None and args.jobs is None:
+            parser.error("--report only applies to --jobs")
+        return args
+
+    @classmethod
+    def build_parser(
+        cls,
+        package_paths: list[tuple[Sequence[str], str]] | None = None,
+        parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser,
+    ) -> argparse.ArgumentParser:
+        """The full CLI parser with every discovered workflow's arguments registered."""
+        parser = cls._base_parser(parser_class)
+        cls._register_workflow_arguments(parser, package_paths)
+        return parser
+
+    @classmethod
+    def _base_parser(
+        cls, parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser
+    ) -> argparse.ArgumentParser:
+        parser = parser_class(
             description="Run an Android UI automation workflow (core-neutral).",
         )
         parser.add_argument(
             "--workflow",
             "--wf",
-            required=True,
             help="Workflow to launch (no default to encourage explicit selection).",
         )
+        parser.add_argument(
+            "--jobs",
+            metavar="MANIFEST",
+            help="Run every job declared in a JSON job manifest instead of one workflow.",
+        )
+        parser.add_argument(
+            "--report",
+            metavar="PATH",
+            help="With --jobs, write the JSON result report here instead of stdout.",
+        )
         parser.add_argument(
             "--device-id",
             default=os.getenv("ANDROID_DEVICE_ID"),
@@ -52,12 +102,40 @@ class WorkflowCLIParser:
             default=0,
             help="Override delay in minutes between workflow runs (0 to bypass delays).",
         )
+        return parser
+
+    @classmethod
+    def _register_workflow_arguments(
+        cls,
+        parser: argparse.ArgumentParser,
+        package_paths: list[tuple[Sequence[str], str]] | None,
+    ) -> None:
         for workflow_cls in sorted(
             cls._discover_workflow_classes(package_paths),
             key=lambda cls: cls.__name__,
         ):
             workflow_cls.register_cli_arguments(parser)
-        return parser.parse_args(argv)
+
+    @classmethod
+    def _parse_with_manifest(
+        cls,
+        parser: argparse.ArgumentParser,
+        argv: list[str] | None,
+        package_paths: list[tuple[Sequence[str], str]] | None,
+        manifest_path: Path,
+    ) -> argparse.Namespace:
+        search_paths = package_paths or [(core_pkg.__path__, f"{core_pkg.__name__}.")]
+        entries = WorkflowManifest(manifest_path).entries(search_paths)
+        for entry in sorted(entries, key=lambda entry: entry.class_name):
+            entry.register_cli_arguments(parser)
+        args = parser.parse_args(argv)
+
+        # Import just the selected workflow and register it so the factory
+        # can resolve it without walking every package again.
+        for entry in entries:
+            if entry.name == args.workflow:
+                WorkflowRegistry.register(entry.load_class(), name=entry.name)
+        return args
 
     @classmethod
     def _discover_workflow_classes(
@@ -90,3 +168,42 @@ class WorkflowCLIParser:
 
 # For backward compatibility with existing imports
 workflow_cli_parser = WorkflowCLIParser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run ``--jobs MANIFEST`` in batch mode, or one ``--workflow`` action.
+
+    The single-workflow mode needs an ``--action`` option, which workflows
+    register themselves; returns a process exit status.
+    """
+    args = WorkflowCLIParser.parse(argv)
+    if args.jobs is not None:
+        from .workflow_jobs import JobManifestError, run_manifest
+
+        try:
+            return run_manifest(args.jobs, args.report)
+        except (JobManifestError, OSError) as exc:
+            print(exc, file=sys.stderr)
+            return 2
+
+    action = getattr(args, "action", None)
+    if not action:
+        print("--action is required to run a single workflow.", file=sys.stderr)
+        return 2
+    from .workflow import Workflow
+    from .workflow_config import WorkflowConfig
+
+    config = WorkflowConfig(
+        workflow=args.workflow,
+        action=action,
+        device_id=args.device_id,
+        delay_minutes=args.delay,
+        args=args,
+    )
+    with Workflow(config) as workflow:
+        return 0 if workflow.run().success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,19 @@
 from __future__ import annotations
 import argparse
+import copy
 
 from dataclasses import dataclass
-from typing import Any, Optional
-
-import uiautomator2 as u2
+from typing import TYPE_CHECKING, Any, Optional, Sequence
 
 from .workflow_types import WorkflowActionName, WorkflowName
-import argparse
+
+if TYPE_CHECKING:
+    import uiautomator2 as u2
+
+    from .device_farm import DeviceBackend
+    from .device_pool import DevicePool
+    from .device_state import DeviceStateCache
+    from .workflow_timing import WorkflowTimer
 
 @dataclass(init=False)
 class WorkflowConfig:
@@ -19,6 +25,23 @@ class WorkflowConfig:
     delay_minutes: int = 0
     device: Optional[u2.Device] = None
     args: argparse.Namespace = None
+    async_notifications: bool = False
+    device_state_ttl: float = 1.0
+    settle_timeout: float = 2.0
+    collect_timings: bool = True
+    action_names: Optional[list[WorkflowActionName]] = None
+    stop_on_failure: bool = True
+    device_pool: Optional[DevicePool] = None
+    device_backend: Optional[DeviceBackend] = None
+    lease_dir: Optional[str] = None
+    lease_timeout: Optional[float] = None
+    selection_policy: Optional[str] = None
+    snapshot_dir: Optional[str] = None
+    checkpoint_dir: Optional[str] = None
+    record_macro: Optional[str] = None
+    history_path: Optional[str] = None
+    timer: Optional[WorkflowTimer] = None
+    device_state: Optional[DeviceStateCache] = None
 
     def __init__(
         self,
@@ -27,6 +50,21 @@ class WorkflowConfig:
         device_id: Optional[str] = None,
         delay_minutes: int = 0,
         args: argparse.Namespace = None,
+        async_notifications: bool = False,
+        device_state_ttl: float = 1.0,
+        settle_timeout: float = 2.0,
+        collect_timings: bool = True,
+        actions: Optional[Sequence[WorkflowActionName]] = None,
+        stop_on_failure: bool = True,
+        device_pool: Optional[DevicePool] = None,
+        device_backend: Optional[DeviceBackend] = None,
+        lease_dir: Optional[str] = None,
+        lease_timeout: Optional[float] = None,
+        selection_policy: Optional[str] = None,
+        snapshot_dir: Optional[str] = None,
+        checkpoint_dir: Optional[str] = None,
+        record_macro: Optional[str] = None,
+        history_path: Optional[str] = None,
     ) -> None:
         self.workflow_name = workflow
         self.action_name = action
@@ -34,4 +72,39 @@ class WorkflowConfig:
         self.delay_minutes = delay_minutes
         self.device = None
         self.args = args
+        self.async_notifications = async_notifications
+        self.device_state_ttl = device_state_ttl
+        self.settle_timeout = settle_timeout
+        self.collect_timings = collect_timings
+        # Ordered actions to run as one pipeline; ``action`` then only labels the run.
+        self.action_names = (
+            [WorkflowActionName(name) for name in actions] if actions is not None else None
+        )
+        self.stop_on_failure = stop_on_failure
+        self.device_pool = device_pool
+        # Where devices come from instead of adb, e.g. a ``device_farm.SimulatedFarm``.
+        self.device_backend = device_backend
+        # Directory shared by every process that must not drive the same serial at once.
+        self.lease_dir = lease_dir
+        self.lease_timeout = lease_timeout
+        # "lru", "least-loaded", "sticky" or "reliable"; None keeps the first-device default.
+        self.selection_policy = selection_policy
+        # When set, a failed run saves a hierarchy + screenshot snapshot here.
+        self.snapshot_dir = snapshot_dir
+        # Where step checkpoints and circuit breaker state persist between runs.
+        self.checkpoint_dir = checkpoint_dir
+        # When set, gestures made through ``config.device`` are saved here as a macro.
+        self.record_macro = record_macro
+        # SQLite run history every result is appended to (see ``run_history``).
+        self.history_path = history_path
+        self.timer = None
+        self.device_state = None
+
+    def for_device(self, device_id: str) -> "WorkflowConfig":
+        """Return a copy of this config bound to ``device_id`` (and no live device)."""
+        config = copy.copy(self)
+        config.device_id = device_id
+        config.device = None
+        config.device_state = None
+        return config
         
@@ -1,13 +1,9 @@
 from __future__ import annotations
 
-import importlib
-import inspect
-import os
-import pkgutil
 from typing import Type
 
-from .. import __path__ as workflows_path
 from .workflow_interface import WorkflowInterface
+from .workflow_registry import WorkflowRegistry
 from .workflow_types import WorkflowName
 from .workflow_config import WorkflowConfig
 
@@ -21,99 +17,21 @@ class WorkflowFactory:
         """
         Retrieve a workflow implementation matching the provided name.
 
+        Lookups go through the process-wide :class:`WorkflowRegistry`, so
+        package discovery only runs on the first call.
+
         Raises:
             ValueError: If no workflow implementation matches ``name``.
         """
-        for workflow_cls in WorkflowFactory._discover_workflow_classes():
-            if WorkflowFactory._workflow_name(workflow_cls) == config.workflow_name:
-                return workflow_cls(config)
-        raise ValueError(f"No workflow found for name '{config.workflow_name}'.")
-    
-    
+        workflow_cls = WorkflowRegistry.get(config.workflow_name)
+        if workflow_cls is None:
+            raise ValueError(f"No workflow found for name '{config.workflow_name}'.")
+        return workflow_cls(config)
 
     @staticmethod
     def _discover_workflow_classes() -> set[Type[WorkflowInterface]]:
-        classes: set[Type[WorkflowInterface]] = set()
-
-        # Discover built-in workflows under workflow_core
-        package_name = __package__ or __name__
-        parent_package = package_name.rsplit(".", 1)[0] if "." in package_name else package_name
-        package_prefix = f"{parent_package}."
-        for _, module_name, is_pkg in pkgutil.walk_packages(
-            workflows_path, prefix=package_prefix
-        ):
-            if not is_pkg:
-                module = importlib.import_module(module_name)
-                for value in vars(module).values():
-                    if (
-                        inspect.isclass(value)
-                        and value is not WorkflowInterface
-                        and issubclass(value, WorkflowInterface)
-                    ):
-                        classes.add(value)
-
-        # Optionally discover workflows from extra packages (comma-separated)
-        extra_packages = os.getenv("WORKFLOW_EXTRA_PACKAGES", "workflows")
-        for pkg_name in [p.strip() for p in extra_packages.split(",") if p.strip()]:
-            try:
-                pkg = importlib.import_module(pkg_name)
-            except ModuleNotFoundError:
-                continue
-            pkg_path = getattr(pkg, "__path__", None)
-            if not pkg_path:
-                continue
-            for _, module_name, is_pkg in pkgutil.walk_packages(
-                pkg_path, prefix=f"{pkg_name}."
-            ):
-                if not is_pkg:
-                    module = importlib.import_module(module_name)
-                    for value in vars(module).values():
-                        if (
-                            inspect.isclass(value)
-                            and value is not WorkflowInterface
-                            and issubclass(value, WorkflowInterface)
-                        ):
-                            classes.add(value)
-
-        return classes
+        return WorkflowRegistry.discover_workflow_classes()
 
     @staticmethod
     def _workflow_name(workflow_cls: Type[WorkflowInterface]) -> WorkflowName:
-        name_attr = getattr(workflow_cls, "workflow_name", None)
-        if not callable(name_attr):
-            raise ValueError(
-                f"Workflow '{workflow_cls.__name__}' is missing a callable workflow_name()."
-            )
-
-        try:
-            signature = inspect.signature(name_attr)
-            positional_params = [
-                param
-                for param in signature.parameters.values()
-                if param.kind in (
-                    inspect.Parameter.POSITIONAL_ONLY,
-                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                )
-            ]
-
-            if len(positional_params) == 0:
-                result = name_attr()
-            elif len(positional_params) == 1:
-                # Instance method; bypass __init__ to avoid side effects.
-                instance = workflow_cls.__new__(workflow_cls)  # type: ignore[misc]
-                result = name_attr(instance)
-            else:
-                raise ValueError(
-                    f"workflow_name() on '{workflow_cls.__name__}' must accept only 'self'."
-                )
-        except Exception as exc:  # pragma: no cover - defensive guardrail
-            raise ValueError(
-                f"Failed to resolve workflow name for '{workflow_cls.__name__}'"
-            ) from exc
-
-        if not isinstance(result, str):
-            raise TypeError(
-                f"Workflow '{workflow_cls.__name__}' returned non-string name: {result!r}"
-            )
-
-        return result
+        return WorkflowRegistry.workflow_name(workflow_cls)
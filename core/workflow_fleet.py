@@ -0,0 +1,145 @@
+"""Run a workflow action concurrently across several attached devices."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Sequence
+
+import adbutils
+
+from .device_farm import default_device_backend
+from .workflow import Workflow
+from .events import ERROR, emit
+from .workflow_async import run_blocking
+from .workflow_config import WorkflowConfig
+from .workflow_types import WorkflowActionResult
+
+WorkflowRunner = Callable[[WorkflowConfig], WorkflowActionResult]
+AsyncWorkflowRunner = Callable[[WorkflowConfig], Awaitable[WorkflowActionResult]]
+
+
+def run_workflow(config: WorkflowConfig) -> WorkflowActionResult:
+    """Connect to ``config.device_id`` and run the configured action once."""
+    with Workflow(config) as workflow:
+        return workflow.run()
+
+
+async def run_workflow_async(config: WorkflowConfig) -> WorkflowActionResult:
+    """Asyncio variant of :func:`run_workflow`; connecting and releasing never block the loop."""
+    workflow = await Workflow.connect_async(config)
+    try:
+        return await workflow.run_async()
+    finally:
+        await run_blocking(workflow.close)
+
+
+class WorkflowFleet:
+    """Fan a single workflow/action out to many devices with a bounded worker pool."""
+
+    def __init__(
+        self,
+        config: WorkflowConfig,
+        device_ids: Sequence[str] | None = None,
+        device_filter: Callable[[str], bool] | None = None,
+        max_workers: int = 4,
+        runner: WorkflowRunner = run_workflow,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.config = config
+        self._device_ids = list(device_ids) if device_ids is not None else None
+        self._device_filter = device_filter
+        self.max_workers = max_workers
+        self._runner = runner
+
+    def device_ids(self) -> list[str]:
+        """Return the target serials: explicit ones, or every device the backend lists."""
+        if self._device_ids is not None:
+            serials = list(self._device_ids)
+        else:
+            backend = self.config.device_backend or default_device_backend()
+            devices = backend.device_list() if backend is not None else adbutils.adb.device_list()
+            serials = [device.serial for device in devices]
+        if self._device_filter is not None:
+            serials = [serial for serial in serials if self._device_filter(serial)]
+        return serials
+
+    def run(self) -> list[WorkflowActionResult]:
+        """Run the action on every target device; results follow device order."""
+        serials = self.device_ids()
+        if not serials:
+            raise RuntimeError("No connected Android devices found.")
+
+        workers = min(self.max_workers, len(serials))
+        emit(
+            "fleet.started",
+            lambda: f"Running '{self.config.workflow_name}:{self.config.action_name}' on "
+            f"{len(serials)} device(s) with up to {workers} worker(s).",
+            workflow=self.config.workflow_name,
+            action=self.config.action_name,
+            devices=len(serials),
+        )
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow-fleet") as pool:
+            return list(pool.map(self._run_one, serials))
+
+    async def run_async(
+        self, runner: AsyncWorkflowRunner = run_workflow_async
+    ) -> list[WorkflowActionResult]:
+        """
+        Like :meth:`run` but from the running event loop, with ``max_workers``
+        devices in flight; blocking calls share the bounded device executor.
+        """
+        serials = await run_blocking(self.device_ids)
+        if not serials:
+            raise RuntimeError("No connected Android devices found.")
+
+        limit = asyncio.Semaphore(self.max_workers)
+        emit(
+            "fleet.started",
+            lambda: f"Running '{self.config.workflow_name}:{self.config.action_name}' on "
+            f"{len(serials)} device(s) with up to {min(self.max_workers, len(serials))} in flight.",
+            workflow=self.config.workflow_name,
+            action=self.config.action_name,
+            devices=len(serials),
+        )
+
+        async def run_one(device_id: str) -> WorkflowActionResult:
+            async with limit:
+                try:
+                    result = await runner(self.config.for_device(device_id))
+                except Exception as exc:
+                    return self._connection_failure(device_id, exc)
+            if result.device_id is None:
+                result.device_id = device_id
+            return result
+
+        return list(await asyncio.gather(*(run_one(serial) for serial in serials)))
+
+    def _run_one(self, device_id: str) -> WorkflowActionResult:
+        try:
+            result = self._runner(self.config.for_device(device_id))
+        except Exception as exc:
+            return self._connection_failure(device_id, exc)
+        if result.device_id is None:
+            result.device_id = device_id
+        return result
+
+    def _connection_failure(self, device_id: str, exc: Exception) -> WorkflowActionResult:
+        # Connection failures happen before Workflow.run can build a result.
+        emit(
+            "run.failed",
+            lambda: f"Device '{device_id}' failed before running: {exc!r}",
+            ERROR,
+            workflow=self.config.workflow_name,
+            action=self.config.action_name,
+            device_id=device_id,
+            error_class=type(exc).__name__,
+        )
+        return WorkflowActionResult(
+            workflow_name=self.config.workflow_name,
+            action_name=self.config.action_name,
+            success=False,
+            error=exc,
+            device_id=device_id,
+        )
@@ -0,0 +1,207 @@
+"""Local IPC front end: short-lived clients submit runs to a long-lived process."""
+
+from __future__ import annotations
+
+import copy
+import os
+import pickle
+import socket
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable
+
+from .events import INFO, WARNING, emit
+from .workflow_config import WorkflowConfig
+from .workflow_types import WorkflowActionResult
+
+ADDRESS_ENV = "WORKFLOW_DAEMON_ADDRESS"
+AUTHKEY_ENV = "WORKFLOW_DAEMON_AUTHKEY"
+DEFAULT_ADDRESS = Path.home() / ".cache" / "workflow_core" / "daemon.sock"
+
+WorkflowRunner = Callable[[WorkflowConfig], WorkflowActionResult]
+
+# Live-device attributes that only make sense inside the process that set them.
+_PROCESS_LOCAL_ATTRIBUTES = ("device", "device_state", "timer", "device_pool", "device_backend")
+
+
+def default_address() -> str:
+    """Socket path from ``WORKFLOW_DAEMON_ADDRESS`` or the per-user default."""
+    return os.getenv(ADDRESS_ENV) or str(DEFAULT_ADDRESS)
+
+
+def default_authkey() -> bytes | None:
+    """Shared secret from ``WORKFLOW_DAEMON_AUTHKEY``; the socket's permissions still apply."""
+    value = os.getenv(AUTHKEY_ENV)
+    return value.encode("utf-8") if value else None
+
+
+def portable_config(config: WorkflowConfig) -> WorkflowConfig:
+    """Copy of ``config`` without live handles, safe to pickle to another process."""
+    clone = copy.copy(config)
+    for attribute in _PROCESS_LOCAL_ATTRIBUTES:
+        if hasattr(clone, attribute):
+            setattr(clone, attribute, None)
+    return clone
+
+
+def portable_result(result: WorkflowActionResult) -> WorkflowActionResult:
+    """Make sure ``result`` survives pickling, replacing unpicklable errors."""
+    for item in (result, *result.steps):
+        if item.error is not None:
+            try:
+                pickle.dumps(item.error)
+            except Exception:
+                item.error = RuntimeError(repr(item.error))
+    return result
+
+
+class WorkflowRunServer:
+    """
+    Accept ``WorkflowConfig`` submissions on a local socket and run them.
+
+    Each connection carries one request; runs execute on a bounded thread
+    pool so a slow device does not block other clients.
+
+    Requests are unpickled, so only the owner may connect: the socket is
+    created ``0600`` and a missing parent directory ``0700``. ``authkey``
+    (default ``WORKFLOW_DAEMON_AUTHKEY``) adds an HMAC handshake on top.
+    A socket a live daemon still answers on is never taken over.
+    """
+
+    def __init__(
+        self,
+        runner: WorkflowRunner,
+        address: str | None = None,
+        authkey: bytes | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        self.address = address or default_address()
+        self._runner = runner
+        self._authkey = authkey if authkey is not None else default_authkey()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="workflow-ipc"
+        )
+        self._listener: Listener | None = None
+        self._stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        """Serve requests until :meth:`shutdown` is called."""
+        if self._listener is None:
+            self._bind()
+        self._serve()
+
+    def _bind(self) -> None:
+        """Create the listening socket with owner-only permissions."""
+        path = Path(self.address)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.path.lexists(path):
+            self._remove_stale_socket(path)
+        # Bind under a restrictive umask so the socket is never briefly world-connectable.
+        previous_umask = os.umask(0o177)
+        try:
+            self._listener = Listener(self.address, family="AF_UNIX", authkey=self._authkey)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(path, 0o600)
+        emit("daemon.listening", lambda: f"Workflow daemon listening on '{self.address}'.", INFO)
+
+    @staticmethod
+    def _remove_stale_socket(path: Path) -> None:
+        """Unlink a socket left by a daemon that died; refuse if one still answers."""
+        if not stat.S_ISSOCK(path.lstat().st_mode):
+            raise RuntimeError(f"'{path}' exists and is not a socket; refusing to replace it.")
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                path.unlink(missing_ok=True)
+                return
+        raise RuntimeError(f"Another workflow daemon is already listening on '{path}'.")
+
+    def _serve(self) -> None:
+        listener = self._listener
+        assert listener is not None
+        try:
+            while not self._stopped.is_set():
+                try:
+                    connection = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as exc:
+                    if self._stopped.is_set():
+                        break
+                    emit(
+                        "daemon.rejected",
+                        lambda: f"Workflow daemon rejected a connection: {exc!r}",
+                        WARNING,
+                        error_class=type(exc).__name__,
+                    )
+                    continue
+                if self._stopped.is_set():
+                    connection.close()
+                    break
+                self._pool.submit(self._handle, connection)
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def start(self) -> threading.Thread:
+        """Serve from a daemon thread; binding errors are raised here."""
+        self._bind()
+        thread = threading.Thread(target=self._serve, name="workflow-ipc", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            # A blocked accept() is not woken by close() on Linux; connect once
+            # instead (a raw socket, so the wake-up never waits on the handshake).
+            try:
+                with socket.socket(socket.AF_UNIX) as wake:
+                    wake.connect(self.address)
+            except OSError:
+                pass
+            listener.close()
+            # Only remove the socket this server bound, never another daemon's.
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+
+    def _handle(self, connection: Connection) -> None:
+        with connection:
+            try:
+                config = connection.recv()
+            except EOFError:
+                return
+            try:
+                response: tuple[str, Any] = ("ok", portable_result(self._runner(config)))
+            except Exception as exc:
+                response = ("error", RuntimeError(repr(exc)))
+            try:
+                connection.send(response)
+            except (BrokenPipeError, EOFError):
+                emit(
+                    "daemon.disconnected",
+                    "Workflow daemon client disconnected before the result was sent.",
+                    WARNING,
+                    workflow=getattr(config, "workflow_name", None),
+                    device_id=getattr(config, "device_id", None),
+                )
+
+
+def submit_run(
+    config: WorkflowConfig,
+    address: str | None = None,
+    authkey: bytes | None = None,
+) -> WorkflowActionResult:
+    """Send ``config`` to a running daemon and block until its result arrives."""
+    if authkey is None:
+        authkey = default_authkey()
+    with Client(address or default_address(), family="AF_UNIX", authkey=authkey) as connection:
+        connection.send(portable_config(config))
+        status, payload = connection.recv()
+    if status != "ok":
+        raise payload
+    return payload
@@ -0,0 +1,345 @@
+"""Run many workflow invocations from one JSON job manifest in a single process.
+
+Manifest format::
+
+    {
+      "max_workers": 4,
+      "jobs": [
+        {
+          "name": "hello-daily",
+          "workflow": "workflow.hello.world",
+          "actions": ["login", "start", "status"],
+          "devices": "all",
+          "jitter": [0, 120],
+          "args": {"hello-world-greeting": "hi"}
+        }
+      ]
+    }
+
+``action`` (one action or a declared pipeline name) or ``actions`` (an
+explicit pipeline) is required. ``devices`` is a serial, a list of serials,
+``"all"`` connected devices, ``{"policy": "lru"}`` for load-aware selection,
+or omitted for the default device. ``jitter`` is a maximum delay in seconds
+or a ``[low, high]`` window. ``args`` holds workflow CLI options as a
+``{"option": value}`` mapping or a raw argv list, and is validated by the
+same parser the single-run CLI uses.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .device_farm import connected_devices
+from .device_selection import POLICIES
+from .workflow_cli_parser import WorkflowCLIParser
+from .workflow_config import WorkflowConfig
+from .workflow_fleet import WorkflowRunner, run_workflow
+from .workflow_registry import WorkflowRegistry
+from .workflow_scheduler import WorkflowScheduler
+from .workflow_types import WorkflowActionName, WorkflowActionResult
+
+_JOB_KEYS = {"name", "workflow", "action", "actions", "devices", "jitter", "args"}
+
+
+class JobManifestError(ValueError):
+    """The job manifest is invalid; ``errors`` lists every problem found."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("Invalid job manifest:\n  " + "\n  ".join(errors))
+        self.errors = errors
+
+
+class _RaisingArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str) -> None:  # type: ignore[override]
+        raise ValueError(message)
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """One validated manifest entry."""
+
+    name: str
+    workflow: str
+    action: WorkflowActionName
+    actions: Optional[list[WorkflowActionName]]
+    devices: Any
+    jitter: tuple[float, float]
+    args: argparse.Namespace
+
+
+@dataclass(frozen=True)
+class JobManifest:
+    jobs: list[JobSpec]
+    max_workers: int = 4
+
+    @classmethod
+    def load(
+        cls,
+        path: str | os.PathLike[str],
+        package_paths: list[tuple[Sequence[str], str]] | None = None,
+    ) -> "JobManifest":
+        """Read and validate ``path``; raises :class:`JobManifestError` listing all problems."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            raise JobManifestError([f"cannot read {path}: {exc}"]) from exc
+        return cls.from_dict(data, package_paths)
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Any,
+        package_paths: list[tuple[Sequence[str], str]] | None = None,
+    ) -> "JobManifest":
+        if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+            raise JobManifestError(["manifest must be an object with a 'jobs' list"])
+        errors: list[str] = []
+        max_workers = data.get("max_workers", 4)
+        if not isinstance(max_workers, int) or max_workers < 1:
+            errors.append("'max_workers' must be a positive integer")
+            max_workers = 1
+
+        # One parser with every workflow's options, built once for all jobs.
+        parser = WorkflowCLIParser.build_parser(package_paths, parser_class=_RaisingArgumentParser)
+        jobs: list[JobSpec] = []
+        names: set[str] = set()
+        for index, entry in enumerate(data["jobs"]):
+            label = f"jobs[{index}]"
+            if not isinstance(entry, dict):
+                errors.append(f"{label}: must be an object")
+                continue
+            name = str(entry.get("name") or f"job-{index}")
+            label = f"jobs[{index}] ({name})"
+            if name in names:
+                errors.append(f"{label}: duplicate job name")
+            names.add(name)
+            job_errors: list[str] = []
+            job = _validate_job(entry, name, parser, job_errors)
+            errors.extend(f"{label}: {message}" for message in job_errors)
+            if job is not None and not job_errors:
+                jobs.append(job)
+        if errors:
+            raise JobManifestError(errors)
+        return cls(jobs=jobs, max_workers=max_workers)
+
+
+def _validate_job(
+    entry: dict[str, Any],
+    name: str,
+    parser: argparse.ArgumentParser,
+    errors: list[str],
+) -> Optional[JobSpec]:
+    unknown = sorted(set(entry) - _JOB_KEYS)
+    if unknown:
+        errors.append(f"unknown key(s) {', '.join(unknown)}")
+
+    workflow = entry.get("workflow")
+    if not isinstance(workflow, str):
+        errors.append("'workflow' is required")
+        return None
+    if WorkflowRegistry.get(workflow) is None:
+        errors.append(
+            f"unknown workflow {workflow!r}; available: {', '.join(WorkflowRegistry.names())}"
+        )
+
+    actions = entry.get("actions")
+    if actions is not None and (
+        not isinstance(actions, list) or not actions or not all(isinstance(a, str) for a in actions)
+    ):
+        errors.append("'actions' must be a non-empty list of action names")
+        actions = None
+    action = entry.get("action")
+    if action is None and actions is None:
+        errors.append("one of 'action' or 'actions' is required")
+    elif action is not None and not isinstance(action, str):
+        errors.append("'action' must be a string")
+
+    jitter = _jitter_window(entry.get("jitter", 0), errors)
+    devices = entry.get("devices")
+    if not (
+        devices is None
+        or isinstance(devices, str)
+        or (isinstance(devices, list) and all(isinstance(d, str) for d in devices))
+        or (isinstance(devices, dict) and set(devices) == {"policy"})
+    ):
+        errors.append("'devices' must be a serial, a list of serials, 'all' or {'policy': ...}")
+    elif isinstance(devices, dict) and devices["policy"] not in POLICIES:
+        errors.append(
+            f"unknown selection policy {devices['policy']!r}; choose from {', '.join(sorted(POLICIES))}"
+        )
+
+    try:
+        args = parser.parse_args(["--workflow", workflow, *_argv(entry.get("args", {}))])
+    except (ValueError, TypeError) as exc:
+        errors.append(f"invalid args: {exc}")
+        return None
+
+    return JobSpec(
+        name=name,
+        workflow=workflow,
+        action=WorkflowActionName(action or name),
+        actions=[WorkflowActionName(a) for a in actions] if actions else None,
+        devices=devices,
+        jitter=jitter,
+        args=args,
+    )
+
+
+def _jitter_window(value: Any, errors: list[str]) -> tuple[float, float]:
+    if isinstance(value, (int, float)) and value >= 0:
+        return 0.0, float(value)
+    if (
+        isinstance(value, list)
+        and len(value) == 2
+        and all(isinstance(v, (int, float)) for v in value)
+        and 0 <= value[0] <= value[1]
+    ):
+        return float(value[0]), float(value[1])
+    errors.append("'jitter' must be seconds >= 0 or a [low, high] window")
+    return 0.0, 0.0
+
+
+def _argv(args: Any) -> list[str]:
+    if isinstance(args, list):
+        return [str(arg) for arg in args]
+    if not isinstance(args, dict):
+        raise TypeError("'args' must be an object or a list")
+    argv: list[str] = []
+    for option, value in args.items():
+        flag = option if option.startswith("-") else "--" + option.replace("_", "-")
+        if value is True:
+            argv.append(flag)
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, list):
+            argv += [flag, *map(str, value)]
+        else:
+            argv += [flag, str(value)]
+    return argv
+
+
+def job_configs(job: JobSpec) -> list[WorkflowConfig]:
+    """Expand ``job`` into one config per target device."""
+    config = WorkflowConfig(
+        workflow=job.workflow,
+        action=job.action,
+        device_id=job.args.device_id,
+        args=job.args,
+        actions=job.actions,
+    )
+    devices = job.devices
+    if isinstance(devices, dict):
+        config.selection_policy = devices["policy"]
+        config.device_id = None
+        return [config]
+    if devices == "all":
+        devices = [device.serial for device in connected_devices()]
+        if not devices:
+            raise RuntimeError("No connected Android devices found.")
+    if isinstance(devices, str):
+        devices = [devices]
+    if devices is None:
+        return [config]
+    return [config.for_device(serial) for serial in devices]
+
+
+def _record(job: str, result: WorkflowActionResult) -> dict[str, Any]:
+    return {
+        "job": job,
+        "workflow": result.workflow,
+        "action": str(result.action),
+        "device_id": result.device_id,
+        "success": result.success,
+        "error": repr(result.error) if result.error is not None else None,
+        "timings": result.timings,
+        "steps": [
+            {"action": str(step.action), "success": step.success} for step in result.steps
+        ],
+    }
+
+
+def run_jobs(
+    manifest: JobManifest,
+    runner: WorkflowRunner = run_workflow,
+    seed: Optional[int] = None,
+) -> dict[str, Any]:
+    """Run every job on one bounded pool and return the JSON-ready report."""
+    started_at = time.time()
+    submitted: list[tuple[JobSpec, Optional[Future[WorkflowActionResult]], Optional[str]]] = []
+    scheduler = WorkflowScheduler(max_workers=manifest.max_workers, seed=seed, runner=runner)
+    scheduler.start()
+    try:
+        for job in manifest.jobs:
+            try:
+                configs = job_configs(job)
+            except Exception as exc:
+                submitted.append((job, None, repr(exc)))
+                continue
+            for config in configs:
+                submitted.append((job, scheduler.submit(config, jitter_seconds=job.jitter), None))
+
+        records = []
+        for job, future, failure in submitted:
+            if future is None:
+                error = RuntimeError(failure)
+                records.append(
+                    _record(job.name, WorkflowActionResult(job.workflow, job.action, False, error))
+                )
+                continue
+            try:
+                result = future.result()
+            except Exception as exc:
+                result = WorkflowActionResult(job.workflow, job.action, False, exc)
+            records.append(_record(job.name, result))
+    finally:
+        scheduler.stop(wait=True, cancel_pending=True)
+
+    finished_at = time.time()
+    succeeded = sum(1 for record in records if record["success"])
+    return {
+        "started_at": started_at,
+        "finished_at": finished_at,
+        "duration_seconds": round(finished_at - started_at, 3),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "results": records,
+    }
+
+
+def write_report(report: dict[str, Any], path: Optional[str | os.PathLike[str]] = None) -> None:
+    """Write ``report`` as JSON to ``path``, or to stdout when ``path`` is ``None``."""
+    serialized = json.dumps(report, indent=2, sort_keys=True)
+    if path is None:
+        print(serialized)
+        return
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(serialized + "\n", encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def run_manifest(
+    path: str | os.PathLike[str],
+    report_path: Optional[str | os.PathLike[str]] = None,
+    package_paths: list[tuple[Sequence[str], str]] | None = None,
+) -> int:
+    """
+    CLI batch mode for ``--jobs``: validate, run, report; returns an exit status.
+
+    Progress goes to stderr so a report written to stdout stays parseable.
+    """
+    manifest = JobManifest.load(path, package_paths)
+    print(f"Running {len(manifest.jobs)} job(s) from {path} on {manifest.max_workers} worker(s).", file=sys.stderr)
+    report = run_jobs(manifest)
+    write_report(report, report_path)
+    print(f"Jobs finished: {report['succeeded']} succeeded, {report['failed']} failed.", file=sys.stderr)
+    return 0 if report["failed"] == 0 else 1
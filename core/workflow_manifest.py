@@ -0,0 +1,348 @@
+"""On-disk cache of discovered workflows and their CLI arguments."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, MutableMapping, Sequence
+
+from .workflow_interface import WorkflowInterface
+from .workflow_registry import WorkflowRegistry
+from .workflow_types import WorkflowName
+
+MANIFEST_ENV = "WORKFLOW_CLI_MANIFEST"
+MANIFEST_VERSION = 1
+
+# Keyword arguments that ``add_argument`` accepts for each replayable action.
+_ACTION_KWARGS: dict[str, tuple[str, ...]] = {
+    "store": ("nargs", "const", "default", "type", "choices", "required", "help", "metavar"),
+    "append": ("nargs", "const", "default", "type", "choices", "required", "help", "metavar"),
+    "extend": ("nargs", "const", "default", "type", "choices", "required", "help", "metavar"),
+    "store_const": ("const", "default", "required", "help", "metavar"),
+    "append_const": ("const", "default", "required", "help", "metavar"),
+    "store_true": ("default", "required", "help"),
+    "store_false": ("default", "required", "help"),
+    "count": ("default", "required", "help"),
+}
+
+# Read by argparse's help formatter (terminal size, colour) on every add_argument.
+_ARGPARSE_ENV = frozenset({"COLUMNS", "LINES", "TERM", "NO_COLOR", "FORCE_COLOR", "PYTHON_COLORS"})
+
+
+class _RecordingEnviron(MutableMapping[str, str]):
+    """Stands in for ``os.environ`` while arguments are captured and notes every read."""
+
+    def __init__(self, environ: MutableMapping[str, str]) -> None:
+        self.environ = environ
+        self.keys: set[str] = set()
+
+    @property
+    def read(self) -> bool:
+        """Whether anything beyond the terminal settings argparse itself consults was read."""
+        return bool(self.keys - _ARGPARSE_ENV)
+
+    def __getitem__(self, key: str) -> str:
+        self.keys.add(key)
+        return self.environ[key]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self.environ[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.environ[key]
+
+    def __iter__(self) -> Iterator[str]:
+        self.keys.add("*")
+        return iter(self.environ)
+
+    def __len__(self) -> int:
+        return len(self.environ)
+
+    def copy(self) -> dict[str, str]:
+        self.keys.add("*")
+        return dict(self.environ)
+
+
+class _LazyType:
+    """argparse ``type=`` callable that imports its target on first use."""
+
+    def __init__(self, reference: str) -> None:
+        self.reference = reference
+        self.__name__ = reference.rsplit(".", 1)[-1].rsplit(":", 1)[-1]
+        self._target: Callable[[str], Any] | None = None
+
+    def __call__(self, value: str) -> Any:
+        if self._target is None:
+            self._target = _resolve_reference(self.reference)
+        return self._target(value)
+
+    def __repr__(self) -> str:
+        return f"_LazyType({self.reference!r})"
+
+
+def _callable_reference(value: Callable[..., Any]) -> str | None:
+    """Return ``module:qualname`` for an importable callable, else ``None``."""
+    module = getattr(value, "__module__", None)
+    qualname = getattr(value, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        return None
+    reference = f"{module}:{qualname}"
+    try:
+        resolved = _resolve_reference(reference)
+    except (ImportError, AttributeError):
+        return None
+    return reference if resolved == value else None
+
+
+def _resolve_reference(reference: str) -> Any:
+    module_name, _, qualname = reference.partition(":")
+    target: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+@dataclass(slots=True)
+class WorkflowManifestEntry:
+    """Cached description of one workflow class."""
+
+    module: str
+    qualname: str
+    name: WorkflowName | None
+    arguments: list[dict[str, Any]] | None
+
+    @property
+    def class_name(self) -> str:
+        return self.qualname.rsplit(".", 1)[-1]
+
+    def load_class(self) -> type[WorkflowInterface]:
+        return _resolve_reference(f"{self.module}:{self.qualname}")
+
+    def register_cli_arguments(self, parser: argparse.ArgumentParser) -> None:
+        """Replay the cached arguments, importing the module only if they were not cacheable."""
+        if self.arguments is None:
+            self.load_class().register_cli_arguments(parser)
+            return
+        for spec in self.arguments:
+            kwargs = dict(spec["kwargs"])
+            if "type" in kwargs:
+                kwargs["type"] = _LazyType(kwargs["type"])
+            if isinstance(kwargs.get("metavar"), list):
+                kwargs["metavar"] = tuple(kwargs["metavar"])
+            flags = spec["flags"]
+            if flags:
+                parser.add_argument(*flags, action=spec["action"], dest=spec["dest"], **kwargs)
+            else:
+                parser.add_argument(spec["dest"], action=spec["action"], **kwargs)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "module": self.module,
+            "qualname": self.qualname,
+            "name": self.name,
+            "arguments": self.arguments,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "WorkflowManifestEntry":
+        return cls(
+            module=data["module"],
+            qualname=data["qualname"],
+            name=data.get("name"),
+            arguments=data.get("arguments"),
+        )
+
+
+class WorkflowManifest:
+    """
+    Persistent index of workflow modules keyed by file path and mtime.
+
+    The first run imports every workflow module (as the CLI always did) and
+    records each workflow's name, defining module and ``register_cli_arguments``
+    output. Later runs only ``stat`` the module files and re-import the ones
+    that changed, so ``--help`` and argument parsing no longer import
+    uiautomator2 or app dependencies.
+
+    Argument defaults are captured when a module is (re)indexed. Workflows
+    whose ``register_cli_arguments`` reads ``os.environ`` (directly or via
+    ``os.getenv``), or whose arguments cannot be serialized (custom actions,
+    lambdas, groups), are imported eagerly so their defaults stay current.
+    Defaults taken from anywhere else are cached until the module changes.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+
+    @staticmethod
+    def default_path() -> Path | None:
+        """Manifest location from ``WORKFLOW_CLI_MANIFEST``; unset disables caching."""
+        value = os.getenv(MANIFEST_ENV, "").strip()
+        return Path(value).expanduser() if value else None
+
+    def entries(
+        self, search_paths: Sequence[tuple[Sequence[str], str]]
+    ) -> list[WorkflowManifestEntry]:
+        """Return entries for every workflow under ``search_paths``, refreshing stale modules."""
+        cached = self._read()
+        modules: dict[str, Any] = {
+            path: record for path, record in cached.items() if os.path.exists(path)
+        }
+        changed = len(modules) != len(cached)
+        seen: dict[tuple[str, str], WorkflowManifestEntry] = {}
+
+        for module_name, file_path in self._iter_module_files(search_paths):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            record = modules.get(file_path)
+            if (
+                record is None
+                or record.get("mtime_ns") != stat.st_mtime_ns
+                or record.get("size") != stat.st_size
+                or record.get("module") != module_name
+            ):
+                record = {
+                    "module": module_name,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "workflows": [
+                        entry.to_json() for entry in self._index_module(module_name)
+                    ],
+                }
+                modules[file_path] = record
+                changed = True
+            for data in record["workflows"]:
+                entry = WorkflowManifestEntry.from_json(data)
+                seen.setdefault((entry.module, entry.qualname), entry)
+
+        if changed:
+            self._write(modules)
+        return list(seen.values())
+
+    @staticmethod
+    def _iter_module_files(
+        search_paths: Sequence[tuple[Sequence[str], str]],
+    ) -> Iterator[tuple[str, str]]:
+        """Yield ``(module_name, file_path)`` for non-package modules without importing them."""
+        pending = [(list(paths), prefix) for paths, prefix in search_paths]
+        while pending:
+            paths, prefix = pending.pop()
+            for module_info in pkgutil.iter_modules(paths, prefix):
+                finder = module_info.module_finder
+                find_spec = getattr(finder, "find_spec", None)
+                spec = find_spec(module_info.name) if find_spec else None
+                if spec is None:
+                    continue
+                if module_info.ispkg:
+                    locations = spec.submodule_search_locations or []
+                    pending.append((list(locations), f"{module_info.name}."))
+                elif spec.origin:
+                    yield module_info.name, os.path.abspath(spec.origin)
+
+    @classmethod
+    def _index_module(cls, module_name: str) -> list[WorkflowManifestEntry]:
+        module = importlib.import_module(module_name)
+        entries: list[WorkflowManifestEntry] = []
+        for value in vars(module).values():
+            if not inspect.isclass(value) or value is WorkflowInterface:
+                continue
+            if not issubclass(value, WorkflowInterface):
+                continue
+            if not callable(getattr(value, "register_cli_arguments", None)):
+                continue
+            try:
+                name: WorkflowName | None = WorkflowRegistry.workflow_name(value)
+            except (TypeError, ValueError):
+                name = None
+            entries.append(
+                WorkflowManifestEntry(
+                    module=value.__module__,
+                    qualname=value.__qualname__,
+                    name=name,
+                    arguments=cls._capture_arguments(value),
+                )
+            )
+        return entries
+
+    @staticmethod
+    def _capture_arguments(workflow_cls: type[WorkflowInterface]) -> list[dict[str, Any]] | None:
+        """Record the arguments a workflow registers, or ``None`` if they cannot be replayed."""
+        parser = argparse.ArgumentParser(add_help=False)
+        recorder = _RecordingEnviron(os.environ)
+        os.environ = recorder  # type: ignore[assignment]
+        try:
+            workflow_cls.register_cli_arguments(parser)
+        finally:
+            os.environ = recorder.environ  # type: ignore[assignment]
+        if recorder.read:
+            # Defaults derived from the environment must be recomputed every run.
+            return None
+        if parser._mutually_exclusive_groups or parser._subparsers is not None:
+            return None
+
+        action_names = {
+            action_cls: name
+            for name, action_cls in parser._registries["action"].items()
+            if name in _ACTION_KWARGS
+        }
+        specs: list[dict[str, Any]] = []
+        for action in parser._actions:
+            action_name = action_names.get(type(action))
+            if action_name is None:
+                return None
+            kwargs: dict[str, Any] = {}
+            for attr in _ACTION_KWARGS[action_name]:
+                value = getattr(action, attr)
+                if attr == "type":
+                    if value is None:
+                        continue
+                    reference = _callable_reference(value)
+                    if reference is None:
+                        return None
+                    value = reference
+                elif attr == "required" and not action.option_strings:
+                    continue
+                elif value is None:
+                    continue
+                elif attr == "choices":
+                    value = list(value)
+                kwargs[attr] = value
+            specs.append(
+                {
+                    "flags": list(action.option_strings),
+                    "dest": action.dest,
+                    "action": action_name,
+                    "kwargs": kwargs,
+                }
+            )
+        try:
+            json.dumps(specs)
+        except (TypeError, ValueError):
+            return None
+        return specs
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return {}
+        modules = data.get("modules")
+        return modules if isinstance(modules, dict) else {}
+
+    def _write(self, modules: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "modules": modules}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,186 @@
+"""Process-wide registry mapping workflow names to implementation classes."""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import os
+import pkgutil
+import threading
+from typing import Any, Iterable, Sequence, Type
+
+from .. import __path__ as workflows_path
+from .workflow_interface import WorkflowInterface
+from .workflow_types import WorkflowName
+
+
+class WorkflowRegistry:
+    """Name -> class index built once from package discovery.
+
+    Discovery walks the ``workflow_core`` package plus every package listed in
+    ``WORKFLOW_EXTRA_PACKAGES`` the first time a lookup happens; later lookups
+    are plain dictionary reads. Classes registered explicitly via
+    :meth:`register` take precedence over discovered ones and survive
+    :meth:`invalidate`.
+    """
+
+    _lock = threading.RLock()
+    _registered: dict[WorkflowName, Type[WorkflowInterface]] = {}
+    _discovered: dict[WorkflowName, Type[WorkflowInterface]] | None = None
+    _discovered_extra_packages: str | None = None
+
+    @classmethod
+    def register(
+        cls,
+        workflow_cls: Type[WorkflowInterface] | None = None,
+        *,
+        name: WorkflowName | None = None,
+    ) -> Any:
+        """
+        Register ``workflow_cls`` under ``name`` (defaults to its workflow_name()).
+
+        Usable directly (``WorkflowRegistry.register(MyWorkflow)``) or as a
+        decorator, with or without arguments.
+        """
+
+        def decorator(target: Type[WorkflowInterface]) -> Type[WorkflowInterface]:
+            resolved = name if name is not None else cls.workflow_name(target)
+            with cls._lock:
+                cls._registered[resolved] = target
+            return target
+
+        if workflow_cls is None:
+            return decorator
+        return decorator(workflow_cls)
+
+    @classmethod
+    def unregister(cls, name: WorkflowName) -> None:
+        """Drop an explicit registration; discovered classes are unaffected."""
+        with cls._lock:
+            cls._registered.pop(name, None)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget discovered classes so the next lookup re-runs discovery."""
+        with cls._lock:
+            cls._discovered = None
+            cls._discovered_extra_packages = None
+
+    @classmethod
+    def get(cls, name: WorkflowName) -> Type[WorkflowInterface] | None:
+        """Return the class registered for ``name`` or ``None``."""
+        workflow_cls = cls._registered.get(name)
+        if workflow_cls is not None:
+            return workflow_cls
+        return cls._discovered_index().get(name)
+
+    @classmethod
+    def names(cls) -> list[WorkflowName]:
+        """Return every known workflow name, sorted."""
+        return sorted(set(cls._discovered_index()) | set(cls._registered))
+
+    @classmethod
+    def _discovered_index(cls) -> dict[WorkflowName, Type[WorkflowInterface]]:
+        extra_packages = os.getenv("WORKFLOW_EXTRA_PACKAGES", "workflows")
+        index = cls._discovered
+        if index is not None and cls._discovered_extra_packages == extra_packages:
+            return index
+        with cls._lock:
+            if cls._discovered is None or cls._discovered_extra_packages != extra_packages:
+                built: dict[WorkflowName, Type[WorkflowInterface]] = {}
+                for workflow_cls in sorted(
+                    cls.discover_workflow_classes(extra_packages),
+                    key=lambda value: (value.__module__, value.__qualname__),
+                ):
+                    built.setdefault(cls.workflow_name(workflow_cls), workflow_cls)
+                cls._discovered = built
+                cls._discovered_extra_packages = extra_packages
+            return cls._discovered
+
+    @staticmethod
+    def discover_workflow_classes(
+        extra_packages: str | None = None,
+    ) -> set[Type[WorkflowInterface]]:
+        """Import workflow modules and collect every WorkflowInterface implementation."""
+        classes: set[Type[WorkflowInterface]] = set()
+
+        # Discover built-in workflows under workflow_core
+        package_name = __package__ or __name__
+        parent_package = package_name.rsplit(".", 1)[0] if "." in package_name else package_name
+        classes.update(
+            WorkflowRegistry._collect_from_paths(workflows_path, f"{parent_package}.")
+        )
+
+        # Optionally discover workflows from extra packages (comma-separated)
+        if extra_packages is None:
+            extra_packages = os.getenv("WORKFLOW_EXTRA_PACKAGES", "workflows")
+        for pkg_name in [p.strip() for p in extra_packages.split(",") if p.strip()]:
+            try:
+                pkg = importlib.import_module(pkg_name)
+            except ModuleNotFoundError:
+                continue
+            pkg_path = getattr(pkg, "__path__", None)
+            if not pkg_path:
+                continue
+            classes.update(WorkflowRegistry._collect_from_paths(pkg_path, f"{pkg_name}."))
+
+        return classes
+
+    @staticmethod
+    def _collect_from_paths(
+        paths: Iterable[str] | Sequence[str], prefix: str
+    ) -> set[Type[WorkflowInterface]]:
+        classes: set[Type[WorkflowInterface]] = set()
+        for _, module_name, is_pkg in pkgutil.walk_packages(paths, prefix=prefix):
+            if not is_pkg:
+                module = importlib.import_module(module_name)
+                for value in vars(module).values():
+                    if (
+                        inspect.isclass(value)
+                        and value is not WorkflowInterface
+                        and issubclass(value, WorkflowInterface)
+                    ):
+                        classes.add(value)
+        return classes
+
+    @staticmethod
+    def workflow_name(workflow_cls: Type[WorkflowInterface]) -> WorkflowName:
+        """Resolve the name a workflow class reports without running its __init__."""
+        name_attr = getattr(workflow_cls, "workflow_name", None)
+        if not callable(name_attr):
+            raise ValueError(
+                f"Workflow '{workflow_cls.__name__}' is missing a callable workflow_name()."
+            )
+
+        try:
+            signature = inspect.signature(name_attr)
+            positional_params = [
+                param
+                for param in signature.parameters.values()
+                if param.kind in (
+                    inspect.Parameter.POSITIONAL_ONLY,
+                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                )
+            ]
+
+            if len(positional_params) == 0:
+                result = name_attr()
+            elif len(positional_params) == 1:
+                # Instance method; bypass __init__ to avoid side effects.
+                instance = workflow_cls.__new__(workflow_cls)  # type: ignore[misc]
+                result = name_attr(instance)
+            else:
+                raise ValueError(
+                    f"workflow_name() on '{workflow_cls.__name__}' must accept only 'self'."
+                )
+        except Exception as exc:  # pragma: no cover - defensive guardrail
+            raise ValueError(
+                f"Failed to resolve workflow name for '{workflow_cls.__name__}'"
+            ) from exc
+
+        if not isinstance(result, str):
+            raise TypeError(
+                f"Workflow '{workflow_cls.__name__}' returned non-string name: {result!r}"
+            )
+
+        return result
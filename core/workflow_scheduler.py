@@ -0,0 +1,188 @@
+"""Timer-queue scheduler for staggered workflow runs without sleeping workers."""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .workflow_config import WorkflowConfig
+from .workflow_fleet import WorkflowRunner, run_workflow
+from .workflow_types import WorkflowActionResult
+
+
+@dataclass(slots=True, order=True)
+class ScheduledJob:
+    """A workflow run waiting in the timer queue until ``due`` (scheduler clock)."""
+
+    due: float
+    sequence: int
+    config: WorkflowConfig = field(compare=False)
+    future: Future[WorkflowActionResult] = field(compare=False)
+
+
+class WorkflowScheduler:
+    """
+    Dispatch many jittered workflow runs from a single heap-ordered timer queue.
+
+    Unlike ``Workflow._random_delay``, no thread sleeps on a job's behalf: a
+    single daemon thread waits for the earliest due time and hands due jobs to
+    a bounded worker pool. Jobs run with ``delay_minutes`` forced to 0 because
+    the jitter has already been applied here.
+
+    ``seed`` makes the randomized due times reproducible, and ``clock`` plus
+    :meth:`run_pending` let tests drive the queue without waiting.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        runner: WorkflowRunner = run_workflow,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        self.max_workers = max_workers
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._runner = runner
+        self._queue: list[ScheduledJob] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+    def submit(
+        self,
+        config: WorkflowConfig,
+        jitter_seconds: tuple[float, float] | None = None,
+    ) -> Future[WorkflowActionResult]:
+        """
+        Queue ``config`` to run after a random delay drawn from ``jitter_seconds``.
+
+        Without an explicit window the job uses the same range the delay
+        decorator would: 1 to ``config.delay_minutes`` minutes, or now when
+        delays are disabled.
+        """
+        if jitter_seconds is None:
+            delay_minutes_max = getattr(config, "delay_minutes", 0)
+            jitter_seconds = (
+                (60.0, delay_minutes_max * 60.0) if delay_minutes_max > 0 else (0.0, 0.0)
+            )
+        low, high = jitter_seconds
+        if low < 0 or high < low:
+            raise ValueError(f"Invalid jitter window: {jitter_seconds!r}")
+
+        job_config = copy.copy(config)
+        job_config.device = None
+        job_config.device_state = None
+        job_config.delay_minutes = 0
+        future: Future[WorkflowActionResult] = Future()
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Scheduler has been stopped.")
+            job = ScheduledJob(
+                due=self._clock() + self._random.uniform(low, high),
+                sequence=next(self._sequence),
+                config=job_config,
+                future=future,
+            )
+            heapq.heappush(self._queue, job)
+            self._condition.notify()
+        return future
+
+    def pending(self) -> int:
+        """Number of jobs still waiting for their due time."""
+        with self._condition:
+            return len(self._queue)
+
+    def next_due(self) -> float | None:
+        """Due time of the earliest queued job, on the scheduler clock."""
+        with self._condition:
+            return self._queue[0].due if self._queue else None
+
+    def run_pending(self) -> int:
+        """Dispatch every job whose due time has passed; returns how many were dispatched."""
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Scheduler has been stopped.")
+            return self._dispatch_due()
+
+    def start(self) -> None:
+        """Start the background dispatcher thread."""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._loop, name="workflow-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, wait: bool = True, cancel_pending: bool = True) -> None:
+        """
+        Stop dispatching and optionally wait for running jobs.
+
+        Queued jobs are cancelled, or with ``cancel_pending=False`` dispatched
+        at once regardless of their due time, so every future resolves.
+        """
+        with self._condition:
+            self._stopped = True
+            if cancel_pending:
+                for job in self._queue:
+                    job.future.cancel()
+                self._queue.clear()
+            else:
+                self._dispatch_due(now=math.inf)
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "WorkflowScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _loop(self) -> None:
+        with self._condition:
+            while not self._stopped:
+                self._dispatch_due()
+                timeout = self._queue[0].due - self._clock() if self._queue else None
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+
+    def _dispatch_due(self, now: float | None = None) -> int:
+        now = self._clock() if now is None else now
+        dispatched = 0
+        while self._queue and self._queue[0].due <= now:
+            job = heapq.heappop(self._queue)
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="workflow-scheduler"
+                )
+            self._executor.submit(self._execute, job)
+            dispatched += 1
+        return dispatched
+
+    def _execute(self, job: ScheduledJob) -> None:
+        try:
+            result = self._runner(job.config)
+        except Exception as exc:
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(result)
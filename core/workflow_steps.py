@@ -0,0 +1,341 @@
+"""Checkpointed, retried execution of an action broken into named steps."""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+from .events import ERROR, WARNING, emit
+from .workflow_types import WorkflowActionName, WorkflowActionResult, WorkflowName
+
+CHECKPOINT_DIR_ENV = "WORKFLOW_CHECKPOINT_DIR"
+
+
+def default_checkpoint_dir() -> Optional[str]:
+    """Checkpoint directory from ``WORKFLOW_CHECKPOINT_DIR``; in-memory when unset."""
+    return os.getenv(CHECKPOINT_DIR_ENV) or None
+
+
+class StepFailedError(RuntimeError):
+    """A step handler returned ``False``."""
+
+
+class StepPreconditionError(RuntimeError):
+    """The device was not in the state a step expects."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Too many recent failures on this device; the run was not attempted."""
+
+
+@dataclass(frozen=True)
+class WorkflowStep:
+    """
+    One resumable unit of an action.
+
+    ``precondition`` is checked before every attempt and tells a resumed run
+    whether the device is still where the last completed step left it.
+    Failed attempts are retried ``attempts - 1`` times with exponential
+    backoff starting at ``backoff`` seconds.
+    """
+
+    name: str
+    run: Callable[[], bool]
+    precondition: Optional[Callable[[], bool]] = None
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+
+
+class CheckpointStore:
+    """
+    Completed step names per (device, workflow, action).
+
+    With a ``directory`` each key is a small JSON file written atomically, so
+    checkpoints survive the process; without one they live in memory.
+    Checkpoints older than ``max_age`` seconds are ignored.
+    """
+
+    def __init__(
+        self, directory: Optional[str | os.PathLike[str]] = None, max_age: float = 6 * 3600
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.max_age = max_age
+        self._memory: dict[str, tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def completed(self, key: str) -> list[str]:
+        entry = self._read(key)
+        if entry is None:
+            return []
+        updated_at, steps = entry
+        if time.time() - updated_at > self.max_age:
+            return []
+        return steps
+
+    def mark(self, key: str, step: str) -> None:
+        steps = self.completed(key)
+        if step not in steps:
+            steps = steps + [step]
+        self._write(key, (time.time(), steps))
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.directory is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"checkpoint-{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _read(self, key: str) -> Optional[tuple[float, list[str]]]:
+        if self.directory is None:
+            with self._lock:
+                return self._memory.get(key)
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data["updated_at"], list(data["completed"])
+
+    def _write(self, key: str, entry: tuple[float, list[str]]) -> None:
+        if self.directory is None:
+            with self._lock:
+                self._memory[key] = entry
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"key": key, "updated_at": entry[0], "completed": entry[1]}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+class CircuitBreaker:
+    """
+    Per-device breaker: after ``failure_threshold`` consecutive failed runs the
+    device is skipped for ``reset_timeout`` seconds, then one trial run is
+    allowed. The trial re-arms the timeout, so other callers stay blocked
+    until it records success or failure (or for another ``reset_timeout`` if
+    it never reports). State is kept in ``directory`` when given so
+    cron-launched processes share it; updates are serialized with ``flock``.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str | os.PathLike[str]] = None,
+        failure_threshold: int = 3,
+        reset_timeout: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._memory: dict[str, dict[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def allow(self, device_id: str) -> bool:
+        with self._locked(device_id):
+            state = self._read(device_id)
+            if state["failures"] < self.failure_threshold:
+                return True
+            now = self._clock()
+            if now - state["opened_at"] < self.reset_timeout:
+                return False
+            # Half-open: this caller gets the trial run; everyone else waits for its outcome.
+            self._write(device_id, {"failures": state["failures"], "opened_at": now})
+            return True
+
+    def record_success(self, device_id: str) -> None:
+        with self._locked(device_id):
+            self._write(device_id, {"failures": 0, "opened_at": 0.0})
+
+    def record_failure(self, device_id: str) -> None:
+        with self._locked(device_id):
+            state = self._read(device_id)
+            failures = state["failures"] + 1
+            opened_at = self._clock() if failures >= self.failure_threshold else 0.0
+            self._write(device_id, {"failures": failures, "opened_at": opened_at})
+        if failures >= self.failure_threshold:
+            emit(
+                "breaker.open",
+                lambda: f"Circuit open for device '{device_id}' after {failures} failures; "
+                f"pausing for {self.reset_timeout:.0f}s.",
+                WARNING,
+                device_id=device_id,
+                failures=failures,
+            )
+
+    def _path(self, device_id: str) -> Path:
+        return self.directory / f"breaker-{device_id.replace(os.sep, '_')}.json"
+
+    @contextlib.contextmanager
+    def _locked(self, device_id: str) -> Iterator[None]:
+        """Serialize read-modify-write of one device's state across threads and processes."""
+        with self._lock:
+            if self.directory is None:
+                yield
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._path(device_id).with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _read(self, device_id: str) -> dict[str, float]:
+        if self.directory is None:
+            with self._lock:
+                return dict(self._memory.get(device_id, {"failures": 0, "opened_at": 0.0}))
+        try:
+            return json.loads(self._path(device_id).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"failures": 0, "opened_at": 0.0}
+
+    def _write(self, device_id: str, state: dict[str, float]) -> None:
+        if self.directory is None:
+            with self._lock:
+                self._memory[device_id] = state
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(device_id)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+_stores: dict[Optional[str], CheckpointStore] = {}
+_breakers: dict[Optional[str], CircuitBreaker] = {}
+_shared_lock = threading.Lock()
+
+
+def checkpoint_store(directory: Optional[str] = None) -> CheckpointStore:
+    """Process-wide checkpoint store for ``directory`` (in-memory when ``None``)."""
+    with _shared_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = CheckpointStore(directory)
+        return store
+
+
+def circuit_breaker(directory: Optional[str] = None) -> CircuitBreaker:
+    """Process-wide breaker for ``directory`` (in-memory when ``None``)."""
+    with _shared_lock:
+        breaker = _breakers.get(directory)
+        if breaker is None:
+            breaker = _breakers[directory] = CircuitBreaker(directory)
+        return breaker
+
+
+class StepRunner:
+    """Run declared steps, skipping those already checkpointed for this device."""
+
+    def __init__(
+        self,
+        workflow_name: WorkflowName,
+        action_name: WorkflowActionName,
+        device_id: str,
+        store: CheckpointStore,
+        breaker: CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.workflow_name = workflow_name
+        self.action_name = action_name
+        self.device_id = device_id
+        self.store = store
+        self.breaker = breaker
+        self._sleep = sleep
+        self.key = f"{device_id}|{workflow_name}|{action_name}"
+        # Number of leading steps skipped because a checkpoint covered them.
+        self.resumed = 0
+
+    def run(self, steps: Sequence[WorkflowStep]) -> list[WorkflowActionResult]:
+        """Run ``steps`` from the first incomplete one; stops at the first failure."""
+        if not self.breaker.allow(self.device_id):
+            raise CircuitOpenError(
+                f"Device '{self.device_id}' is failing repeatedly; skipping "
+                f"'{self.workflow_name}:{self.action_name}'."
+            )
+        start = self.resumed = self._resume_index(steps)
+        results: list[WorkflowActionResult] = []
+        for step in steps[start:]:
+            error = None
+            try:
+                self._attempt(step)
+            except Exception as exc:
+                error = exc
+                emit(
+                    "step.failed",
+                    lambda: f"Step '{self.workflow_name}:{step.name}' failed with exception: {exc!r}",
+                    ERROR,
+                    step=step.name,
+                )
+            results.append(
+                WorkflowActionResult(
+                    workflow_name=self.workflow_name,
+                    action_name=step.name,
+                    success=error is None,
+                    error=error,
+                    device_id=self.device_id,
+                )
+            )
+            if error is not None:
+                self.breaker.record_failure(self.device_id)
+                return results
+            self.store.mark(self.key, step.name)
+        self.store.clear(self.key)
+        self.breaker.record_success(self.device_id)
+        return results
+
+    def _resume_index(self, steps: Sequence[WorkflowStep]) -> int:
+        completed = set(self.store.completed(self.key))
+        index = 0
+        while index < len(steps) and steps[index].name in completed:
+            index += 1
+        if index == 0 or index == len(steps):
+            if index:
+                self.store.clear(self.key)
+            return 0
+        step = steps[index]
+        if step.precondition is not None and not step.precondition():
+            emit(
+                "step.stale",
+                lambda: f"Checkpoint for '{self.key}' is stale; starting from the first step.",
+            )
+            self.store.clear(self.key)
+            return 0
+        emit(
+            "step.resumed",
+            lambda: f"Resuming '{self.workflow_name}:{self.action_name}' at step '{step.name}'.",
+            step=step.name,
+        )
+        return index
+
+    def _attempt(self, step: WorkflowStep) -> None:
+        retrying = Retrying(
+            stop=stop_after_attempt(max(1, step.attempts)),
+            wait=wait_exponential(multiplier=step.backoff, max=step.max_backoff),
+            retry=retry_if_exception_type(Exception),
+            sleep=self._sleep,
+            reraise=True,
+        )
+        for attempt in retrying:
+            with attempt:
+                if step.precondition is not None and not step.precondition():
+                    raise StepPreconditionError(f"Precondition for step '{step.name}' not met.")
+                if not step.run():
+                    raise StepFailedError(f"Step '{step.name}' returned False.")
@@ -0,0 +1,142 @@
+"""Lightweight phase timing for Workflow.run and exporters for the results."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+from .workflow_types import WorkflowActionResult
+
+
+class _Span:
+    """Context manager that records elapsed monotonic time into a timer."""
+
+    __slots__ = ("_timings", "_name", "_started")
+
+    def __init__(self, timings: dict[str, float], name: str) -> None:
+        self._timings = timings
+        self._name = name
+        self._started = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = time.perf_counter() - self._started
+        self._timings[self._name] = self._timings.get(self._name, 0.0) + elapsed
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class WorkflowTimer:
+    """
+    Collects named phase durations (seconds) for one workflow run.
+
+    Spans with the same name accumulate. A disabled timer hands out a shared
+    no-op span, so instrumented code costs one attribute check and no
+    allocation. Workflows can add their own spans via ``config.timer``.
+    """
+
+    __slots__ = ("enabled", "timings")
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.timings: dict[str, float] = {}
+
+    def span(self, name: str, detail: object = None) -> _Span | _NullSpan:
+        """Time a block as ``name``, or ``name.detail`` (only joined when enabled)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self.timings, name if detail is None else f"{name}.{detail}")
+
+    def record(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+def to_json_line(result: WorkflowActionResult) -> str:
+    """Serialize a result and its timings as one JSON line (no trailing newline)."""
+    return json.dumps(
+        {
+            "timestamp": time.time(),
+            "workflow": result.workflow,
+            "action": str(result.action),
+            "device_id": result.device_id,
+            "success": result.success,
+            "error": repr(result.error) if result.error is not None else None,
+            "timings": result.timings,
+        },
+        sort_keys=True,
+    )
+
+
+def append_json_lines(
+    results: Iterable[WorkflowActionResult], path: str | os.PathLike[str]
+) -> None:
+    """Append one JSON line per result to ``path``."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("a", encoding="utf-8") as handle:
+        for result in results:
+            handle.write(to_json_line(result) + "\n")
+
+
+def write_prometheus_textfile(
+    results: Iterable[WorkflowActionResult], path: str | os.PathLike[str]
+) -> None:
+    """
+    Write phase durations in the node_exporter textfile-collector format.
+
+    Results sharing a workflow, action and device keep only the last one, as
+    duplicate series would make node_exporter reject the whole file. The file
+    is replaced atomically so the collector never reads a partial scrape.
+    """
+    latest: dict[str, WorkflowActionResult] = {}
+    for result in results:
+        labels = (
+            f'workflow="{_escape(result.workflow)}",action="{_escape(result.action)}",'
+            f'device="{_escape(result.device_id)}"'
+        )
+        latest.pop(labels, None)
+        latest[labels] = result
+
+    lines = [
+        "# HELP workflow_phase_seconds Duration of Workflow.run phases.",
+        "# TYPE workflow_phase_seconds gauge",
+    ]
+    success_lines = [
+        "# HELP workflow_run_success Whether the last workflow run succeeded.",
+        "# TYPE workflow_run_success gauge",
+    ]
+    for labels, result in latest.items():
+        for phase, seconds in sorted(result.timings.items()):
+            lines.append(
+                f'workflow_phase_seconds{{{labels},phase="{_escape(phase)}"}} {seconds:.6f}'
+            )
+        success_lines.append(f"workflow_run_success{{{labels}}} {int(result.success)}")
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_text("\n".join(lines + success_lines) + "\n", encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def _escape(value: object) -> str:
+    text = "" if value is None else str(value)
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, TypeAlias
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeAlias
 
 WorkflowName: TypeAlias = str
 
@@ -11,6 +11,8 @@ class WorkflowActionName(str):
     pass
 
 WorkflowActionHandler = Callable[[], bool]
+# Optional coroutine variant; ``Workflow.run_async`` awaits it on the event loop.
+AsyncWorkflowActionHandler = Callable[[], Awaitable[bool]]
 
 
 @dataclass(slots=True, init=False)
@@ -21,6 +23,9 @@ class WorkflowActionResult:
     action: WorkflowActionName | None
     success: bool
     error: Exception | None = None
+    device_id: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    steps: list["WorkflowActionResult"] = field(default_factory=list)
 
     def __init__(
         self,
@@ -28,8 +33,14 @@ class WorkflowActionResult:
         action_name: str,
         success: bool,
         error: Exception | None = None,
+        device_id: str | None = None,
+        timings: dict[str, float] | None = None,
+        steps: list["WorkflowActionResult"] | None = None,
     ) -> None:
         self.workflow = workflow_name
         self.action = WorkflowActionName(action_name.lower())
         self.success = success
         self.error = error
+        self.device_id = device_id
+        self.timings = timings if timings is not None else {}
+        self.steps = steps if steps is not None else []
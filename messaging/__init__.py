@@ -1,3 +1,4 @@
 from .messaging import send, load_config
+from .outbox import MessagingOutbox, send_async
 
-__all__ = ["send", "load_config"]
+__all__ = ["send", "load_config", "MessagingOutbox", "send_async"]
@@ -5,18 +5,38 @@ from __future__ import annotations
 
 import argparse
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from ..core.events import DEBUG, emit
 
 
 DEFAULT_CONFIG_RELATIVE = Path("config") / "messaging.json"
 
+# Twilio rejects message bodies longer than this.
+MAX_BODY_LENGTH = 1600
+
+_cache_lock = threading.Lock()
+# resolved config path -> (mtime_ns, parsed config)
+_config_cache: dict[Path, tuple[int, dict[str, str]]] = {}
+# (account_sid, auth_token, api_base_url) -> twilio Client
+_client_cache: dict[tuple[str, str, str | None], Any] = {}
+
 
 def load_config() -> dict[str, str]:
-    """Load Twilio messaging configuration from disk."""
+    """Load Twilio messaging configuration from disk.
+
+    The parsed file is cached and only re-read when its mtime changes.
+    """
     resolved_path = (Path.cwd() / DEFAULT_CONFIG_RELATIVE).resolve()
     try:
+        mtime_ns = resolved_path.stat().st_mtime_ns
+        with _cache_lock:
+            cached = _config_cache.get(resolved_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return dict(cached[1])
         config = json.loads(resolved_path.read_text(encoding="utf-8"))
     except (FileNotFoundError, json.JSONDecodeError) as exc:
         raise RuntimeError(f"Failed to load messaging config from {resolved_path}") from exc
@@ -28,15 +48,17 @@ def load_config() -> dict[str, str]:
             "Messaging config missing required field(s): " + ", ".join(missing)
         )
 
-    return config
+    with _cache_lock:
+        _config_cache[resolved_path] = (mtime_ns, config)
+    return dict(config)
 
 
-def send(
-    success: bool,
-    message: str,
-    e: Optional[Exception] = None,
-) -> None:
-    """Compose and send a Twilio message using the default config."""
+def get_client(config: dict[str, str]) -> Any:
+    """Return a shared Twilio client (and its pooled HTTP session) for ``config``.
+
+    An optional ``api_base_url`` config entry points the client at a different
+    endpoint, e.g. a proxy or a local stand-in during tests.
+    """
     try:
         from twilio.rest import Client
     except ModuleNotFoundError as exc:
@@ -44,25 +66,54 @@ def send(
             "twilio is required to send messages. Install it with `pip install twilio`."
         ) from exc
 
+    key = (config["account_sid"], config["auth_token"], config.get("api_base_url"))
+    with _cache_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            client = Client(config["account_sid"], config["auth_token"])
+            if config.get("api_base_url"):
+                client.api.base_url = config["api_base_url"]
+            _client_cache[key] = client
+    return client
+
+
+def compose(
+    success: bool,
+    message: str,
+    e: Optional[Exception] = None,
+) -> str:
+    """Build the message body for a workflow outcome."""
     text = "✅ " if success else "❌ "
     text += message
 
     if success is False and e is not None:
         text += "\n" + str(e)
+    return text
 
-    # Print current timestamp
-    _ = datetime.now()
 
+def deliver(text: str) -> None:
+    """Send an already composed message body using the default config."""
     config = load_config()
 
-    # Initialize Twilio client
-    client = Client(config["account_sid"], config["auth_token"])
-
     # Send message (⚠️ adjust from/to for WhatsApp or SMS)
-    client.messages.create(body=text, from_=config["from"], to=config["to"])
+    get_client(config).messages.create(body=text, from_=config["from"], to=config["to"])
+
+
+def send(
+    success: bool,
+    message: str,
+    e: Optional[Exception] = None,
+) -> None:
+    """Compose and send a Twilio message using the default config."""
+    text = compose(success, message, e)
+
+    # Print current timestamp
+    _ = datetime.now()
+
+    deliver(text)
 
-    print("SMS message sent")
-    print(f"Message content: {text}")
+    emit("notify.sent", "SMS message sent", success=success)
+    emit("notify.content", lambda: f"Message content: {text}", DEBUG)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+"""Background outbox that batches and delivers workflow notifications."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..core.events import WARNING, emit
+from .messaging import MAX_BODY_LENGTH, compose, deliver
+
+DEFAULT_SPOOL_RELATIVE = Path("config") / "messaging_outbox"
+
+
+class MessagingOutbox:
+    """
+    Queue messages and deliver them from a background thread.
+
+    ``enqueue`` returns immediately after appending the message to this
+    process's JSONL file under ``spool_dir``. Files left behind by processes
+    that died are adopted by the next outbox using the same directory, so
+    undelivered messages survive a crash. The sender waits
+    ``batch_window`` seconds after the first queued message and coalesces
+    everything that arrived meanwhile into a single digest (split to respect
+    Twilio's body limit). Failed deliveries stay queued and are retried after
+    ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str | os.PathLike[str] | None = None,
+        transport: Callable[[str], None] = deliver,
+        batch_window: float = 2.0,
+        max_batch: int = 20,
+        retry_seconds: float = 30.0,
+    ) -> None:
+        self.spool_dir = Path(spool_dir) if spool_dir else Path.cwd() / DEFAULT_SPOOL_RELATIVE
+        self.spool_path = self.spool_dir / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+        self._transport = transport
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.retry_seconds = retry_seconds
+        self._condition = threading.Condition()
+        self._pending: list[dict[str, str]] = self._adopt_orphaned_spools()
+        self._thread: threading.Thread | None = None
+        self._flush_requested = False
+        self._closed = False
+
+    def enqueue(
+        self,
+        success: bool,
+        message: str,
+        e: Optional[Exception] = None,
+    ) -> None:
+        """Queue a workflow outcome for delivery without blocking on the network."""
+        self.enqueue_text(compose(success, message, e))
+
+    def enqueue_text(self, text: str) -> None:
+        """Queue an already composed message body."""
+        entry = {"id": uuid.uuid4().hex, "text": text, "queued_at": f"{time.time():.3f}"}
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Messaging outbox is closed.")
+            self._pending.append(entry)
+            self._append_spool(entry)
+            self._condition.notify_all()
+        self.start()
+
+    def pending(self) -> int:
+        """Number of messages not yet delivered (including the batch being sent)."""
+        with self._condition:
+            return len(self._pending)
+
+    def start(self) -> None:
+        """Start the background sender if it is not already running."""
+        with self._condition:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="messaging-outbox", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Deliver queued messages now; returns ``True`` once the queue is empty."""
+        self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            try:
+                while self._pending:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                return True
+            finally:
+                self._flush_requested = False
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Flush, then stop the sender; undelivered messages remain in the spool."""
+        delivered = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return delivered
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Let a burst accumulate before sending, unless we are draining.
+                first_seen = time.monotonic()
+                while (
+                    not self._closed
+                    and not self._flush_requested
+                    and len(self._pending) < self.max_batch
+                    and time.monotonic() - first_seen < self.batch_window
+                ):
+                    remaining = self.batch_window - (time.monotonic() - first_seen)
+                    if not self._condition.wait(remaining):
+                        break
+                batch = list(self._pending[: self.max_batch])
+
+            try:
+                for body, count in self._digest([entry["text"] for entry in batch]):
+                    self._transport(body)
+                    # Forget each body's entries as soon as it is out, so a later
+                    # failure in the same batch never sends them twice.
+                    delivered, batch = batch[:count], batch[count:]
+                    self._mark_delivered(delivered)
+            except Exception as exc:
+                emit(
+                    "outbox.retry",
+                    lambda: f"Messaging outbox delivery failed, will retry: {exc!r}",
+                    WARNING,
+                    error_class=type(exc).__name__,
+                )
+                with self._condition:
+                    if self._closed:
+                        return
+                    self._condition.wait(self.retry_seconds)
+                continue
+
+    def _mark_delivered(self, entries: list[dict[str, str]]) -> None:
+        sent_ids = {entry["id"] for entry in entries}
+        with self._condition:
+            self._pending = [e for e in self._pending if e["id"] not in sent_ids]
+            self._rewrite_spool()
+            self._condition.notify_all()
+        emit(
+            "outbox.delivered",
+            lambda: f"Outbox delivered {len(entries)} message(s)",
+            messages=len(entries),
+        )
+
+    @staticmethod
+    def _digest(texts: list[str]) -> list[tuple[str, int]]:
+        """
+        Combine ``texts`` into as few bodies as fit within ``MAX_BODY_LENGTH``;
+        each body comes with how many of the texts, in order, it carries.
+        """
+        if len(texts) == 1:
+            return [(texts[0][:MAX_BODY_LENGTH], 1)]
+        header = f"📋 {len(texts)} workflow results"
+        bodies: list[tuple[str, int]] = []
+        current, count = header, 0
+        for text in texts:
+            text = text[: MAX_BODY_LENGTH - len(header) - 1]
+            if count and len(current) + 1 + len(text) > MAX_BODY_LENGTH:
+                bodies.append((current, count))
+                current, count = header, 0
+            current += "\n" + text
+            count += 1
+        bodies.append((current, count))
+        return bodies
+
+    def _adopt_orphaned_spools(self) -> list[dict[str, str]]:
+        """Take over spool files whose owning process is no longer running."""
+        pending: list[dict[str, str]] = []
+        if not self.spool_dir.is_dir():
+            return pending
+        for path in sorted(self.spool_dir.glob("*.jsonl")):
+            owner = path.name.split("-", 1)[0]
+            if not owner.isdigit() or _pid_alive(int(owner)):
+                continue
+            claimed = self.spool_path.with_name(f"{self.spool_path.name}.{path.stem}.adopt")
+            try:
+                # Atomic rename: only one concurrent outbox wins each orphan.
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            pending.extend(self._read_spool(claimed))
+            claimed.unlink(missing_ok=True)
+        if pending:
+            emit(
+                "outbox.recovered",
+                lambda: f"Outbox recovered {len(pending)} undelivered message(s)",
+                messages=len(pending),
+            )
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            self._write_spool(pending)
+        return pending
+
+    @staticmethod
+    def _read_spool(path: Path) -> list[dict[str, str]]:
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        pending: list[dict[str, str]] = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a truncated final line.
+                continue
+            if isinstance(entry, dict) and "id" in entry and "text" in entry:
+                pending.append(entry)
+        return pending
+
+    def _append_spool(self, entry: dict[str, str]) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        with self.spool_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _rewrite_spool(self) -> None:
+        if not self._pending:
+            self.spool_path.unlink(missing_ok=True)
+            return
+        self._write_spool(self._pending)
+
+    def _write_spool(self, entries: list[dict[str, str]]) -> None:
+        tmp_path = self.spool_path.with_name(f"{self.spool_path.name}.tmp")
+        tmp_path.write_text(
+            "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.spool_path)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+_default_outbox: MessagingOutbox | None = None
+_default_lock = threading.Lock()
+
+
+def default_outbox() -> MessagingOutbox:
+    """Process-wide outbox using the default spool path, flushed at exit."""
+    global _default_outbox
+    with _default_lock:
+        if _default_outbox is None:
+            _default_outbox = MessagingOutbox()
+            atexit.register(_default_outbox.close)
+        return _default_outbox
+
+
+def send_async(
+    success: bool,
+    message: str,
+    e: Optional[Exception] = None,
+) -> None:
+    """Queue a message on the default outbox and return immediately."""
+    default_outbox().enqueue(success, message, e)
@@ -0,0 +1,47 @@
+import importlib.util
+from pathlib import Path
+
+BENCH_PATH = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_orchestrator.py"
+
+
+def _load_bench():
+    spec = importlib.util.spec_from_file_location("bench_orchestrator", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    bench = _load_bench()
+    regressions = bench.compare(
+        {"fast_ms": 10.0, "slow_ms": 40.0, "new_ms": 1.0},
+        {"fast_ms": 9.0, "slow_ms": 20.0},
+        tolerance=1.5,
+        slack_ms=2.0,
+    )
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow_ms")
+
+
+def test_synthetic_factory_and_run_benchmarks_execute():
+    bench = _load_bench()
+    factory = bench.bench_factory(workflow_count=3, repeat=1)
+    assert set(factory) == {
+        "factory_discovery_cold_3_ms",
+        "factory_discovery_warm_3_ms",
+        "factory_lookup_3_ms",
+    }
+    assert "workflow_run_overhead_ms" in bench.bench_run(latency=0.0, repeat=1)
+
+
+def test_farm_load_runs_every_mode():
+    spec = importlib.util.spec_from_file_location(
+        "load_farm", BENCH_PATH.with_name("load_farm.py")
+    )
+    load = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(load)
+
+    for mode in load.MODES:
+        results = load.run_load(mode=mode, devices=20, workers=8, latency=0.0)
+        assert results["runs"] == 20 and results["failures"] == 0
+        assert results["rpcs"] > 20
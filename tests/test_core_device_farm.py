@@ -0,0 +1,149 @@
+import random
+
+import pytest
+
+import workflow_core.core.device_farm as farm_module
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.device_farm import (
+    LOCK_SCREEN_PACKAGE,
+    SimulatedDeviceError,
+    SimulatedFarm,
+    constant,
+    default_device_backend,
+    lognormal,
+)
+from workflow_core.core.device_selection import probe_device
+from workflow_core.core.ui_hierarchy import UIHierarchy
+from workflow_core.core.ui_snapshot import SnapshotStore, take_snapshot
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_fleet import WorkflowFleet
+from workflow_core.core.workflow_jobs import JobManifest, job_configs
+
+FIXTURE = (
+    '<?xml version="1.0" ?><hierarchy rotation="0">'
+    '<node class="android.widget.FrameLayout" package="com.example.app" text="" bounds="[0,0][10,10]">'
+    '<node class="android.widget.Button" package="com.example.app" text="Sign in" bounds="[0,0][5,5]" />'
+    "</node></hierarchy>"
+)
+
+
+def _config(farm: SimulatedFarm, **kwargs) -> WorkflowConfig:
+    return WorkflowConfig(
+        workflow="workflow.hello.world", action="login", device_backend=farm, **kwargs
+    )
+
+
+def test_farm_serials_and_offline_devices():
+    farm = SimulatedFarm(size=3, offline=["sim-0001"])
+
+    assert [device.serial for device in farm.device_list()] == ["sim-0000", "sim-0002"]
+    assert farm.connect("sim-0002").serial == "sim-0002"
+    with pytest.raises(SimulatedDeviceError):
+        farm.connect("sim-0001")
+    with pytest.raises(SimulatedDeviceError):
+        farm.adb_device("sim-0999")
+
+
+def test_lock_screen_is_unlocked_by_an_upward_swipe():
+    device = SimulatedFarm(size=1, screen_off_ratio=1.0).connect("sim-0000")
+
+    assert device.info["screenOn"] is False
+    device.screen_on()
+    assert device.info["currentPackageName"] == LOCK_SCREEN_PACKAGE
+    device.swipe(500, 400, 500, 1600)
+    assert device.locked
+    device.swipe(500, 1600, 500, 400, 0.2)
+    device.app_start("com.example.app")
+    assert device.app_current()["package"] == "com.example.app"
+    device.press("home")
+    assert device.info["currentPackageName"] == farm_module.LAUNCHER_PACKAGE
+
+
+def test_workflow_wakes_and_unlocks_a_simulated_device(monkeypatch):
+    sent = []
+    monkeypatch.setattr(workflow_module, "send", lambda *args: sent.append(args))
+    farm = SimulatedFarm(size=2, screen_off_ratio=1.0, seed=1)
+
+    with Workflow(_config(farm, device_id="sim-0001")) as workflow:
+        result = workflow.run()
+
+    device = farm.devices["sim-0001"]
+    assert result.success
+    assert device.is_screen_on and not device.locked
+    assert farm.stats()["swipe"] == 1
+    assert len(sent) == 1
+
+
+def test_latency_and_failure_injection_are_seeded():
+    rng = random.Random(3)
+    samples = [lognormal(0.01)(rng) for _ in range(500)]
+    assert 0.008 < sorted(samples)[250] < 0.012
+    assert constant(0.5)(rng) == 0.5
+
+    def failures(seed: int) -> list[bool]:
+        device = SimulatedFarm(size=1, failure_rate=0.3, seed=seed).connect("sim-0000")
+        outcome = []
+        for _ in range(50):
+            try:
+                device.click(1, 1)
+                outcome.append(False)
+            except SimulatedDeviceError:
+                outcome.append(True)
+        return outcome
+
+    assert failures(7) == failures(7)
+    assert 5 < sum(failures(7)) < 30
+    with pytest.raises(ValueError):
+        SimulatedFarm(failure_rate=1.5)
+
+
+def test_fixtures_serve_the_foreground_package_and_snapshots(tmp_path):
+    store = SnapshotStore(tmp_path / "ui_snapshots")
+    store.save("real-device", "login", FIXTURE.encode(), b"png")
+    fixtures = SimulatedFarm.load_fixtures(tmp_path / "ui_snapshots")
+    assert fixtures == {"com.example.app": FIXTURE}
+
+    farm = SimulatedFarm(size=1, fixtures=fixtures)
+    device = farm.connect("sim-0000")
+    assert UIHierarchy.capture(device).find(text="Sign in") == []
+    device.app_start("com.example.app")
+    assert UIHierarchy.capture(device).first(text="Sign in") is not None
+
+    snapshot = take_snapshot(farm.adb_device("sim-0000"), store, "sim")
+    assert "Sign in" in open(snapshot.hierarchy_path, encoding="utf-8").read()
+    probe = probe_device(device)
+    assert probe.battery_level == device.battery and probe.screen_on is True
+
+
+def test_fleet_runs_every_simulated_device_and_reports_connect_failures(monkeypatch):
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    farm = SimulatedFarm(size=40, latency=constant(0.001), locked_ratio=0.5)
+    farm.connect_failure_rate = 1.0
+    failed = WorkflowFleet(_config(farm), device_ids=["sim-0000"]).run()
+    assert not failed[0].success and isinstance(failed[0].error, SimulatedDeviceError)
+
+    farm.connect_failure_rate = 0.0
+    results = WorkflowFleet(_config(farm), max_workers=16).run()
+
+    assert [result.device_id for result in results] == sorted(farm.devices)
+    assert all(result.success for result in results)
+    assert not any(device.locked for device in farm.devices.values())
+
+
+def test_environment_backend_is_shared_and_used_by_jobs(monkeypatch):
+    monkeypatch.setenv(farm_module.DEVICE_BACKEND_ENV, "sim:5?latency=0.001&locked=0.2&seed=4")
+    farm = default_device_backend()
+
+    assert farm is default_device_backend()
+    assert len(farm.device_list()) == 5
+    manifest = JobManifest.from_dict(
+        {"jobs": [{"workflow": "workflow.hello.world", "action": "login", "devices": "all"}]}
+    )
+    assert [config.device_id for config in job_configs(manifest.jobs[0])] == sorted(farm.devices)
+
+    monkeypatch.setenv(farm_module.DEVICE_BACKEND_ENV, "adb")
+    assert default_device_backend() is None
+    monkeypatch.setenv(farm_module.DEVICE_BACKEND_ENV, "sim:5?bogus=1")
+    with pytest.raises(ValueError, match="bogus"):
+        default_device_backend()
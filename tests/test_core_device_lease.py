@@ -0,0 +1,127 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.device_lease import DeviceLeaseManager
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class DummyAdbDevice:
+    def __init__(self, serial: str) -> None:
+        self.serial = serial
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    manager = DeviceLeaseManager(tmp_path)
+    lease = manager.acquire("emulator-5554")
+
+    assert manager.is_leased("emulator-5554")
+    assert manager.try_acquire("emulator-5554") is None
+    with pytest.raises(TimeoutError):
+        manager.acquire("emulator-5554", timeout=0.05)
+
+    lease.release()
+    assert not manager.is_leased("emulator-5554")
+    with manager.try_acquire("emulator-5554") as again:
+        assert again.active
+
+
+def test_waiters_are_served_in_arrival_order(tmp_path):
+    manager = DeviceLeaseManager(tmp_path, poll_interval=0.005)
+    holder = manager.acquire("serial-1")
+    order = []
+
+    def wait(name: str) -> None:
+        with manager.acquire("serial-1", timeout=5):
+            order.append(name)
+
+    threads = []
+    for name in ("first", "second", "third"):
+        thread = threading.Thread(target=wait, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while len(manager._live_tickets("serial-1")) < len(threads):
+            time.sleep(0.001)
+
+    holder.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["first", "second", "third"]
+
+
+def test_acquire_any_waiters_keep_their_place_in_line(tmp_path):
+    manager = DeviceLeaseManager(tmp_path, poll_interval=0.005)
+    holders = [manager.acquire("serial-1"), manager.acquire("serial-2")]
+    order = []
+
+    def wait_any(name: str) -> None:
+        with manager.acquire_any(["serial-1", "serial-2"], timeout=5) as lease:
+            order.append((name, lease.serial))
+
+    def wait_one(name: str) -> None:
+        with manager.acquire("serial-1", timeout=5) as lease:
+            order.append((name, lease.serial))
+
+    threads = []
+    for target, name in ((wait_any, "any"), (wait_one, "one")):
+        thread = threading.Thread(target=target, args=(name,))
+        thread.start()
+        threads.append(thread)
+        while len(manager._live_tickets("serial-1")) < len(threads):
+            time.sleep(0.001)
+
+    holders[0].release()
+    threads[0].join(timeout=5)
+    assert order == [("any", "serial-1")]
+    holders[1].release()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == [("any", "serial-1"), ("one", "serial-1")]
+    assert manager._live_tickets("serial-2") == []
+
+
+def test_lease_and_ticket_of_dead_process_are_reclaimed(tmp_path):
+    code = (
+        "import os, sys\n"
+        "from workflow_core.core.device_lease import DeviceLeaseManager\n"
+        "manager = DeviceLeaseManager(sys.argv[1])\n"
+        "manager.acquire('serial-1')\n"
+        "manager._enqueue('serial-2')\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path)],
+        check=True,
+        env={"PYTHONPATH": ":".join(p for p in sys.path if p)},
+    )
+    manager = DeviceLeaseManager(tmp_path)
+
+    assert len(list((tmp_path / "serial-2.queue").iterdir())) == 1
+    assert manager.try_acquire("serial-1") is not None
+    assert manager.acquire("serial-2", timeout=1) is not None
+    assert list((tmp_path / "serial-2.queue").iterdir()) == []
+
+
+def test_workflow_leases_a_free_device(monkeypatch, tmp_path):
+    devices = [DummyAdbDevice("serial-one"), DummyAdbDevice("serial-two")]
+    monkeypatch.setattr(workflow_module.adbutils.adb, "device_list", lambda: devices)
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: object())
+    busy = DeviceLeaseManager(tmp_path).acquire("serial-one")
+
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        lease_dir=str(tmp_path),
+    )
+    with Workflow(config) as workflow:
+        assert workflow.device_id == "serial-two"
+        assert DeviceLeaseManager(tmp_path).is_leased("serial-two")
+
+    assert not DeviceLeaseManager(tmp_path).is_leased("serial-two")
+    busy.release()
@@ -0,0 +1,155 @@
+import socket
+import stat
+import threading
+import time
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from workflow_core.core import events
+from workflow_core.core.device_pool import DevicePool
+from workflow_core.core.events import INFO, OFF, WARNING, EventLog
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_ipc import WorkflowRunServer, portable_config, submit_run
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+class FakeDevice:
+    def __init__(self, serial: str) -> None:
+        self.serial = serial
+        self.healthy = True
+
+    @property
+    def info(self) -> dict:
+        if not self.healthy:
+            raise ConnectionError("uiautomator server gone")
+        return {"screenOn": True}
+
+
+def test_pool_connects_once_per_serial_under_concurrency():
+    connects = []
+    lock = threading.Lock()
+
+    def connect(serial: str) -> FakeDevice:
+        with lock:
+            connects.append(serial)
+        return FakeDevice(serial)
+
+    pool = DevicePool(connect=connect)
+    devices = []
+    threads = [threading.Thread(target=lambda: devices.append(pool.get("serial-1"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert connects == ["serial-1"]
+    assert all(device is devices[0] for device in devices)
+
+
+def test_health_check_drops_dead_sessions_and_reconnects():
+    pool = DevicePool(connect=FakeDevice)
+    first = pool.get("serial-1")
+    pool.get("serial-2")
+    first.healthy = False
+
+    assert pool.check_health() == ["serial-1"]
+    assert pool.serials() == ["serial-2"]
+    assert pool.get("serial-1") is not first
+
+
+def test_health_loop_only_probes_idle_sessions():
+    now = [0.0]
+    pool = DevicePool(connect=FakeDevice, health_interval=30.0, clock=lambda: now[0])
+    idle = pool.get("serial-1")
+    now[0] = 25.0
+    busy = pool.get("serial-2")
+    idle.healthy = busy.healthy = False
+
+    now[0] = 40.0
+    assert pool.check_health(idle_for=pool.health_interval) == ["serial-1"]
+    assert pool.serials() == ["serial-2"]
+
+
+def test_ipc_roundtrip_strips_live_handles(tmp_path):
+    received = []
+
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        received.append(config)
+        return WorkflowActionResult(
+            workflow_name=config.workflow_name,
+            action_name=config.action_name,
+            success=True,
+            device_id=config.device_id,
+        )
+
+    server = WorkflowRunServer(runner, address=str(tmp_path / "daemon.sock"), authkey=b"test")
+    thread = server.start()
+    try:
+        config = WorkflowConfig(
+            workflow="workflow.hello.world",
+            action=WorkflowActionName("login"),
+            device_id="serial-1",
+            device_pool=DevicePool(connect=FakeDevice),
+        )
+        result = submit_run(config, address=server.address, authkey=b"test")
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+    assert result.success and result.device_id == "serial-1"
+    assert received[0].device_pool is None
+    assert portable_config(config).device_pool is None and config.device_pool is not None
+    assert not thread.is_alive()
+
+
+def test_run_server_socket_is_owner_only_and_never_stolen(tmp_path):
+    address = tmp_path / "private" / "daemon.sock"
+    runner = lambda config: WorkflowActionResult(config.workflow_name, config.action_name, True)
+    server = WorkflowRunServer(runner, address=str(address))
+    thread = server.start()
+    try:
+        assert stat.S_IMODE(address.stat().st_mode) == 0o600
+        assert stat.S_IMODE(address.parent.stat().st_mode) == 0o700
+        rival = WorkflowRunServer(runner, address=str(address))
+        with pytest.raises(RuntimeError, match="already listening"):
+            rival.start()
+        rival.shutdown()
+        assert address.exists()
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+    # A socket left behind by a dead daemon is replaced.
+    with socket.socket(socket.AF_UNIX) as stale:
+        stale.bind(str(address))
+    server = WorkflowRunServer(runner, address=str(address))
+    thread = server.start()
+    server.shutdown()
+    thread.join(timeout=5)
+    assert not address.exists()
+
+
+def test_run_server_reports_rejected_clients_as_events(tmp_path):
+    log = EventLog(level=INFO, console_level=OFF)
+    previous = events.set_event_log(log)
+    address = tmp_path / "daemon.sock"
+    runner = lambda config: WorkflowActionResult(config.workflow_name, config.action_name, True)
+    server = WorkflowRunServer(runner, address=str(address), authkey=b"secret")
+    thread = server.start()
+    try:
+        config = WorkflowConfig(workflow="workflow.hello.world", action=WorkflowActionName("login"))
+        with pytest.raises(AuthenticationError):
+            submit_run(config, address=str(address), authkey=b"wrong")
+        for _ in range(100):
+            if any(event.kind == "daemon.rejected" for event in log.recent()):
+                break
+            time.sleep(0.01)
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+        events.set_event_log(previous)
+
+    levels = {event.kind: event.level for event in log.recent()}
+    assert levels["daemon.listening"] == INFO
+    assert levels["daemon.rejected"] == WARNING
@@ -0,0 +1,107 @@
+import time
+
+import workflow_core.core.device_selection as selection_module
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.device_lease import DeviceLeaseManager
+from workflow_core.core.device_selection import DeviceSelector, probe_device
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class FakeAdbDevice:
+    def __init__(self, serial: str, level: int = 80, temperature: int = 300, delay: float = 0.0):
+        self.serial = serial
+        self.level = level
+        self.temperature = temperature
+        self.delay = delay
+        self.calls = 0
+
+    def shell(self, command: str) -> str:
+        self.calls += 1
+        time.sleep(self.delay)
+        if command == "dumpsys battery":
+            return f"Current Battery Service state:\n  level: {self.level}\n  temperature: {self.temperature}\n"
+        return "Power Manager State:\n  mWakefulness=Asleep\n"
+
+
+def test_probe_parses_dumpsys_output():
+    probe = probe_device(FakeAdbDevice("serial-1", level=42, temperature=371))
+
+    assert (probe.battery_level, probe.temperature, probe.screen_on) == (42, 37.1, False)
+
+
+def test_probes_run_concurrently_and_are_cached():
+    devices = [FakeAdbDevice(f"serial-{i}", delay=0.05) for i in range(8)]
+    now = [0.0]
+    selector = DeviceSelector(clock=lambda: now[0])
+
+    started = time.perf_counter()
+    selector.probes(devices)
+    assert time.perf_counter() - started < 0.4
+
+    selector.probes(devices)
+    assert all(device.calls == 2 for device in devices)
+    now[0] = 10.0
+    selector.probes(devices)
+    assert all(device.calls == 4 for device in devices)
+
+
+def test_lru_spreads_work_and_sinks_unhealthy_devices():
+    devices = [
+        FakeAdbDevice("hot", temperature=480),
+        FakeAdbDevice("a"),
+        FakeAdbDevice("b"),
+    ]
+    selector = DeviceSelector("lru")
+
+    picks = [selector.select("wf", devices) for _ in range(3)]
+
+    assert picks == ["a", "b", "a"]
+
+
+def test_least_loaded_and_sticky_policies():
+    devices = [FakeAdbDevice("warm", level=90, temperature=400), FakeAdbDevice("cool", level=60)]
+    assert DeviceSelector("least-loaded").ranked(devices=devices) == ["cool", "warm"]
+
+    sticky = DeviceSelector("sticky")
+    first = sticky.select("wf.one", devices)
+    assert sticky.select("wf.one", devices) == first
+    assert sticky.select("wf.two", devices) != first
+
+
+class DeadAdbDevice(FakeAdbDevice):
+    def shell(self, command: str) -> str:
+        raise ConnectionError("device offline")
+
+
+def test_devices_that_fail_their_probe_are_picked_last():
+    devices = [DeadAdbDevice("dead"), FakeAdbDevice("good", level=80, temperature=300)]
+
+    assert probe_device(devices[0]).reachable is False
+    for policy in ("lru", "least-loaded"):
+        assert DeviceSelector(policy).ranked(devices=devices) == ["good", "dead"]
+    assert DeviceSelector("least-loaded").ranked(devices=[DeadAdbDevice("only")]) == ["only"]
+
+
+def test_leased_devices_are_ranked_last(tmp_path):
+    devices = [FakeAdbDevice("a"), FakeAdbDevice("b")]
+    lease = DeviceLeaseManager(tmp_path).acquire("a")
+    try:
+        assert DeviceSelector(lease_dir=str(tmp_path)).ranked(devices=devices) == ["b", "a"]
+    finally:
+        lease.release()
+
+
+def test_workflow_uses_selection_policy(monkeypatch):
+    devices = [FakeAdbDevice("serial-one"), FakeAdbDevice("serial-two", level=5)]
+    monkeypatch.setattr(selection_module, "_selectors", {})
+    monkeypatch.setattr(selection_module.adbutils.adb, "device_list", lambda: devices)
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: object())
+
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        selection_policy="least-loaded",
+    )
+    assert Workflow(config).device_id == "serial-one"
@@ -0,0 +1,85 @@
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.device_state import DeviceStateCache
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class CountingDevice:
+    def __init__(self, screen_on: bool = True, package: str = "com.example") -> None:
+        self.info_calls = 0
+        self.screen = screen_on
+        self.package = package
+        self.swipes = 0
+
+    @property
+    def info(self) -> dict:
+        self.info_calls += 1
+        return {
+            "screenOn": self.screen,
+            "currentPackageName": self.package,
+            "displayWidth": 1080,
+            "displayHeight": 2400,
+        }
+
+    def screen_on(self) -> None:
+        self.screen = True
+
+    def swipe(self, *args, **kwargs) -> None:
+        self.swipes += 1
+        self.package = "com.android.launcher"
+
+    @property
+    def serial(self) -> str:
+        return "serial-one"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_snapshot_is_shared_within_ttl():
+    device = CountingDevice()
+    clock = FakeClock()
+    cache = DeviceStateCache(device, ttl_seconds=1.0, clock=clock)
+
+    state = cache.snapshot()
+    assert cache.snapshot() is state
+    assert state.window_size == (1080, 2400)
+    assert device.info_calls == 1
+
+    clock.now = 1.5
+    cache.snapshot()
+    assert device.info_calls == 2
+
+
+def test_mutating_calls_invalidate_and_others_pass_through():
+    device = CountingDevice(screen_on=False)
+    cache = DeviceStateCache(device, ttl_seconds=60)
+
+    assert cache.snapshot().screen_on is False
+    cache.screen_on()
+    assert cache.snapshot().screen_on is True
+    assert device.info_calls == 2
+    assert cache.serial == "serial-one"
+
+
+def test_wake_device_reads_info_once_when_already_awake(monkeypatch):
+    device = CountingDevice(screen_on=True)
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: device)
+
+    workflow = Workflow(
+        WorkflowConfig(
+            workflow="workflow.hello.world",
+            action=WorkflowActionName("login"),
+            device_id="serial-one",
+        )
+    )
+    workflow._wake_device()
+
+    assert device.info_calls == 1
+    assert workflow.config.device_state is workflow.device_state
@@ -0,0 +1,136 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core import events
+from workflow_core.core.device_pool import DevicePool
+from workflow_core.core.events import DEBUG, ERROR, INFO, OFF, WARNING, EventLog, bind
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_async import run_blocking
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+from workflow_core.messaging.outbox import MessagingOutbox
+
+
+@pytest.fixture
+def log():
+    log = EventLog(capacity=50, level=INFO, console_level=WARNING, stream=io.StringIO())
+    previous = events.set_event_log(log)
+    yield log
+    events.set_event_log(previous)
+
+
+def test_levels_filter_and_ring_is_bounded():
+    console = io.StringIO()
+    log = EventLog(capacity=3, level=INFO, console_level=WARNING, stream=console)
+    log.emit("noise", "debug detail", DEBUG)
+    for index in range(5):
+        log.emit("tick", f"tick {index}", INFO, index=index)
+    log.emit("trouble", "something broke", ERROR)
+
+    assert [event.message for event in log.recent()] == ["tick 3", "tick 4", "something broke"]
+    assert log.recent()[0].fields == {"index": 3}
+    assert console.getvalue() == "something broke\n"
+
+
+def test_callable_messages_are_only_built_for_recorded_events():
+    built = []
+
+    def message(text: str):
+        return lambda: built.append(text) or text
+
+    log = EventLog(level=INFO, console_level=OFF)
+    log.emit("noise", message("debug detail"), DEBUG)
+    previous = events.set_event_log(log)
+    try:
+        events.emit("noise", message("also dropped"), DEBUG)
+        events.emit("tick", message("kept"), INFO)
+    finally:
+        events.set_event_log(previous)
+
+    assert built == ["kept"]
+    assert [event.message for event in log.recent()] == ["kept"]
+
+
+def test_bound_identity_follows_run_blocking(log):
+    async def main() -> None:
+        with bind("workflow.hello.world", "login", "serial-1"):
+            await run_blocking(events.emit, "device.call", "clicked")
+
+    asyncio.run(main())
+    events.emit("outside", "no run")
+
+    inside, outside = log.recent()
+    assert (inside.workflow, inside.action, inside.device_id) == (
+        "workflow.hello.world",
+        "login",
+        "serial-1",
+    )
+    assert outside.workflow is None
+
+
+def test_background_flusher_appends_json_lines(tmp_path):
+    path = tmp_path / "events" / "run.jsonl"
+    log = EventLog(path=path, console_level=events.OFF, flush_interval=60)
+    log.emit("run.started", "Executing 'a:b'.", workflow="a", action="b", attempt=2)
+    assert not path.exists()
+
+    log.close()
+
+    (line,) = path.read_text().splitlines()
+    record = json.loads(line)
+    assert record["kind"] == "run.started"
+    assert (record["level"], record["workflow"], record["attempt"]) == ("info", "a", 2)
+
+
+def test_failed_run_dumps_its_events(monkeypatch, capsys, log):
+    class AwakeDevice:
+        info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    class BrokenWorkflow:
+        def __init__(self, config):
+            pass
+
+        def run(self, action):
+            raise RuntimeError("login button missing")
+
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: AwakeDevice())
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    monkeypatch.setattr(workflow_module.WorkflowFactory, "get_workflow", BrokenWorkflow)
+    events.emit("earlier", "from a previous run", device_id="serial-1", workflow="workflow.broken")
+    config = WorkflowConfig(
+        workflow="workflow.broken", action=WorkflowActionName("login"), device_id="serial-1"
+    )
+
+    result = Workflow(config).run()
+
+    assert not result.success
+    dumped = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [record["kind"] for record in dumped] == ["run.started", "run.failed"]
+    assert dumped[-1]["error_class"] == "RuntimeError"
+    assert dumped[-1]["device_id"] == "serial-1"
+
+
+def test_device_pool_and_outbox_report_through_events(capsys, log, tmp_path):
+    log.level = DEBUG
+
+    class Session:
+        @property
+        def info(self):
+            raise ConnectionError("adb gone")
+
+    pool = DevicePool(connect=lambda serial: Session())
+    pool.get("serial-1")
+    pool.check_health()
+    outbox = MessagingOutbox(tmp_path, transport=lambda body: None, batch_window=0)
+    outbox.enqueue_text("done")
+    outbox.close()
+
+    kinds = {(event.kind, event.level, event.device_id) for event in log.recent()}
+    assert ("pool.connecting", DEBUG, "serial-1") in kinds
+    assert ("pool.unhealthy", WARNING, "serial-1") in kinds
+    assert "outbox.delivered" in {event.kind for event in log.recent()}
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,126 @@
+import pytest
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.gesture_macro import (
+    GestureMacro,
+    GestureRecorder,
+    MacroCheckpointError,
+    MacroPlayer,
+    compile_segments,
+    mark_checkpoint,
+)
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_factory import WorkflowFactory
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class FakeDevice:
+    info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.package = "com.example"
+
+    def click(self, x, y):
+        self.calls.append(("click", x, y))
+
+    def swipe(self, fx, fy, tx, ty, duration=None, steps=None):
+        self.calls.append(("swipe", fx, fy, tx, ty, duration))
+
+    def press(self, key):
+        self.calls.append(("press", key))
+
+    def window_size(self):
+        return (1080, 2400)
+
+    def app_current(self):
+        return {"package": self.package}
+
+    def shell(self, script, timeout=60):
+        self.calls.append(("shell", script))
+
+
+def test_recorder_forwards_gestures_and_records_pauses(tmp_path):
+    now = [0.0]
+    device = FakeDevice()
+    recorder = GestureRecorder(device, clock=lambda: now[0])
+
+    recorder.click(100, 200)
+    now[0] += 0.5
+    recorder.swipe(0.5, 0.8, 0.5, 0.2, 0.2)
+    now[0] += 0.01
+    recorder.press("home")
+    mark_checkpoint(recorder, "home", package="com.android.launcher")
+    mark_checkpoint(device, "ignored")
+
+    assert [call[0] for call in device.calls] == ["click", "swipe", "press"]
+    assert [step["op"] for step in recorder.macro.steps] == ["tap", "wait", "swipe", "key", "checkpoint"]
+    recorder.macro.save(tmp_path / "macro.json")
+    assert GestureMacro.load(tmp_path / "macro.json") == recorder.macro
+
+
+def test_segments_compile_to_single_input_scripts():
+    macro = GestureMacro(
+        steps=[
+            {"op": "tap", "x": 100, "y": 200},
+            {"op": "wait", "seconds": 0.5},
+            {"op": "swipe", "x": 0.5, "y": 0.8, "x2": 0.5, "y2": 0.2, "duration": 0.2},
+            {"op": "checkpoint", "name": "list", "package": "com.example", "text": None},
+            {"op": "key", "key": "back"},
+            {"op": "text", "text": "hi there"},
+        ]
+    )
+
+    segments = compile_segments(macro, window_size=(1080, 2400), speed=2.0)
+
+    assert segments[0][0] == "input tap 100 200; sleep 0.250; input swipe 540 1920 540 480 200"
+    assert segments[0][1]["name"] == "list"
+    assert segments[1] == ("input keyevent KEYCODE_BACK; input text hi%sthere", None)
+
+
+def test_player_batches_segments_and_verifies_checkpoints():
+    device = FakeDevice()
+    macro = GestureMacro(
+        steps=[
+            {"op": "tap", "x": 1, "y": 2},
+            {"op": "tap", "x": 3, "y": 4},
+            {"op": "checkpoint", "name": "open", "package": "com.example", "text": None, "timeout": 0.1},
+            {"op": "key", "key": "home"},
+        ]
+    )
+
+    assert MacroPlayer(device).play(macro) == 2
+    assert device.calls[0] == ("shell", "input tap 1 2; input tap 3 4")
+
+    device.package = "com.other"
+    with pytest.raises(MacroCheckpointError):
+        MacroPlayer(device).play(macro)
+
+
+def test_workflow_records_macro_from_live_run(monkeypatch, tmp_path):
+    device = FakeDevice()
+
+    class TappingWorkflow:
+        def __init__(self, config):
+            self.config = config
+
+        def run(self, action):
+            self.config.device.click(10, 20)
+            self.config.device.press("back")
+            return True
+
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: device)
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    monkeypatch.setattr(WorkflowFactory, "get_workflow", lambda config: TappingWorkflow(config))
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id="serial-1",
+        record_macro=str(tmp_path / "login.json"),
+    )
+
+    assert Workflow(config).run().success
+    assert config.device is device
+    steps = GestureMacro.load(tmp_path / "login.json").steps
+    assert [step["op"] for step in steps] == ["tap", "key"]
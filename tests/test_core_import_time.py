@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+# Modules that must only load once a Workflow actually talks to a device.
+HEAVY_MODULES = ("uiautomator2", "adbutils", "twilio")
+
+# Generous ceiling for the lightweight import path; the eager package used to
+# take well over 200ms because it imported uiautomator2 at load time.
+IMPORT_BUDGET_MS = float(os.getenv("WORKFLOW_IMPORT_BUDGET_MS", "150"))
+
+LIGHTWEIGHT_IMPORT = (
+    "import sys, workflow_core\n"
+    "from workflow_core import WorkflowActionName, WorkflowConfig, messaging\n"
+    "from workflow_core.core import WorkflowActionResult\n"
+    "print(','.join(m for m in {heavy!r} if m in sys.modules))\n"
+)
+
+
+def _run_import(code: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative_us(importtime_output: str, module: str) -> int:
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+
+def test_lightweight_imports_skip_device_dependencies():
+    result = _run_import(LIGHTWEIGHT_IMPORT.format(heavy=HEAVY_MODULES))
+    assert result.stdout.strip() == ""
+
+
+def test_package_import_time_within_budget():
+    result = _run_import("import workflow_core")
+    elapsed_ms = _cumulative_us(result.stderr, "workflow_core") / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"workflow_core import took {elapsed_ms:.1f}ms"
+
+
+def test_lazy_attributes_resolve_on_access():
+    result = _run_import(
+        "import sys, workflow_core\n"
+        "workflow_core.Workflow\n"
+        "print('uiautomator2' in sys.modules)\n"
+    )
+    assert result.stdout.strip() == "True"
@@ -0,0 +1,125 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import workflow_core.core.run_history as history_module
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.device_selection import DeviceProbe, ReliabilityPolicy, StickyPolicy
+from workflow_core.core.run_history import RunHistory
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+def _result(success: bool, device_id: str = "serial-a", action: str = "login", total: float = 1.0):
+    return WorkflowActionResult(
+        "workflow.hello.world",
+        action,
+        success,
+        error=None if success else TimeoutError("no login button"),
+        device_id=device_id,
+        timings={"total": total},
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = RunHistory(tmp_path / "history.sqlite3")
+    yield history
+    history.close()
+
+
+def test_attempts_count_consecutive_failures(history):
+    now = time.time()
+    attempts = [
+        history.record(_result(success), finished_at=now + index)
+        for index, success in enumerate([False, False, True, False])
+    ]
+    history.record(_result(False, device_id="serial-b"), finished_at=now)
+
+    assert attempts == [1, 2, 3, 1]
+    latest = history.recent(limit=1, workflow="workflow.hello.world")[0]
+    assert (latest.attempt, latest.error_class) == (1, "TimeoutError")
+    assert latest.error == "no login button"
+
+
+def test_summary_queries(history):
+    now = time.time()
+    for index in range(20):
+        history.record(_result(True, total=float(index + 1)), finished_at=now - index)
+    history.record(_result(False, device_id="serial-b"), finished_at=now)
+    history.record(_result(True, device_id="serial-b"), finished_at=now - 7200)
+
+    assert history.last_success("workflow.hello.world", "serial-b") == now - 7200
+    assert history.last_successes() == {
+        ("workflow.hello.world", "serial-a"): now,
+        ("workflow.hello.world", "serial-b"): now - 7200,
+    }
+    assert history.failure_rate(1) == pytest.approx(1 / 21)
+    assert history.failure_rate(1, device_id="serial-b") == 1.0
+    assert history.failure_rate(1, workflow="workflow.other") is None
+    assert history.failure_rates_by_device(3) == {"serial-a": 0.0, "serial-b": 0.5}
+    assert history.duration_percentiles(1) == {("workflow.hello.world", "login"): 19.0}
+
+
+def test_compaction_drops_old_runs(history):
+    history.record(_result(True), finished_at=time.time() - 40 * 86400)
+    history.record(_result(True))
+
+    assert history.compact() == 1
+    assert len(history.recent()) == 1
+
+
+def test_workflow_run_is_recorded_and_feeds_selection(monkeypatch, tmp_path):
+    class AwakeDevice:
+        info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: AwakeDevice())
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    path = str(tmp_path / "runs.sqlite3")
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id="serial-a",
+        history_path=path,
+    )
+
+    assert Workflow(config).run().success
+    history = RunHistory(path)
+    history.record(_result(False, device_id="serial-b"))
+    (record,) = [run for run in history.recent() if run.device_id == "serial-a"]
+    assert record.success and record.duration == record.timings["total"]
+
+    probes = [DeviceProbe("serial-b", last_used=0.0), DeviceProbe("serial-a", last_used=1.0)]
+    ranked = ReliabilityPolicy(history).rank(probes, "workflow.hello.world")
+    assert [probe.serial for probe in ranked] == ["serial-a", "serial-b"]
+    history.close()
+
+
+def test_sticky_policy_resumes_the_last_successful_device_in_a_new_process(history):
+    now = time.time()
+    history.record(_result(True, device_id="serial-b"), finished_at=now - 60)
+    history.record(_result(True, device_id="serial-c"), finished_at=now - 10)
+    history.record(_result(False, device_id="serial-a"), finished_at=now)
+    probes = [DeviceProbe("serial-a"), DeviceProbe("serial-b"), DeviceProbe("serial-c")]
+
+    policy = StickyPolicy(history=history)
+    assert policy.rank(probes, "workflow.hello.world")[0].serial == "serial-c"
+    assert policy.rank(probes, "workflow.other")[0].serial == "serial-a"
+    policy.remember("workflow.hello.world", "serial-b")
+    assert policy.rank(probes, "workflow.hello.world")[0].serial == "serial-b"
+
+
+def test_duration_percentiles_use_one_window_for_every_group(history, monkeypatch):
+    now = 1_000_000.0
+    for index in range(10):
+        history.record(_result(True, total=float(index + 1)), finished_at=now - index * 10)
+    history.record(_result(True, action="start", total=5.0), finished_at=now)
+    clock = iter(now + step * 3550 for step in range(10))
+    monkeypatch.setattr(history_module, "time", SimpleNamespace(time=lambda: next(clock)))
+
+    assert history.duration_percentiles(1, percentile=0.9) == {
+        ("workflow.hello.world", "login"): 9.0,
+        ("workflow.hello.world", "start"): 5.0,
+    }
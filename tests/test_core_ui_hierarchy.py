@@ -0,0 +1,88 @@
+import pytest
+
+from workflow_core.core.ui_hierarchy import UIHierarchy
+
+DUMP = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy rotation="0">
+  <node index="0" text="" resource-id="" class="android.widget.FrameLayout"
+        package="com.example" content-desc="" clickable="false" enabled="true"
+        bounds="[0,0][1080,2400]">
+    <node index="0" text="Sign in" resource-id="com.example:id/login"
+          class="android.widget.Button" package="com.example" content-desc=""
+          clickable="true" enabled="true" bounds="[100,200][300,260]" />
+    <node index="1" text="" resource-id="com.example:id/list"
+          class="android.widget.LinearLayout" package="com.example"
+          content-desc="Accounts" clickable="false" enabled="true"
+          bounds="[0,300][1080,900]">
+      <node index="0" text="Alice" resource-id="com.example:id/row"
+            class="android.widget.TextView" package="com.example"
+            content-desc="" clickable="true" enabled="true" bounds="[0,300][1080,400]" />
+      <node index="1" text="Bob" resource-id="com.example:id/row"
+            class="android.widget.TextView" package="com.example"
+            content-desc="" clickable="true" enabled="false" bounds="[0,400][1080,500]" />
+    </node>
+  </node>
+</hierarchy>
+"""
+
+
+class DumpingDevice:
+    def __init__(self) -> None:
+        self.dumps = 0
+
+    def dump_hierarchy(self) -> str:
+        self.dumps += 1
+        return DUMP
+
+
+def test_selectors_use_indexes_and_preserve_order():
+    hierarchy = UIHierarchy(DUMP)
+
+    rows = hierarchy.find(resourceId="com.example:id/row")
+    assert [node.text for node in rows] == ["Alice", "Bob"]
+    assert hierarchy.find(resourceId="com.example:id/row", enabled=False)[0].text == "Bob"
+    assert hierarchy.first(text="Sign in").center == (200, 230)
+    assert hierarchy.exists(description="Accounts")
+    assert hierarchy.find(className="android.widget.TextView", textStartsWith="Al")[0].text == "Alice"
+    assert not hierarchy.exists(text="Missing")
+    assert rows[0].parent.content_desc == "Accounts"
+
+
+def test_xpath_subset():
+    hierarchy = UIHierarchy(DUMP)
+
+    assert [n.text for n in hierarchy.xpath("//*[@resource-id='com.example:id/row']")] == [
+        "Alice",
+        "Bob",
+    ]
+    assert [n.text for n in hierarchy.xpath("//android.widget.LinearLayout/*[2]")] == ["Bob"]
+    assert [n.text for n in hierarchy.xpath("//*[contains(@text,'ign') and @clickable='true']")] == [
+        "Sign in"
+    ]
+    assert len(hierarchy.xpath("/hierarchy/android.widget.FrameLayout")) == 1
+    with pytest.raises(ValueError):
+        hierarchy.xpath("//*[@text=unquoted]")
+
+
+def test_xpath_predicates_may_quote_brackets_and_and():
+    hierarchy = UIHierarchy(DUMP.replace('text="Bob"', 'text="Bob and [Carol]"'))
+
+    (node,) = hierarchy.xpath("//node[@bounds='[100,200][300,260]']")
+    assert node.text == "Sign in"
+    assert hierarchy.xpath("//*[@bounds=\"[0,0][1080,2400]\"]/*[1]")[0].text == "Sign in"
+    assert [n.text for n in hierarchy.xpath("//*[@text='Bob and [Carol]' and @enabled='false']")] == [
+        "Bob and [Carol]"
+    ]
+
+
+def test_capture_dumps_once_until_refresh():
+    device = DumpingDevice()
+    hierarchy = UIHierarchy.capture(device)
+    for _ in range(10):
+        hierarchy.exists(text="Sign in")
+    assert device.dumps == 1
+
+    hierarchy.refresh()
+    assert device.dumps == 2
+    with pytest.raises(RuntimeError):
+        UIHierarchy(DUMP).refresh()
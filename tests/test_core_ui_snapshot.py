@@ -0,0 +1,112 @@
+import json
+import time
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.ui_snapshot import (
+    SnapshotStore,
+    capture_hierarchy,
+    capture_screenshot,
+    take_snapshots,
+)
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_factory import WorkflowFactory
+from workflow_core.core.workflow_types import WorkflowActionName
+
+HIERARCHY = b"<?xml version='1.0' ?><hierarchy rotation=\"0\"><node text=\"Home\" /></hierarchy>"
+PNG = b"\x89PNG\r\n\x1a\nfake-pixels"
+
+
+class FakeAdbDevice:
+    def __init__(self, serial: str, delay: float = 0.0) -> None:
+        self.serial = serial
+        self.delay = delay
+        self.commands: list[str] = []
+
+    def shell(self, command: str, encoding=None) -> bytes:
+        self.commands.append(command)
+        time.sleep(self.delay)
+        if command.startswith("uiautomator dump"):
+            return HIERARCHY + b"UI hierchary dumped to: /dev/tty\n"
+        return PNG
+
+
+def test_hierarchy_is_streamed_without_status_line():
+    device = FakeAdbDevice("serial-1")
+
+    assert capture_hierarchy(device) == HIERARCHY
+    assert device.commands == ["uiautomator dump /dev/tty"]
+
+
+def test_screenshot_uses_exec_so_binary_output_is_not_rewritten():
+    class FakeConnection:
+        def __init__(self) -> None:
+            self.commands: list[str] = []
+            self.closed = False
+
+        def send_command(self, command: str) -> None:
+            self.commands.append(command)
+
+        def check_okay(self) -> None:
+            pass
+
+        def read_until_close(self, encoding=None) -> bytes:
+            return PNG
+
+        def close(self) -> None:
+            self.closed = True
+
+    class TransportDevice(FakeAdbDevice):
+        def open_transport(self) -> FakeConnection:
+            self.connection = FakeConnection()
+            return self.connection
+
+    device = TransportDevice("serial-1")
+
+    assert capture_screenshot(device) == PNG
+    assert device.connection.commands == ["exec:screencap -p"] and device.connection.closed
+    assert device.commands == []
+    assert capture_screenshot(FakeAdbDevice("serial-2")) == PNG
+
+
+def test_devices_are_captured_in_parallel_and_deduplicated(tmp_path):
+    devices = [FakeAdbDevice(f"serial-{i}", delay=0.05) for i in range(4)]
+    store = SnapshotStore(tmp_path)
+
+    started = time.perf_counter()
+    snapshots = take_snapshots(store, "home", devices)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 4 * 2 * 0.05
+    assert len({snapshot.hierarchy_digest for snapshot in snapshots}) == 1
+    assert len(list((tmp_path / "objects").rglob("*.*"))) == 2
+    assert (tmp_path / "serial-3" / "home.xml").read_bytes() == HIERARCHY
+    record = json.loads((tmp_path / "serial-3" / "home.json").read_text())
+    assert record["screenshot_digest"] == snapshots[3].screenshot_digest
+
+
+def test_failed_run_captures_snapshot(monkeypatch, tmp_path):
+    class AwakeDevice:
+        info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    class FailingWorkflow:
+        def run(self, action):
+            raise RuntimeError("button missing")
+
+    adb_device = FakeAdbDevice("serial-one")
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: AwakeDevice())
+    monkeypatch.setattr(workflow_module.adbutils.adb, "device", lambda serial=None: adb_device)
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    monkeypatch.setattr(WorkflowFactory, "get_workflow", lambda config: FailingWorkflow())
+
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id="serial-one",
+        snapshot_dir=str(tmp_path),
+    )
+    result = Workflow(config).run()
+
+    assert not result.success
+    assert "snapshot" in result.timings
+    assert len(list((tmp_path / "serial-one").glob("workflow.hello.world-login-failed-*.png"))) == 1
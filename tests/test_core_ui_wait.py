@@ -0,0 +1,83 @@
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.ui_wait import ScreenshotSignal, wait_for_settle, wait_until
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_wait_until_returns_as_soon_as_predicate_holds():
+    clock = FakeClock()
+    result = wait_until(lambda: clock.now >= 0.3, timeout=5, interval=0.1, clock=clock, sleep=clock.sleep)
+
+    assert result.satisfied
+    assert abs(result.elapsed - 0.3) < 1e-9
+    assert result.polls == 4
+
+
+def test_wait_until_reports_timeout():
+    clock = FakeClock()
+    result = wait_until(lambda: False, timeout=1, interval=0.4, clock=clock, sleep=clock.sleep)
+
+    assert not result
+    assert result.elapsed == 1
+
+
+def test_wait_for_settle_requires_consecutive_stable_samples():
+    clock = FakeClock()
+    samples = iter(["a", "b", "c", "c", "c", "c"])
+
+    result = wait_for_settle(
+        device=None,
+        signals=[lambda device: next(samples)],
+        interval=0.1,
+        stable_polls=2,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert result.satisfied
+    assert result.polls == 5
+
+
+def test_screenshot_signal_tolerates_small_differences():
+    signal = ScreenshotSignal(tolerance=2.0)
+    assert signal.same(bytes([10, 10, 10, 10]), bytes([11, 12, 10, 10]))
+    assert not signal.same(bytes([10, 10]), bytes([200, 200]))
+
+
+class SleepyScreenDevice:
+    def __init__(self) -> None:
+        self.screen = False
+
+    @property
+    def info(self) -> dict:
+        return {"screenOn": self.screen, "currentPackageName": "com.example"}
+
+    def screen_on(self) -> None:
+        self.screen = True
+
+
+def test_wake_device_continues_once_screen_is_on(monkeypatch, capsys):
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: SleepyScreenDevice())
+
+    workflow = Workflow(
+        WorkflowConfig(
+            workflow="workflow.hello.world",
+            action=WorkflowActionName("login"),
+            device_id="serial-one",
+        )
+    )
+    workflow._wake_device()
+
+    assert "Screen on check passed after 0.0" in capsys.readouterr().out
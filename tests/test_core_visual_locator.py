@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from workflow_core.core.visual_locator import VisualLocator, _resize
+
+
+def _screen(height: int = 1200, width: int = 540):
+    rng = np.random.default_rng(7)
+    blocks = rng.integers(0, 255, (height // 6, width // 6)).astype(np.float32)
+    screen = np.kron(blocks, np.ones((6, 6), dtype=np.float32))
+    screen += rng.normal(0, 4, screen.shape)
+    return np.clip(screen, 0, 255).astype(np.uint8)
+
+
+def test_locates_templates_in_rgb_screenshot():
+    screen = _screen()
+    rgb = np.repeat(screen[..., None], 3, axis=2)
+    locator = VisualLocator()
+    locator.add_template("button", screen[700:760, 100:220])
+    locator.add_template("icon", screen[90:130, 400:440])
+
+    matches = locator.locate_all(rgb)
+
+    assert (matches["button"].left, matches["button"].top) == (100, 700)
+    assert matches["button"].center == (160, 730)
+    assert (matches["icon"].left, matches["icon"].top) == (400, 90)
+    assert matches["icon"].score > 0.99
+
+
+def test_multi_scale_search_finds_resized_element():
+    screen = _screen()
+    locator = VisualLocator(scales=(0.8, 1.0, 1.25))
+    locator.add_template("button", screen[700:760, 100:220])
+    larger = _resize(np, screen.astype(np.float32), 1500, 675)
+
+    match = locator.locate(larger, "button")
+
+    assert match is not None and match.scale == 1.25
+    assert abs(match.left - 125) <= 2 and abs(match.top - 875) <= 2
+
+
+def test_region_of_interest_limits_the_search():
+    screen = _screen()
+    locator = VisualLocator()
+    locator.add_template("button", screen[700:760, 100:220])
+
+    assert locator.locate(screen, "button", region=(0, 0, 540, 600)) is None
+    match = locator.locate(screen, "button", region=(50, 650, 300, 800))
+    assert (match.left, match.top) == (100, 700)
+
+
+def test_absent_template_returns_none_and_unknown_name_raises():
+    screen = _screen()
+    locator = VisualLocator()
+    locator.add_template("checker", np.kron(np.eye(4) * 255, np.ones((12, 12))))
+
+    assert locator.locate(screen, "checker") is None
+    with pytest.raises(ValueError):
+        locator.locate(screen, "missing")
+
+
+def test_region_converts_only_that_part_of_a_raw_screenshot():
+    screen = _screen()
+    rgb = np.repeat(screen[..., None], 3, axis=2)
+    locator = VisualLocator()
+    locator.add_template("button", screen[700:760, 100:220])
+
+    frame = locator.frame(rgb, region=(50, 650, 300, 800))
+    assert frame.shape == (150, 250) and frame.offset == (50, 650)
+    matches = locator.locate_all(rgb, region=(50, 650, 300, 800))
+    assert (matches["button"].left, matches["button"].top) == (100, 700)
+    with pytest.raises(ValueError):
+        locator.frame(rgb, region=(600, 0, 700, 100))
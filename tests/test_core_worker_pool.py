@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+import pytest
+
+from workflow_core.core.worker_pool import WorkerPool
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+def _config(action: str = "login") -> WorkflowConfig:
+    return WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName(action),
+        device_id="serial-1",
+    )
+
+
+def _report_pid(config: WorkflowConfig) -> WorkflowActionResult:
+    if config.action_name == "crash":
+        os._exit(3)
+    if config.action_name == "slow":
+        time.sleep(0.5)
+    if config.action_name == "raise":
+        raise ValueError("bad config")
+    return WorkflowActionResult(
+        config.workflow_name,
+        config.action_name,
+        True,
+        device_id=config.device_id,
+        timings={"pid": float(os.getpid())},
+    )
+
+
+def _pid(pool: WorkerPool, action: str = "login") -> int:
+    result = pool.run(_config(action))
+    assert result.success
+    return int(result.timings["pid"])
+
+
+def test_workers_are_reused_then_recycled_after_max_runs():
+    with WorkerPool(size=1, max_runs=2, preload=[], runner=_report_pid) as pool:
+        first, second, third = _pid(pool), _pid(pool), _pid(pool)
+
+    assert first == second != os.getpid()
+    assert third != first
+    assert pool.spawned == 2
+
+
+def test_crashed_worker_fails_the_run_and_is_replaced():
+    with WorkerPool(size=1, preload=[], runner=_report_pid) as pool:
+        before = _pid(pool)
+        crashed = pool.run(_config("crash"))
+        with pytest.raises(RuntimeError, match="bad config"):
+            pool.run(_config("raise"))
+        after = _pid(pool)
+
+    assert not crashed.success
+    assert "exit code 3" in str(crashed.error)
+    assert after != before
+
+
+def test_memory_ceiling_recycles_every_run():
+    with WorkerPool(size=1, max_rss_mb=1, preload=[], runner=_report_pid) as pool:
+        assert _pid(pool) != _pid(pool)
+
+
+def test_run_starts_the_pool_and_close_wakes_waiting_callers():
+    pool = WorkerPool(size=1, preload=[], runner=_report_pid)
+    assert _pid(pool) != os.getpid()
+
+    busy = threading.Thread(target=pool.run, args=(_config("slow"),))
+    busy.start()
+    time.sleep(0.1)
+    errors: list[Exception] = []
+
+    def wait_for_worker() -> None:
+        try:
+            pool.run(_config())
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    waiter = threading.Thread(target=wait_for_worker)
+    waiter.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    pool.close()
+    waiter.join(timeout=5)
+    busy.join(timeout=10)
+
+    assert not waiter.is_alive() and not busy.is_alive()
+    assert "closed" in str(errors[0])
+    assert time.monotonic() - started < 5
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.run(_config())
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_async import AsyncDevice
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_fleet import WorkflowFleet
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+class AwakeDevice:
+    info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    def __init__(self) -> None:
+        self.clicks: list[tuple[str, tuple]] = []
+
+    def click(self, x: float, y: float) -> None:
+        self.clicks.append((threading.current_thread().name, (x, y)))
+
+
+class AsyncWorkflow:
+    def __init__(self, config: WorkflowConfig) -> None:
+        self.device = AsyncDevice(config.device)
+        self.loop_threads: list[str] = []
+
+    def action_handler(self, action: WorkflowActionName):
+        return {"tap": self.tap}[action]
+
+    def run(self, action: WorkflowActionName):
+        return self.action_handler(action)()
+
+    async def tap(self) -> bool:
+        self.loop_threads.append(threading.current_thread().name)
+        await self.device.click(0.5, 0.5)
+        return True
+
+
+def _connect(monkeypatch) -> tuple[AwakeDevice, list[tuple]]:
+    device = AwakeDevice()
+    sent: list[tuple] = []
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: device)
+    monkeypatch.setattr(workflow_module, "send", lambda *args: sent.append(args))
+    return device, sent
+
+
+def _config(action: str, workflow: str = "workflow.async") -> WorkflowConfig:
+    return WorkflowConfig(
+        workflow=workflow, action=WorkflowActionName(action), device_id="serial-one"
+    )
+
+
+def test_async_handler_is_awaited_and_device_calls_use_the_executor(monkeypatch):
+    device, sent = _connect(monkeypatch)
+    holder: dict[str, AsyncWorkflow] = {}
+
+    def get_workflow(config):
+        holder["workflow"] = AsyncWorkflow(config)
+        return holder["workflow"]
+
+    monkeypatch.setattr(workflow_module.WorkflowFactory, "get_workflow", get_workflow)
+
+    async def main() -> WorkflowActionResult:
+        workflow = await Workflow.connect_async(_config("tap"))
+        return await workflow.run_async()
+
+    result = asyncio.run(main())
+
+    assert result.success
+    assert holder["workflow"].loop_threads == ["MainThread"]
+    assert device.clicks[0][0].startswith("workflow-device")
+    assert sent == [(True, "workflow.async:tap", None)]
+
+
+def test_sync_workflows_run_unchanged_under_run_async(monkeypatch):
+    _, sent = _connect(monkeypatch)
+
+    result = asyncio.run(Workflow(_config("daily", "workflow.hello.world")).run_async())
+
+    assert result.success
+    assert [step.action for step in result.steps] == ["login", "start", "status"]
+    assert sent[0][1] == "workflow.hello.world:daily [login ✓, start ✓, status ✓]"
+
+
+def test_sync_run_completes_async_handlers(monkeypatch):
+    device, _ = _connect(monkeypatch)
+    monkeypatch.setattr(workflow_module.WorkflowFactory, "get_workflow", AsyncWorkflow)
+
+    assert Workflow(_config("tap")).run().success
+    assert len(device.clicks) == 1
+
+
+def test_sync_run_inside_an_event_loop_points_to_run_async(monkeypatch):
+    device, _ = _connect(monkeypatch)
+    monkeypatch.setattr(workflow_module.WorkflowFactory, "get_workflow", AsyncWorkflow)
+
+    async def main() -> WorkflowActionResult:
+        return Workflow(_config("tap")).run()
+
+    result = asyncio.run(main())
+
+    assert not result.success
+    assert isinstance(result.error, RuntimeError) and "run_async" in str(result.error)
+    assert device.clicks == []
+
+
+def test_fleet_run_async_bounds_devices_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if config.device_id == "serial-3":
+            raise ConnectionError("offline")
+        return WorkflowActionResult(config.workflow_name, config.action_name, True)
+
+    fleet = WorkflowFleet(
+        _config("tap"), device_ids=[f"serial-{n}" for n in range(6)], max_workers=2
+    )
+    results = asyncio.run(fleet.run_async(runner))
+
+    assert peak == 2
+    assert [result.device_id for result in results] == [f"serial-{n}" for n in range(6)]
+    assert [result.success for result in results] == [True, True, True, False, True, True]
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+import workflow_core.core.workflow_fleet as fleet_module
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_fleet import WorkflowFleet
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+class DummyAdbDevice:
+    def __init__(self, serial: str) -> None:
+        self.serial = serial
+
+
+def _base_config() -> WorkflowConfig:
+    return WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id=None,
+        delay_minutes=0,
+    )
+
+
+def test_runs_on_every_connected_device_with_bounded_concurrency(monkeypatch):
+    devices = [DummyAdbDevice(f"serial-{i}") for i in range(6)]
+    monkeypatch.setattr(fleet_module.adbutils.adb, "device_list", lambda: devices)
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return WorkflowActionResult(
+            config.workflow_name, config.action_name, True, device_id=config.device_id
+        )
+
+    config = _base_config()
+    results = WorkflowFleet(config, max_workers=2, runner=runner).run()
+
+    assert [result.device_id for result in results] == [d.serial for d in devices]
+    assert all(result.success for result in results)
+    assert peak == 2
+    assert config.device_id is None
+
+
+def test_filter_and_connection_failures_become_results():
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        if config.device_id == "bad":
+            raise RuntimeError("adb offline")
+        return WorkflowActionResult(config.workflow_name, config.action_name, True)
+
+    fleet = WorkflowFleet(
+        _base_config(),
+        device_ids=["good", "bad", "skipped"],
+        device_filter=lambda serial: serial != "skipped",
+        runner=runner,
+    )
+    results = fleet.run()
+
+    assert [(r.device_id, r.success) for r in results] == [("good", True), ("bad", False)]
+    assert isinstance(results[1].error, RuntimeError)
+
+
+def test_no_devices_raises(monkeypatch):
+    monkeypatch.setattr(fleet_module.adbutils.adb, "device_list", lambda: [])
+
+    with pytest.raises(RuntimeError, match="No connected Android devices"):
+        WorkflowFleet(_base_config()).run()
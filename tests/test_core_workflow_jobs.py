@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.workflow_cli_parser import WorkflowCLIParser, main
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_jobs import (
+    JobManifest,
+    JobManifestError,
+    job_configs,
+    run_jobs,
+    write_report,
+)
+from workflow_core.core.workflow_types import WorkflowActionResult
+
+
+def _manifest() -> dict:
+    return {
+        "max_workers": 2,
+        "jobs": [
+            {
+                "name": "greet",
+                "workflow": "workflow.hello.world",
+                "actions": ["login", "start"],
+                "devices": ["serial-a", "serial-b"],
+                "args": {"hello-world-greeting": "hi"},
+            },
+            {
+                "name": "status",
+                "workflow": "workflow.hello.world",
+                "action": "status",
+                "devices": {"policy": "lru"},
+                "jitter": [0, 0],
+            },
+        ],
+    }
+
+
+def test_manifest_validates_args_with_the_cli_parser():
+    manifest = JobManifest.from_dict(_manifest())
+
+    greet, status = manifest.jobs
+    assert greet.args.hello_world_greeting == "hi"
+    assert greet.action == "greet"
+    assert [config.device_id for config in job_configs(greet)] == ["serial-a", "serial-b"]
+    (config,) = job_configs(status)
+    assert config.selection_policy == "lru"
+    assert config.device_id is None
+
+
+def test_manifest_reports_every_problem_at_once():
+    data = _manifest()
+    data["jobs"][0]["args"] = {"no-such-option": 1}
+    data["jobs"][1].update(workflow="workflow.missing", jitter=[5, 1], colour="red")
+    data["jobs"].append({"name": "greet", "workflow": "workflow.hello.world"})
+
+    with pytest.raises(JobManifestError) as excinfo:
+        JobManifest.from_dict(data)
+
+    errors = "\n".join(excinfo.value.errors)
+    assert "unrecognized arguments: --no-such-option" in errors
+    assert "workflow.missing" in errors
+    assert "'jitter'" in errors
+    assert "unknown key(s) colour" in errors
+    assert "duplicate job name" in errors
+    assert "one of 'action' or 'actions' is required" in errors
+
+
+def test_run_jobs_produces_one_report(tmp_path):
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        return WorkflowActionResult(
+            config.workflow_name,
+            config.action_name,
+            config.device_id != "serial-b",
+            error=None if config.device_id != "serial-b" else RuntimeError("boom"),
+            device_id=config.device_id,
+        )
+
+    report = run_jobs(JobManifest.from_dict(_manifest()), runner=runner, seed=1)
+
+    assert (report["succeeded"], report["failed"]) == (2, 1)
+    assert [(r["job"], r["device_id"]) for r in report["results"]] == [
+        ("greet", "serial-a"),
+        ("greet", "serial-b"),
+        ("status", None),
+    ]
+    assert report["results"][1]["error"] == "RuntimeError('boom')"
+
+    path = tmp_path / "reports" / "run.json"
+    write_report(report, path)
+    assert json.loads(path.read_text())["failed"] == 1
+
+
+def test_cli_accepts_jobs_without_workflow():
+    args = WorkflowCLIParser.parse(["--jobs", "jobs.json", "--report", "out.json"])
+
+    assert args.jobs == "jobs.json"
+    assert args.workflow is None
+    with pytest.raises(SystemExit):
+        WorkflowCLIParser.parse([])
+
+
+def test_cli_main_dispatches_jobs_to_run_manifest(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("WORKFLOW_DEVICE_BACKEND", "sim:3?seed=2")
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        json.dumps({"jobs": [{"workflow": "workflow.hello.world", "action": "login", "devices": "all"}]})
+    )
+    report_path = tmp_path / "report.json"
+
+    assert main(["--jobs", str(manifest), "--report", str(report_path)]) == 0
+
+    report = json.loads(report_path.read_text())
+    assert report["succeeded"] == 3
+    assert "Jobs finished: 3 succeeded" in capsys.readouterr().err
+    manifest.write_text(json.dumps({"jobs": [{"workflow": "workflow.missing"}]}))
+    assert main(["--jobs", str(manifest)]) == 2
+    with pytest.raises(SystemExit):
+        main(["--workflow", "workflow.hello.world", "--report", str(report_path)])
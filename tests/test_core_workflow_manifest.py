@@ -0,0 +1,134 @@
+import sys
+import textwrap
+
+from workflow_core.core.workflow_cli_parser import WorkflowCLIParser
+from workflow_core.core.workflow_manifest import WorkflowManifest
+from workflow_core.core.workflow_registry import WorkflowRegistry
+
+WORKFLOW_SOURCE = textwrap.dedent(
+    """
+    import argparse
+
+
+    class {cls}:
+        def __init__(self, config) -> None:
+            self.config = config
+
+        def workflow_name(self) -> str:
+            return "{name}"
+
+        def package_name(self) -> str:
+            return "com.example"
+
+        def action_handler(self, action):
+            return lambda: True
+
+        def actions(self):
+            return {{}}
+
+        def run(self, action) -> bool:
+            return True
+
+        @staticmethod
+        def register_cli_arguments(parser: argparse.ArgumentParser) -> None:
+            parser.add_argument("--{flag}-count", type=int, default=1)
+            parser.add_argument("--{flag}-verbose", action="store_true")
+    """
+)
+
+
+def _write_package(root, package: str) -> list[tuple[list[str], str]]:
+    pkg_dir = root / package
+    pkg_dir.mkdir()
+    (pkg_dir / "__init__.py").write_text("", encoding="utf-8")
+    (pkg_dir / "alpha.py").write_text(
+        WORKFLOW_SOURCE.format(cls="AlphaWorkflow", name="workflow.alpha", flag="alpha"),
+        encoding="utf-8",
+    )
+    (pkg_dir / "beta.py").write_text(
+        WORKFLOW_SOURCE.format(cls="BetaWorkflow", name="workflow.beta", flag="beta"),
+        encoding="utf-8",
+    )
+    return [([str(pkg_dir)], f"{package}.")]
+
+
+def _forget(package: str) -> None:
+    for name in [m for m in sys.modules if m == package or m.startswith(f"{package}.")]:
+        del sys.modules[name]
+
+
+def test_manifest_replays_arguments_without_importing(tmp_path, monkeypatch):
+    package = "manifest_pkg_replay"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    search_paths = _write_package(tmp_path, package)
+    manifest_path = tmp_path / "manifest.json"
+
+    first = WorkflowCLIParser.parse(
+        ["--workflow", "workflow.alpha", "--alpha-count", "3"],
+        package_paths=search_paths,
+        manifest_path=manifest_path,
+    )
+    assert first.alpha_count == 3
+    assert manifest_path.exists()
+
+    _forget(package)
+    try:
+        second = WorkflowCLIParser.parse(
+            ["--workflow", "workflow.alpha", "--beta-verbose"],
+            package_paths=search_paths,
+            manifest_path=manifest_path,
+        )
+        assert second.alpha_count == 1
+        assert second.beta_verbose is True
+        assert f"{package}.alpha" in sys.modules
+        assert f"{package}.beta" not in sys.modules
+        assert WorkflowRegistry.get("workflow.alpha").__module__ == f"{package}.alpha"
+    finally:
+        WorkflowRegistry.unregister("workflow.alpha")
+        _forget(package)
+
+
+def test_manifest_reindexes_modified_modules(tmp_path, monkeypatch):
+    package = "manifest_pkg_stale"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    search_paths = _write_package(tmp_path, package)
+    manifest = WorkflowManifest(tmp_path / "manifest.json")
+
+    try:
+        names = {entry.name for entry in manifest.entries(search_paths)}
+        assert names == {"workflow.alpha", "workflow.beta"}
+
+        beta = tmp_path / package / "beta.py"
+        beta.write_text(
+            WORKFLOW_SOURCE.format(cls="BetaWorkflow", name="workflow.gamma", flag="beta"),
+            encoding="utf-8",
+        )
+        _forget(package)
+
+        names = {entry.name for entry in manifest.entries(search_paths)}
+        assert names == {"workflow.alpha", "workflow.gamma"}
+        assert f"{package}.alpha" not in sys.modules
+    finally:
+        _forget(package)
+
+
+def test_uncacheable_arguments_fall_back_to_import():
+    class LambdaTypeWorkflow:
+        @staticmethod
+        def register_cli_arguments(parser) -> None:
+            parser.add_argument("--value", type=lambda raw: raw.upper())
+
+    assert WorkflowManifest._capture_arguments(LambdaTypeWorkflow) is None
+
+
+def test_environment_derived_defaults_are_not_cached(monkeypatch):
+    import os
+
+    class EnvDefaultWorkflow:
+        @staticmethod
+        def register_cli_arguments(parser) -> None:
+            parser.add_argument("--region", default=os.getenv("APP_REGION", "eu"))
+
+    monkeypatch.setenv("APP_REGION", "us")
+    assert WorkflowManifest._capture_arguments(EnvDefaultWorkflow) is None
+    assert os.environ["APP_REGION"] == "us" and type(os.environ).__name__ == "_Environ"
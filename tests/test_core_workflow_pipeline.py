@@ -0,0 +1,92 @@
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class AwakeDevice:
+    info = {"screenOn": True, "currentPackageName": "com.example"}
+
+
+class FlakyWorkflow:
+    def __init__(self, config: WorkflowConfig) -> None:
+        self.calls: list[str] = []
+
+    def run(self, action: WorkflowActionName) -> bool:
+        self.calls.append(action)
+        if action == "start":
+            raise RuntimeError("start failed")
+        return True
+
+
+def _connect(monkeypatch) -> list[tuple]:
+    connects: list[str] = []
+    sent: list[tuple] = []
+
+    def fake_connect(serial=None):
+        connects.append(serial)
+        return AwakeDevice()
+
+    monkeypatch.setattr(workflow_module.u2, "connect", fake_connect)
+    monkeypatch.setattr(workflow_module, "send", lambda *args: sent.append(args))
+    return sent
+
+
+def test_declared_pipeline_runs_on_one_session(monkeypatch):
+    sent = _connect(monkeypatch)
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("daily"),
+        device_id="serial-one",
+    )
+
+    result = Workflow(config).run()
+
+    assert result.success
+    assert result.action == "daily"
+    assert [step.action for step in result.steps] == ["login", "start", "status"]
+    assert {"handler.login", "handler.start", "handler.status"} <= set(result.timings)
+    assert len(sent) == 1
+    assert sent[0][1] == "workflow.hello.world:daily [login ✓, start ✓, status ✓]"
+
+
+def test_explicit_actions_stop_on_failure(monkeypatch):
+    sent = _connect(monkeypatch)
+    workflow_instance = FlakyWorkflow(None)
+    monkeypatch.setattr(
+        workflow_module.WorkflowFactory, "get_workflow", lambda config: workflow_instance
+    )
+    config = WorkflowConfig(
+        workflow="workflow.flaky",
+        action=WorkflowActionName("morning"),
+        device_id="serial-one",
+        actions=["login", "start", "status"],
+    )
+
+    result = Workflow(config).run()
+
+    assert not result.success
+    assert workflow_instance.calls == ["login", "start"]
+    assert isinstance(result.error, RuntimeError)
+    assert sent[0][1] == "workflow.flaky:morning [login ✓, start ✗, status skipped]"
+
+
+def test_continue_after_failure_when_configured(monkeypatch):
+    _connect(monkeypatch)
+    workflow_instance = FlakyWorkflow(None)
+    monkeypatch.setattr(
+        workflow_module.WorkflowFactory, "get_workflow", lambda config: workflow_instance
+    )
+    config = WorkflowConfig(
+        workflow="workflow.flaky",
+        action=WorkflowActionName("morning"),
+        device_id="serial-one",
+        actions=["login", "start", "status"],
+        stop_on_failure=False,
+    )
+
+    result = Workflow(config).run()
+
+    assert workflow_instance.calls == ["login", "start", "status"]
+    assert [step.success for step in result.steps] == [True, False, True]
+    assert not result.success
@@ -0,0 +1,81 @@
+import argparse
+
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_factory import WorkflowFactory
+from workflow_core.core.workflow_registry import WorkflowRegistry
+from workflow_core.core.workflow_types import WorkflowActionName
+from workflow_core.workflows.hello_world_workflow import HelloWorldWorkflow
+
+
+class ExplicitWorkflow:
+    def __init__(self, config: WorkflowConfig) -> None:
+        self.config = config
+
+    def workflow_name(self) -> str:
+        return "workflow.explicit"
+
+    def package_name(self) -> str:
+        return "com.example.explicit"
+
+    def action_handler(self, action):
+        return lambda: True
+
+    def actions(self):
+        return {}
+
+    def run(self, action) -> bool:
+        return True
+
+    @staticmethod
+    def register_cli_arguments(parser: argparse.ArgumentParser) -> None:
+        pass
+
+
+def _config(name: str) -> WorkflowConfig:
+    return WorkflowConfig(workflow=name, action=WorkflowActionName("login"))
+
+
+def test_discovery_runs_once_until_invalidated(monkeypatch):
+    WorkflowRegistry.invalidate()
+    calls: list[str | None] = []
+    original = WorkflowRegistry.discover_workflow_classes
+
+    def counting_discover(extra_packages=None):
+        calls.append(extra_packages)
+        return original(extra_packages)
+
+    monkeypatch.setattr(
+        WorkflowRegistry, "discover_workflow_classes", staticmethod(counting_discover)
+    )
+
+    assert WorkflowRegistry.get("workflow.hello.world") is HelloWorldWorkflow
+    assert WorkflowRegistry.get("workflow.hello.world") is HelloWorldWorkflow
+    assert len(calls) == 1
+
+    WorkflowRegistry.invalidate()
+    assert WorkflowRegistry.get("workflow.hello.world") is HelloWorldWorkflow
+    assert len(calls) == 2
+
+
+def test_explicit_registration_via_decorator():
+    try:
+        WorkflowRegistry.register(ExplicitWorkflow)
+        assert "workflow.explicit" in WorkflowRegistry.names()
+        workflow = WorkflowFactory.get_workflow(_config("workflow.explicit"))
+        assert isinstance(workflow, ExplicitWorkflow)
+
+        WorkflowRegistry.invalidate()
+        assert WorkflowRegistry.get("workflow.explicit") is ExplicitWorkflow
+    finally:
+        WorkflowRegistry.unregister("workflow.explicit")
+
+    assert WorkflowRegistry.get("workflow.explicit") is None
+
+
+def test_register_decorator_accepts_name_override():
+    try:
+        decorated = WorkflowRegistry.register(name="workflow.alias")(ExplicitWorkflow)
+        assert decorated is ExplicitWorkflow
+        assert WorkflowRegistry.get("workflow.alias") is ExplicitWorkflow
+    finally:
+        WorkflowRegistry.unregister("workflow.alias")
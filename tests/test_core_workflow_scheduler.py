@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_scheduler import WorkflowScheduler
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _config(device_id: str, delay_minutes: int = 0) -> WorkflowConfig:
+    return WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id=device_id,
+        delay_minutes=delay_minutes,
+    )
+
+
+def _record(config: WorkflowConfig) -> WorkflowActionResult:
+    assert config.delay_minutes == 0
+    return WorkflowActionResult(
+        config.workflow_name, config.action_name, True, device_id=config.device_id
+    )
+
+
+def _due_times(seed: int) -> list[float]:
+    scheduler = WorkflowScheduler(seed=seed, clock=FakeClock(), runner=_record)
+    for index in range(5):
+        scheduler.submit(_config(f"serial-{index}"), jitter_seconds=(10, 100))
+    return sorted(job.due for job in scheduler._queue)
+
+
+def test_seeded_due_times_are_reproducible():
+    assert _due_times(7) == _due_times(7)
+    assert all(10 <= due <= 100 for due in _due_times(7))
+
+
+def test_run_pending_dispatches_only_due_jobs():
+    clock = FakeClock()
+    scheduler = WorkflowScheduler(seed=1, clock=clock, runner=_record)
+    early = scheduler.submit(_config("early"), jitter_seconds=(5, 5))
+    late = scheduler.submit(_config("late"), jitter_seconds=(50, 50))
+
+    assert scheduler.run_pending() == 0
+    clock.now = 10
+    assert scheduler.run_pending() == 1
+    assert early.result(timeout=5).device_id == "early"
+    assert not late.done()
+    assert scheduler.next_due() == 50
+
+    scheduler.stop()
+    assert late.cancelled()
+
+
+def test_stop_without_cancelling_runs_queued_jobs():
+    clock = FakeClock()
+    scheduler = WorkflowScheduler(seed=1, clock=clock, runner=_record)
+    queued = scheduler.submit(_config("queued"), jitter_seconds=(50, 50))
+
+    scheduler.stop(cancel_pending=False)
+
+    assert queued.result(timeout=5).device_id == "queued"
+    assert scheduler.pending() == 0
+    with pytest.raises(RuntimeError, match="stopped"):
+        scheduler.run_pending()
+
+
+def test_default_window_follows_delay_minutes():
+    scheduler = WorkflowScheduler(seed=3, clock=FakeClock(), runner=_record)
+    scheduler.submit(_config("serial", delay_minutes=2))
+    assert 60 <= scheduler.next_due() <= 120
+
+    with pytest.raises(ValueError):
+        scheduler.submit(_config("serial"), jitter_seconds=(10, 1))
+
+
+def test_background_thread_runs_jobs():
+    done = threading.Event()
+
+    def runner(config: WorkflowConfig) -> WorkflowActionResult:
+        done.set()
+        return _record(config)
+
+    with WorkflowScheduler(runner=runner) as scheduler:
+        future = scheduler.submit(_config("serial"), jitter_seconds=(0, 0.01))
+        assert future.result(timeout=5).success
+    assert done.is_set()
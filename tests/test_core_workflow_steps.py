@@ -0,0 +1,145 @@
+import pytest
+
+import workflow_core.core.workflow as workflow_module
+import workflow_core.core.workflow_steps as steps_module
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_factory import WorkflowFactory
+from workflow_core.core.workflow_steps import (
+    CheckpointStore,
+    CircuitBreaker,
+    CircuitOpenError,
+    StepRunner,
+    WorkflowStep,
+)
+from workflow_core.core.workflow_types import WorkflowActionName
+
+
+class CheckoutFlow:
+    """Launch -> navigate -> submit, where submit fails until ``fixed``."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.fixed = False
+        self.on_cart = False
+
+    def launch(self) -> bool:
+        self.calls.append("launch")
+        return True
+
+    def navigate(self) -> bool:
+        self.calls.append("navigate")
+        self.on_cart = True
+        return True
+
+    def submit(self) -> bool:
+        self.calls.append("submit")
+        return self.fixed
+
+    def steps(self, action):
+        if action != "checkout":
+            return None
+        return [
+            WorkflowStep("launch", self.launch, backoff=0),
+            WorkflowStep("navigate", self.navigate, backoff=0),
+            WorkflowStep("submit", self.submit, precondition=lambda: self.on_cart, attempts=2, backoff=0),
+        ]
+
+
+def _runner(store, breaker) -> StepRunner:
+    return StepRunner("shop", WorkflowActionName("checkout"), "serial-1", store, breaker, sleep=lambda s: None)
+
+
+def test_failed_run_resumes_at_first_incomplete_step(tmp_path):
+    flow = CheckoutFlow()
+    store, breaker = CheckpointStore(tmp_path), CircuitBreaker()
+
+    first = _runner(store, breaker).run(flow.steps("checkout"))
+    assert [step.success for step in first] == [True, True, False]
+    assert flow.calls == ["launch", "navigate", "submit", "submit"]
+
+    flow.calls.clear()
+    flow.fixed = True
+    runner = _runner(CheckpointStore(tmp_path), breaker)
+    second = runner.run(flow.steps("checkout"))
+
+    assert runner.resumed == 2
+    assert flow.calls == ["submit"]
+    assert [step.action for step in second] == ["submit"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stale_checkpoint_restarts_from_first_step():
+    flow = CheckoutFlow()
+    store = CheckpointStore()
+    _runner(store, CircuitBreaker()).run(flow.steps("checkout"))
+
+    flow.calls.clear()
+    flow.on_cart = False
+    flow.fixed = True
+    _runner(store, CircuitBreaker()).run(flow.steps("checkout"))
+
+    assert flow.calls == ["launch", "navigate", "submit"]
+
+
+def test_circuit_opens_after_repeated_failures_and_resets(tmp_path):
+    now = [1000.0]
+    breaker = CircuitBreaker(tmp_path, failure_threshold=2, reset_timeout=60, clock=lambda: now[0])
+    flow = CheckoutFlow()
+
+    for _ in range(2):
+        _runner(CheckpointStore(), breaker).run(flow.steps("checkout"))
+    with pytest.raises(CircuitOpenError):
+        _runner(CheckpointStore(), breaker).run(flow.steps("checkout"))
+    assert not CircuitBreaker(tmp_path, failure_threshold=2, clock=lambda: now[0]).allow("serial-1")
+
+    now[0] += 61
+    flow.fixed = True
+    _runner(CheckpointStore(), breaker).run(flow.steps("checkout"))
+    assert breaker.allow("serial-1")
+
+
+def test_half_open_breaker_allows_a_single_trial(tmp_path):
+    now = [1000.0]
+    breaker = CircuitBreaker(tmp_path, failure_threshold=1, reset_timeout=60, clock=lambda: now[0])
+    other = CircuitBreaker(tmp_path, failure_threshold=1, reset_timeout=60, clock=lambda: now[0])
+    breaker.record_failure("serial-1")
+
+    now[0] += 61
+    assert breaker.allow("serial-1")
+    assert not other.allow("serial-1")
+    assert not breaker.allow("serial-1")
+
+    breaker.record_failure("serial-1")
+    now[0] += 30
+    assert not other.allow("serial-1")
+    now[0] += 31
+    assert other.allow("serial-1")
+    other.record_success("serial-1")
+    assert breaker.allow("serial-1") and other.allow("serial-1")
+
+
+def test_workflow_runs_declared_steps_with_checkpoints(monkeypatch, tmp_path):
+    class AwakeDevice:
+        info = {"screenOn": True, "currentPackageName": "com.example"}
+
+    flow = CheckoutFlow()
+    sent = []
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: AwakeDevice())
+    monkeypatch.setattr(workflow_module, "send", lambda *args: sent.append(args))
+    monkeypatch.setattr(WorkflowFactory, "get_workflow", lambda config: flow)
+    monkeypatch.setattr(steps_module, "_stores", {})
+    monkeypatch.setattr(steps_module, "_breakers", {})
+    config = WorkflowConfig(
+        workflow="shop",
+        action=WorkflowActionName("checkout"),
+        device_id="serial-1",
+        checkpoint_dir=str(tmp_path),
+    )
+
+    assert not Workflow(config).run().success
+    flow.fixed = True
+    result = Workflow(config).run()
+
+    assert result.success
+    assert sent[-1][1] == "shop:checkout [launch resumed, navigate resumed, submit ✓]"
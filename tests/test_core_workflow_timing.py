@@ -0,0 +1,101 @@
+import json
+
+import workflow_core.core.workflow as workflow_module
+from workflow_core.core.workflow import Workflow
+from workflow_core.core.workflow_config import WorkflowConfig
+from workflow_core.core.workflow_timing import (
+    WorkflowTimer,
+    append_json_lines,
+    write_prometheus_textfile,
+)
+from workflow_core.core.workflow_types import WorkflowActionName, WorkflowActionResult
+
+
+class AwakeDevice:
+    info = {"screenOn": True, "currentPackageName": "com.example"}
+
+
+def _run(monkeypatch, collect_timings: bool) -> WorkflowActionResult:
+    monkeypatch.setattr(workflow_module.u2, "connect", lambda serial=None: AwakeDevice())
+    monkeypatch.setattr(workflow_module, "send", lambda *args: None)
+    config = WorkflowConfig(
+        workflow="workflow.hello.world",
+        action=WorkflowActionName("login"),
+        device_id="serial-one",
+        collect_timings=collect_timings,
+    )
+    return Workflow(config).run()
+
+
+def test_run_records_each_phase(monkeypatch):
+    result = _run(monkeypatch, collect_timings=True)
+
+    assert result.success
+    assert set(result.timings) == {"wake_device", "get_workflow", "handler", "notify", "total"}
+    assert result.timings["total"] >= result.timings["handler"]
+
+
+def test_disabled_timer_records_nothing(monkeypatch):
+    result = _run(monkeypatch, collect_timings=False)
+
+    assert result.timings == {}
+    timer = WorkflowTimer(enabled=False)
+    assert timer.span("a") is timer.span("b")
+
+
+def test_exporters(tmp_path):
+    result = WorkflowActionResult(
+        "workflow.hello.world",
+        "login",
+        False,
+        error=RuntimeError("boom"),
+        device_id="serial-one",
+        timings={"handler": 0.25, "total": 0.5},
+    )
+
+    jsonl = tmp_path / "timings.jsonl"
+    append_json_lines([result, result], jsonl)
+    rows = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 2
+    assert rows[0]["timings"] == {"handler": 0.25, "total": 0.5}
+    assert rows[0]["error"] == "RuntimeError('boom')"
+
+    prom = tmp_path / "workflow.prom"
+    write_prometheus_textfile([result], prom)
+    text = prom.read_text(encoding="utf-8")
+    assert (
+        'workflow_phase_seconds{workflow="workflow.hello.world",action="login",'
+        'device="serial-one",phase="handler"} 0.250000'
+    ) in text
+    assert 'workflow_run_success{workflow="workflow.hello.world",action="login",device="serial-one"} 0' in text
+
+
+def test_prometheus_textfile_keeps_one_series_per_label_set(tmp_path):
+    def result(success: bool, handler: float) -> WorkflowActionResult:
+        return WorkflowActionResult(
+            "workflow.hello.world",
+            "login",
+            success,
+            device_id="serial-one",
+            timings={"handler": handler},
+        )
+
+    prom = tmp_path / "workflow.prom"
+    write_prometheus_textfile([result(False, 0.25), result(True, 0.5)], prom)
+    lines = prom.read_text(encoding="utf-8").splitlines()
+
+    assert [line for line in lines if line.startswith("workflow_phase_seconds{")] == [
+        'workflow_phase_seconds{workflow="workflow.hello.world",action="login",'
+        'device="serial-one",phase="handler"} 0.500000'
+    ]
+    assert [line for line in lines if line.startswith("workflow_run_success{")] == [
+        'workflow_run_success{workflow="workflow.hello.world",action="login",device="serial-one"} 1'
+    ]
+
+
+def test_span_detail_is_joined_into_the_name():
+    timer = WorkflowTimer()
+    with timer.span("handler", WorkflowActionName("login")):
+        pass
+
+    assert list(timer.timings) == ["handler.login"]
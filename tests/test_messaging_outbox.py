@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+import workflow_core.messaging.messaging as messaging_module
+from workflow_core.messaging.messaging import MAX_BODY_LENGTH
+from workflow_core.messaging.outbox import MessagingOutbox
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    """Local stand-in for POST /2010-04-01/Accounts/<sid>/Messages.json."""
+
+    bodies: list[str] = []
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        type(self).bodies.append(form["Body"][0])
+        payload = json.dumps({"sid": "SM123", "status": "queued", "body": form["Body"][0]})
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode("utf-8"))
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_twilio(tmp_path, monkeypatch):
+    FakeTwilioHandler.bodies = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwilioHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "messaging.json").write_text(
+        json.dumps(
+            {
+                "account_sid": "AC123",
+                "auth_token": "token",
+                "from": "+123",
+                "to": "+456",
+                "api_base_url": f"http://127.0.0.1:{server.server_address[1]}",
+            }
+        ),
+        encoding="utf-8",
+    )
+    yield FakeTwilioHandler.bodies
+    server.shutdown()
+    server.server_close()
+
+
+def test_burst_is_coalesced_into_one_request(fake_twilio, tmp_path):
+    outbox = MessagingOutbox(spool_dir=tmp_path / "spool", batch_window=0.2)
+    outbox.enqueue(True, "wf:login")
+    outbox.enqueue(False, "wf:start", RuntimeError("boom"))
+    outbox.enqueue(True, "wf:status")
+
+    assert outbox.close(timeout=10)
+    assert len(fake_twilio) == 1
+    assert fake_twilio[0].startswith("📋 3 workflow results")
+    assert "❌ wf:start\nboom" in fake_twilio[0]
+    assert list((tmp_path / "spool").glob("*.jsonl")) == []
+
+
+def test_client_and_config_are_reused(fake_twilio):
+    messaging_module.deliver("one")
+    messaging_module.deliver("two")
+
+    config = messaging_module.load_config()
+    assert messaging_module.get_client(config) is messaging_module.get_client(config)
+    assert fake_twilio == ["one", "two"]
+
+
+def test_undelivered_messages_survive_a_dead_process(tmp_path):
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    # Spool left behind by a process that no longer exists.
+    (spool_dir / "999999999-deadbeef.jsonl").write_text(
+        json.dumps({"id": "a", "text": "❌ wf:login", "queued_at": "0"}) + "\n" + '{"id": "trunc',
+        encoding="utf-8",
+    )
+
+    delivered: list[str] = []
+    outbox = MessagingOutbox(spool_dir=spool_dir, transport=delivered.append, batch_window=0)
+    assert outbox.pending() == 1
+    assert outbox.close(timeout=5)
+    assert delivered == ["❌ wf:login"]
+    assert list(spool_dir.glob("*.jsonl")) == []
+
+
+def test_failed_delivery_stays_spooled(tmp_path):
+    def failing_transport(text: str) -> None:
+        raise ConnectionError("network down")
+
+    outbox = MessagingOutbox(
+        spool_dir=tmp_path, transport=failing_transport, batch_window=0, retry_seconds=60
+    )
+    outbox.enqueue(True, "wf:login")
+    started = time.monotonic()
+
+    assert outbox.close(timeout=0.3) is False
+    assert time.monotonic() - started < 5
+    assert "wf:login" in outbox.spool_path.read_text(encoding="utf-8")
+
+
+def test_bodies_sent_before_a_failure_are_not_resent(tmp_path):
+    sent: list[str] = []
+    failures = [ConnectionError("network down")]
+
+    def flaky_transport(body: str) -> None:
+        if sent and failures:
+            raise failures.pop()
+        sent.append(body)
+
+    outbox = MessagingOutbox(
+        spool_dir=tmp_path, transport=flaky_transport, batch_window=0.2, retry_seconds=0.05
+    )
+    texts = [f"{index}:" + "x" * (MAX_BODY_LENGTH // 2) for index in range(3)]
+    for text in texts:
+        outbox.enqueue_text(text)
+
+    assert outbox.close(timeout=5) is True
+    delivered = [line.split(":")[0] for body in sent for line in body.splitlines()[1:]]
+    assert sorted(delivered) == ["0", "1", "2"]
+    assert not failures
@@ -39,6 +39,16 @@ class HelloWorldWorkflow(WorkflowInterface):
         )
 
 
+    def pipelines(self) -> dict[WorkflowActionName, list[WorkflowActionName]]:
+        """Named action sequences run on a single device session."""
+        return {
+            WorkflowActionName('daily') : [
+                WorkflowActionName('login'),
+                WorkflowActionName('start'),
+                WorkflowActionName('status'),
+            ],
+        }
+
     def action_handler(self, action: WorkflowActionName) -> WorkflowActionHandler:
         return self._actions[action]
 